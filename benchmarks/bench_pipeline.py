@@ -0,0 +1,159 @@
+"""Offline benchmark for the summarization pipeline.
+
+Generates synthetic videos, runs every ImportantVideo stage against them and writes a
+JSON report of per-stage throughput (seconds of video per second), memory high-water marks
+and subprocess counts. By default Whisper, translation and TTS are replaced by local
+stand-ins so the run needs no GPU and no network; ``--real`` uses the configured backends
+instead.
+
+    python -m benchmarks.bench_pipeline --durations 60 300 --scenes 6 --report bench.json
+    python -m benchmarks.bench_pipeline --baseline bench.json --tolerance 0.25
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import resource
+from contextlib import nullcontext
+from src.config import Config
+from src.cache import ArtifactCache
+from src.utils import scratch_dir
+from src.important_video import ImportantVideo
+from benchmarks.synthetic import generate_video
+from benchmarks.stubs import install_stub_whisper
+
+def _rss_high_water_mb() -> dict:
+    # ru_maxrss is in KB on Linux; children covers ffmpeg and the scene-detection workers.
+    # It is the process's peak so far, so it never drops from one stage to the next.
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    }
+
+def run_case(video: dict, workdir: str, real: bool, renderer: str, use_cache: bool) -> dict:
+    output_folder = os.path.join(workdir, f"out_{int(video['duration'])}s_{video['num_scenes']}")
+    processor = ImportantVideo(
+        video["path"],
+        num_scenes=video["num_scenes"],
+        whisper_size=Config.WHISPER_MODEL if real else install_stub_whisper(),
+        translation_backend=None if real else "offline",
+        tts_backend=None if real else "offline",
+        renderer=renderer,
+        cache=ArtifactCache(root=os.path.join(workdir, "cache"), enabled=use_cache)
+    )
+    # High-water mark when each stage starts; a stage may report progress more than once.
+    marks = {}
+    processor.process(output_folder, Config.DEFAULT_DOWNSCALE, progress=lambda stage, percent: marks.setdefault(stage, _rss_high_water_mb()))
+    marks["end"] = _rss_high_water_mb()
+
+    results = {}
+    stage_names = [span["name"] for span in processor.spans.spans if span.get("kind") == "stage"]
+    for k, span in enumerate(span for span in processor.spans.spans if span.get("kind") == "stage"):
+        name = span["name"]
+        subprocesses = [
+            sub for sub in processor.spans.spans
+            if sub["stage"] == name and sub["name"] in ("ffmpeg", "ffprobe")
+        ]
+        following = stage_names[k + 1] if k + 1 < len(stage_names) else "end"
+        before, after = marks.get(name, marks["end"]), marks.get(following, marks["end"])
+        results[name] = {
+            "seconds": span["duration"],
+            "throughput": video["duration"] / span["duration"] if span["duration"] > 0 else None,
+            "subprocesses": len(subprocesses),
+            "subprocess_cpu_seconds": sum(sub.get("cpu_time") or 0.0 for sub in subprocesses),
+            # Cumulative peak at the end of the stage, and how far this stage raised it.
+            "rss_high_water_mb": after,
+            "rss_growth_mb": {key: after[key] - before[key] for key in after}
+        }
+    total = sum(stage["seconds"] for stage in results.values())
+    vad = processor.analytics["processing_steps"].get("convert_clips_to_text", {}).get("vad", {})
+    return {
+        "video": {key: value for key, value in video.items() if key != "path"},
+        "stages": results,
+        "total": {
+            "seconds": total,
+            "throughput": video["duration"] / total if total > 0 else None,
+            "subprocesses": sum(stage["subprocesses"] for stage in results.values()),
+            "final_output": os.path.exists(os.path.join(output_folder, Config.FINAL_OUTPUT)),
+            "vad_gated_scenes": vad.get("num_gated", 0)
+        }
+    }
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Return human-readable regressions: throughput below (1 - tolerance) x baseline, more subprocesses or more VAD-gated scenes."""
+    regressions = []
+    baseline_cases = {json.dumps(case["video"], sort_keys=True): case for case in baseline.get("cases", [])}
+    for case in report["cases"]:
+        reference = baseline_cases.get(json.dumps(case["video"], sort_keys=True))
+        if reference is None:
+            continue
+        label = f"{case['video']['duration']}s/{case['video']['num_scenes']} scenes"
+        for stage, result in case["stages"].items():
+            before = reference["stages"].get(stage)
+            if before is None:
+                continue
+            if before["throughput"] and result["throughput"] and result["throughput"] < before["throughput"] * (1 - tolerance):
+                regressions.append(
+                    f"{label} {stage}: throughput {result['throughput']:.2f} < baseline {before['throughput']:.2f}"
+                )
+            if result["subprocesses"] > before["subprocesses"]:
+                regressions.append(
+                    f"{label} {stage}: {result['subprocesses']} subprocesses > baseline {before['subprocesses']}"
+                )
+        gated, gated_before = case["total"].get("vad_gated_scenes", 0), reference["total"].get("vad_gated_scenes", 0)
+        if gated > gated_before:
+            regressions.append(f"{label}: VAD gated {gated} scene(s) > baseline {gated_before}")
+    return regressions
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark for the summarization pipeline")
+    parser.add_argument("--durations", type=float, nargs="+", default=[60.0], help="Synthetic video lengths in seconds")
+    parser.add_argument("--scenes", type=int, default=6, help="Scenes per synthetic video")
+    parser.add_argument("--size", default="640x360", help="Synthetic video resolution")
+    parser.add_argument("--renderer", choices=["clips", "filtergraph"], default=Config.RENDERER, help="Renderer to benchmark")
+    parser.add_argument("--real", action="store_true", help="Use the real Whisper, translation and TTS backends")
+    parser.add_argument("--cache", action="store_true", help="Leave the artifact cache enabled")
+    parser.add_argument("--workdir", default=None, help="Keep generated videos and outputs here instead of a temp dir")
+    parser.add_argument("--report", default=None, help="Write the JSON report to this path")
+    parser.add_argument("--baseline", default=None, help="Compare against a stored report and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed fractional throughput drop vs baseline")
+    args = parser.parse_args(argv)
+
+    # On disk rather than tmpfs, so the numbers include the I/O a real job pays for.
+    with (nullcontext(args.workdir) if args.workdir else scratch_dir("bench_", tmpfs=False)) as workdir:
+        cases = []
+        for duration in args.durations:
+            video = generate_video(
+                os.path.join(workdir, f"synthetic_{int(duration)}s_{args.scenes}.mp4"),
+                duration, args.scenes, size=args.size
+            )
+            cases.append(run_case(video, workdir, args.real, args.renderer, args.cache))
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "real_backends": args.real,
+            "renderer": args.renderer
+        },
+        "cases": cases
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
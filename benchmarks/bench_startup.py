@@ -0,0 +1,158 @@
+"""Import-time and cold-start benchmark for the API and the CLIs.
+
+Each entry point is imported in a fresh interpreter, timed, and checked against
+``Config.STAGE_DEPENDENCIES``: whisper, torch, scenedetect and the TTS/translation
+clients must only load when their stage first runs. The run fails when one of them
+leaks back into an import path or an import exceeds ``--budget`` seconds. ``--serve``
+also boots uvicorn and times the first responses from ``/dashboard/`` and ``/jobs/``.
+
+    python -m benchmarks.bench_startup --repeat 5 --budget 1.0
+    python -m benchmarks.bench_startup --serve --report startup.json
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import platform
+import statistics
+import subprocess
+import urllib.request
+from src.config import Config
+
+ENTRY_POINTS = ["src.api", "src.jobs", "src.important_video", "src.batch"]
+CLI_COMMANDS = {
+    "important_video --help": ["-m", "src.important_video", "--help"],
+    "batch --help": ["-m", "src.batch", "--help"]
+}
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+try:
+    __import__({module!r})
+    error = None
+except ImportError as e:
+    error = {{"type": type(e).__name__, "name": getattr(e, "name", None), "message": str(e)}}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "error": error, "loaded": [m for m in {watched!r} if m in sys.modules]}}))
+"""
+
+def stage_of(dependency: str) -> str:
+    for stage, modules in Config.STAGE_DEPENDENCIES.items():
+        if dependency in modules:
+            return stage
+    return None
+
+def measure_import(module: str, repeat: int) -> dict:
+    """Median import time of ``module`` in fresh interpreters and the stage dependencies it loaded."""
+    watched = [m for modules in Config.STAGE_DEPENDENCIES.values() for m in modules]
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, watched=watched)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    error = runs[0]["error"]
+    leaked = sorted({m for run in runs for m in run["loaded"]})
+    # Failing on a stage dependency means the import path needs it, which is a leak too.
+    if error and stage_of(error["name"] or ""):
+        leaked.append(error["name"])
+    return {
+        "module": module,
+        "seconds": statistics.median(run["seconds"] for run in runs),
+        "leaked": {m: stage_of(m) for m in leaked},
+        "error": error
+    }
+
+def measure_command(args: list, repeat: int) -> dict:
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True)
+        durations.append(time.perf_counter() - start_time)
+    return {"seconds": statistics.median(durations), "exit_code": result.returncode}
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def measure_cold_start(timeout: float = 60.0) -> dict:
+    """Boot uvicorn and time the first successful response of each light endpoint."""
+    port = _free_port()
+    start_time = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api:app", "--port", str(port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    results = {}
+    try:
+        for path in ("/dashboard/", "/jobs/"):
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+                if time.perf_counter() - start_time > timeout:
+                    raise RuntimeError(f"No response from {path} within {timeout} seconds")
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1.0) as response:
+                        if response.status == 200:
+                            results[path] = time.perf_counter() - start_time
+                            break
+                except OSError:
+                    time.sleep(0.05)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return results
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time and cold-start benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per measurement (median is reported)")
+    parser.add_argument("--budget", type=float, default=1.0, help="Fail when an entry point takes longer to import, in seconds")
+    parser.add_argument("--serve", action="store_true", help="Also boot uvicorn and time the first dashboard/jobs responses")
+    parser.add_argument("--serve-budget", type=float, default=5.0, help="Fail when the first response takes longer, in seconds")
+    parser.add_argument("--report", default=None, help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    imports = [measure_import(module, args.repeat) for module in ENTRY_POINTS]
+    commands = {name: measure_command(cmd, args.repeat) for name, cmd in CLI_COMMANDS.items()}
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "imports": imports,
+        "commands": commands
+    }
+    if args.serve:
+        report["cold_start"] = measure_cold_start()
+
+    failures = []
+    for result in imports:
+        for module, stage in result["leaked"].items():
+            failures.append(f"importing {result['module']} loads {module} (needed only by {stage})")
+        if result["error"] and not result["leaked"]:
+            print(f"SKIPPED: {result['module']} cannot be imported here: {result['error']['message']}", file=sys.stderr)
+        elif result["seconds"] > args.budget:
+            failures.append(f"importing {result['module']} took {result['seconds']:.2f}s > budget {args.budget:.2f}s")
+    for path, seconds in report.get("cold_start", {}).items():
+        if seconds > args.serve_budget:
+            failures.append(f"first response from {path} after {seconds:.2f}s > budget {args.serve_budget:.2f}s")
+
+    output = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    for failure in failures:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Concurrent-upload load generator for a running API.
+
+Fires ``--requests`` uploads of one video at ``/summarize/`` with ``--concurrency`` in
+flight and reports p50/p99 latency of the upload response, the rejection (429) rate,
+how many jobs were degraded and the Retry-After values handed out. ``--wait`` also polls
+each admitted job to completion and reports end-to-end latency.
+
+    python -m benchmarks.load_summarize --url http://127.0.0.1:8000 --requests 40 --concurrency 8
+    python -m benchmarks.load_summarize --duration 120 --size 1280x720 --wait --report load.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import argparse
+import urllib.error
+import urllib.parse
+import urllib.request
+import concurrent.futures
+from contextlib import nullcontext
+from src.utils import scratch_dir
+from benchmarks.synthetic import generate_video
+
+TERMINAL_STATUSES = ("completed", "failed", "rejected")
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile, or None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+def _multipart(video: bytes, filename: str) -> tuple:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: video/mp4\r\n\r\n"
+    ).encode() + video + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+def _get_json(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return json.load(response)
+
+def upload(base_url: str, body: bytes, content_type: str, query: dict, wait: bool, poll: float) -> dict:
+    url = f"{base_url}/summarize/?{urllib.parse.urlencode(query)}"
+    request = urllib.request.Request(url, data=body, method="POST", headers={"Content-Type": content_type})
+    start_time = time.perf_counter()
+    result = {"status": None, "latency": None, "retry_after": None, "degraded": False, "job_status": None, "end_to_end": None}
+    try:
+        with urllib.request.urlopen(request, timeout=600) as response:
+            payload = json.load(response)
+            result["status"] = response.status
+    except urllib.error.HTTPError as e:
+        result["status"] = e.code
+        result["retry_after"] = int(e.headers["Retry-After"]) if e.headers.get("Retry-After") else None
+        payload = None
+    except OSError as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+        payload = None
+    result["latency"] = time.perf_counter() - start_time
+    if payload is None:
+        return result
+    result["degraded"] = bool(payload.get("degraded"))
+    if wait:
+        while True:
+            job = _get_json(f"{base_url}{payload['status_url']}")
+            if job["status"] in TERMINAL_STATUSES:
+                break
+            time.sleep(poll)
+        result["job_status"] = job["status"]
+        result["end_to_end"] = time.perf_counter() - start_time
+    return result
+
+def summarize(results: list, wall_time: float) -> dict:
+    admitted = [r for r in results if r["status"] == 200]
+    rejected = [r for r in results if r["status"] == 429]
+    finished = [r["end_to_end"] for r in admitted if r["end_to_end"] is not None]
+    return {
+        "requests": len(results),
+        "admitted": len(admitted),
+        "rejected": len(rejected),
+        "errors": len(results) - len(admitted) - len(rejected),
+        "rejection_rate": len(rejected) / len(results) if results else None,
+        "degraded": sum(r["degraded"] for r in admitted),
+        "wall_time": wall_time,
+        "latency": {
+            "p50": percentile([r["latency"] for r in results], 50),
+            "p99": percentile([r["latency"] for r in results], 99),
+            "admitted_p50": percentile([r["latency"] for r in admitted], 50),
+            "admitted_p99": percentile([r["latency"] for r in admitted], 99)
+        },
+        "retry_after": {
+            "p50": percentile([r["retry_after"] for r in rejected if r["retry_after"] is not None], 50),
+            "max": max((r["retry_after"] for r in rejected if r["retry_after"] is not None), default=None)
+        },
+        "end_to_end": {
+            "p50": percentile(finished, 50),
+            "p99": percentile(finished, 99),
+            "failed": sum(r["job_status"] != "completed" for r in admitted if r["job_status"] is not None)
+        }
+    }
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent-upload load generator for /summarize/")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the running API")
+    parser.add_argument("--video", default=None, help="Video to upload (default: a generated synthetic video)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Length of the synthetic video in seconds")
+    parser.add_argument("--size", default="640x360", help="Resolution of the synthetic video")
+    parser.add_argument("--requests", type=int, default=20, help="Total uploads")
+    parser.add_argument("--concurrency", type=int, default=4, help="Uploads in flight at once")
+    parser.add_argument("--scenes", type=int, default=6, help="num_scenes for every request")
+    parser.add_argument("--lang", default="hi", help="lang for every request")
+    parser.add_argument("--no-degrade", action="store_true", help="Ask for 429 instead of degraded jobs")
+    parser.add_argument("--wait", action="store_true", help="Poll admitted jobs to completion for end-to-end latency")
+    parser.add_argument("--poll", type=float, default=1.0, help="Job status poll interval in seconds")
+    parser.add_argument("--report", default=None, help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    base_url = args.url.rstrip("/")
+    query = {"num_scenes": args.scenes, "lang": args.lang, "allow_degrade": str(not args.no_degrade).lower()}
+    with (nullcontext(None) if args.video else scratch_dir("load_", tmpfs=False)) as workdir:
+        video_path = args.video or os.path.join(workdir, "load.mp4")
+        if not args.video:
+            generate_video(video_path, args.duration, args.scenes, size=args.size)
+        with open(video_path, 'rb') as f:
+            body, content_type = _multipart(f.read(), os.path.basename(video_path))
+
+    results = []
+    start_time = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [
+            executor.submit(upload, base_url, body, content_type, query, args.wait, args.poll)
+            for _ in range(args.requests)
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"[{len(results)}/{args.requests}] {result['status']} in {result['latency']:.2f}s", file=sys.stderr)
+    report = {
+        "target": base_url,
+        "video": args.video or {"duration": args.duration, "size": args.size},
+        "concurrency": args.concurrency,
+        "summary": summarize(results, time.perf_counter() - start_time),
+        "admission": _get_json(f"{base_url}/admission/")
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0 if report["summary"]["errors"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
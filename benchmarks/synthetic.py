@@ -0,0 +1,42 @@
+import os
+from src.utils import run_ffmpeg
+
+# Visually distinct lavfi sources so ContentDetector finds a cut at every scene boundary.
+SCENE_SOURCES = [
+    "testsrc2=size={size}:rate={fps}",
+    "smptebars=size={size}:rate={fps}",
+    "color=c=darkred:size={size}:rate={fps}",
+    "rgbtestsrc=size={size}:rate={fps}",
+    "color=c=navy:size={size}:rate={fps}",
+    "mandelbrot=size={size}:rate={fps}",
+    "color=c=darkgreen:size={size}:rate={fps}",
+    "yuvtestsrc=size={size}:rate={fps}",
+]
+
+# A tone with a 4 Hz syllable-rate envelope, cut into 1.1s phrases with 0.5s pauses, so the
+# energy VAD sees speech-like bursts over a silent floor instead of a steady (gated) bed.
+SPEECH_SOURCE = "aevalsrc='0.5*sin(2*PI*{frequency}*t)*(0.6+0.4*sin(2*PI*4*t))*lt(mod(t,1.6),1.1)':s=44100"
+
+def generate_video(path: str, duration: float, num_scenes: int, size: str = "640x360", fps: int = 25) -> dict:
+    """Write a synthetic MP4 of ``num_scenes`` equal scenes, each with its own picture and speech-like tone."""
+    scene_length = duration / num_scenes
+    inputs, filters, pads = [], [], []
+    for k in range(num_scenes):
+        source = SCENE_SOURCES[k % len(SCENE_SOURCES)].format(size=size, fps=fps)
+        inputs += ["-f", "lavfi", "-t", f"{scene_length:.3f}", "-i", source]
+        inputs += ["-f", "lavfi", "-t", f"{scene_length:.3f}", "-i", SPEECH_SOURCE.format(frequency=220 + 110 * k)]
+        filters.append(f"[{2 * k}:v]format=yuv420p,setsar=1[v{k}]")
+        pads.append(f"[v{k}][{2 * k + 1}:a]")
+    filters.append(f"{''.join(pads)}concat=n={num_scenes}:v=1:a=1[outv][outa]")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    cmd = [
+        "ffmpeg", "-y",
+        *inputs,
+        "-filter_complex", ";".join(filters),
+        "-map", "[outv]", "-map", "[outa]",
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", str(fps * 2),
+        "-c:a", "aac",
+        path
+    ]
+    run_ffmpeg(cmd, "Synthetic video generation failed")
+    return {"path": path, "duration": duration, "num_scenes": num_scenes, "size": size, "fps": fps}
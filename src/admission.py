@@ -0,0 +1,110 @@
+import os
+import math
+import logging
+import threading
+from src.config import Config
+from src.utils import available_memory_mb
+
+logger = logging.getLogger("VideoProcessorAPI")
+
+def estimate_cost(probe: dict, num_scenes: int, downscale: int, languages: int = 1) -> dict:
+    """Estimated CPU-seconds and peak memory of one job, from the upload's probe."""
+    costs = Config.ADMISSION_COSTS
+    duration = probe.get("duration") or 0.0
+    video = next((stream for stream in probe.get("streams", []) if stream["codec_type"] == "video"), {})
+    megapixels = (video.get("width") or 0) * (video.get("height") or 0) / 1e6
+    downscale = max(1, downscale or 1)
+    summary_seconds = min(duration, num_scenes * costs["scene_seconds"])
+    cpu_seconds = (
+        duration * megapixels * (costs["decode"] + costs["detect"] / downscale ** 2)
+        + summary_seconds * costs["whisper"]
+        + summary_seconds * megapixels * costs["encode"]
+        + num_scenes * languages * costs["tts"]
+    )
+    return {
+        "cpu_seconds": cpu_seconds,
+        "memory_mb": costs["memory_mb"] + megapixels / downscale ** 2 * costs["memory_mb_per_mpx"]
+    }
+
+def degraded_options(num_scenes: int, downscale: int) -> list:
+    """Cheaper (num_scenes, downscale) pairs to try, mildest first: coarser detection, then fewer scenes."""
+    options = []
+    while downscale * 2 <= Config.ADMISSION_MAX_DOWNSCALE:
+        downscale *= 2
+        options.append((num_scenes, downscale))
+    while num_scenes // 2 >= Config.ADMISSION_MIN_SCENES:
+        num_scenes //= 2
+        options.append((num_scenes, downscale))
+    return options
+
+class AdmissionController:
+    """Admits jobs while the work already committed to the job queue fits the budget.
+
+    CPU is a backlog budget: the summed estimated CPU-seconds of admitted, unfinished jobs.
+    Memory is checked for the worst case of the ``workers`` largest jobs running at once.
+    When nothing is committed a job is always admitted, however large, so it cannot be
+    starved; otherwise a job that does not fit is degraded or rejected with a retry delay
+    based on how long the backlog takes to drain.
+    """
+
+    def __init__(self, cpu_seconds: float = Config.ADMISSION_CPU_SECONDS, memory_mb: float = Config.ADMISSION_MEMORY_MB, workers: int = Config.JOB_WORKERS):
+        self.cores = os.cpu_count() or 1
+        self.cpu_seconds = cpu_seconds or self.cores * Config.ADMISSION_BACKLOG_SECONDS
+        self.memory_mb = memory_mb or 0.75 * (available_memory_mb() or 4096)
+        self.workers = max(1, workers)
+        self._committed = {}
+        self._lock = threading.Lock()
+
+    def _fits(self, cost: dict) -> bool:
+        if not self._committed:
+            return True
+        committed_cpu = sum(c["cpu_seconds"] for c in self._committed.values())
+        memories = sorted([c["memory_mb"] for c in self._committed.values()] + [cost["memory_mb"]], reverse=True)
+        return (committed_cpu + cost["cpu_seconds"] <= self.cpu_seconds
+                and sum(memories[:self.workers]) <= self.memory_mb)
+
+    def saturated(self) -> bool:
+        """True when the backlog alone fills the CPU budget, so any upload would be turned away."""
+        with self._lock:
+            return bool(self._committed) and sum(c["cpu_seconds"] for c in self._committed.values()) >= self.cpu_seconds
+
+    def retry_after(self, cost: dict = None) -> int:
+        """Seconds until the backlog has drained enough for ``cost`` to fit, at one CPU-second per core per second."""
+        with self._lock:
+            committed_cpu = sum(c["cpu_seconds"] for c in self._committed.values())
+        excess = committed_cpu + (cost["cpu_seconds"] if cost else 0.0) - self.cpu_seconds
+        low, high = Config.ADMISSION_RETRY_AFTER
+        return int(min(high, max(low, math.ceil(excess / self.cores))))
+
+    def admit(self, job_id: str, probe: dict, num_scenes: int, downscale: int, languages: int = 1, degrade: bool = True) -> dict:
+        """Commit the job at the requested settings or, with ``degrade``, the mildest cheaper ones that fit.
+
+        Returns ``{"admitted", "num_scenes", "downscale", "cost", "degraded"}``; ``cost`` is
+        the estimate for the settings returned (the requested ones when rejected).
+        """
+        requested = estimate_cost(probe, num_scenes, downscale, languages)
+        candidates = [(num_scenes, downscale)] + (degraded_options(num_scenes, downscale) if degrade else [])
+        with self._lock:
+            for scenes, scale in candidates:
+                cost = estimate_cost(probe, scenes, scale, languages)
+                if self._fits(cost):
+                    self._committed[job_id] = cost
+                    degraded = (scenes, scale) != (num_scenes, downscale)
+                    if degraded:
+                        logger.info(f"Admitted job {job_id} degraded to {scenes} scenes at downscale {scale}")
+                    return {"admitted": True, "num_scenes": scenes, "downscale": scale, "cost": cost, "degraded": degraded}
+        logger.warning(f"Rejected job {job_id}: estimated {requested['cpu_seconds']:.0f} CPU-seconds does not fit the backlog")
+        return {"admitted": False, "num_scenes": num_scenes, "downscale": downscale, "cost": requested, "degraded": False}
+
+    def release(self, job_id: str) -> None:
+        with self._lock:
+            self._committed.pop(job_id, None)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "jobs": len(self._committed),
+                "cpu_seconds": sum(c["cpu_seconds"] for c in self._committed.values()),
+                "cpu_budget": self.cpu_seconds,
+                "memory_budget_mb": self.memory_mb
+            }
@@ -1,13 +1,21 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from src.important_video import ImportantVideo
+from fastapi.concurrency import run_in_threadpool
 from src.config import Config
+from src.jobs import JobQueue
+from src.admission import AdmissionController
+from src.store import job_store
+from src.checkpoint import read_manifest
+from src.ingest import ingest_upload, UploadTooLarge, UploadMissing, UploadAborted
+from src.utils import probe_video, safe_remove
+from src.streaming import parse_range, iter_file
+from src.metrics import metrics
 import os
-import logging
-import shutil
 import json
-import threading
+import logging
+from functools import lru_cache
+from typing import Optional
 from pydantic import BaseModel
 
 logging.basicConfig(
@@ -23,50 +31,89 @@ app = FastAPI(
 )
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
-app.mount("/output", StaticFiles(directory="output"), name="output")
-logger.info("Mounted /static and /output directories")
-
-id_lock = threading.Lock()
-VIDEO_IDS_FILE = "video_ids.json"
-
-def load_video_id_counter():
-    if os.path.exists(VIDEO_IDS_FILE):
-        with open(VIDEO_IDS_FILE, 'r') as f:
-            data = json.load(f)
-            return data.get("last_id", 0)
-    return 0
-
-def save_video_id_counter(counter):
-    with open(VIDEO_IDS_FILE, 'w') as f:
-        json.dump({"last_id": counter}, f)
-
-video_id_counter = load_video_id_counter()
+logger.info("Mounted /static directory")
 
 class SummarizeRequest(BaseModel):
+    # One language code or several comma-separated ("hi,mr,ta"); analysis runs once for all of them.
     lang: str = Config.DEFAULT_LANG
     num_scenes: int = Config.DEFAULT_NUM_SCENES
     downscale: int = Config.DEFAULT_DOWNSCALE
     tts_speed: float = Config.DEFAULT_TTS_SPEED
+    final_mp4: bool = Config.WRITE_FINAL_MP4
+    encode_profile: str = Config.ENCODE_PROFILE
+    language_output: str = Config.LANGUAGE_OUTPUT
+    # Let admission control lower num_scenes or raise downscale instead of answering 429.
+    allow_degrade: bool = True
+    profile: Optional[str] = None
+
+job_queue = JobQueue()
+admission = AdmissionController()
+
+def _too_busy(retry_after: int) -> HTTPException:
+    metrics.inc("pipeline_admission_total", decision="rejected")
+    return HTTPException(
+        status_code=429,
+        detail=f"Processing capacity is exhausted, retry in {retry_after} seconds",
+        headers={"Retry-After": str(retry_after)}
+    )
+
+def _submit_admitted(video_id: str, input_path: str, output_folder: str, params: dict) -> None:
+    """Queue an admitted job; its committed budget is released when it finishes or fails to queue."""
+    try:
+        future = job_queue.submit(video_id, input_path, output_folder, params)
+    except Exception:
+        admission.release(video_id)
+        raise
+    future.add_done_callback(lambda _: admission.release(video_id))
+
+@app.on_event("startup")
+def start_job_queue():
+    # Worker processes preload Config.WHISPER_PRELOAD in their initializer.
+    job_queue.start()
+
+@app.on_event("shutdown")
+def stop_job_queue():
+    job_queue.shutdown()
 
 @app.get("/dashboard/")
 async def get_dashboard():
     logger.info("Serving dashboard")
     return FileResponse("static/dashboard.html")
 
-@app.post("/summarize/")
-async def summarize_video(
-    file: UploadFile = File(...),
-    lang: str = Config.DEFAULT_LANG,
-    num_scenes: int = Config.DEFAULT_NUM_SCENES,
-    downscale: int = Config.DEFAULT_DOWNSCALE,
-    tts_speed: float = Config.DEFAULT_TTS_SPEED
-):
-    global video_id_counter
+UPLOAD_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"]
+                }
+            }
+        }
+    }
+}
+
+@app.post("/summarize/", openapi_extra=UPLOAD_SCHEMA)
+async def summarize_video(request: Request, options: SummarizeRequest = Depends()):
+    if options.profile not in (None, "cprofile", "py-spy"):
+        raise HTTPException(status_code=400, detail="profile must be 'cprofile' or 'py-spy'")
+    if options.encode_profile not in Config.ENCODE_PROFILES:
+        raise HTTPException(status_code=400, detail=f"encode_profile must be one of {sorted(Config.ENCODE_PROFILES)}")
+    langs = [code.strip() for code in options.lang.split(",") if code.strip()]
+    if not langs:
+        raise HTTPException(status_code=400, detail="lang must name at least one language")
+    if options.language_output not in ("tracks", "files"):
+        raise HTTPException(status_code=400, detail="language_output must be 'tracks' or 'files'")
+    final_mp4 = options.final_mp4 or not Config.API_HLS_ENABLED
+    if len(langs) > 1 and not final_mp4:
+        raise HTTPException(status_code=400, detail="Several languages need the final MP4 to carry their audio")
+    # Turn uploads away before reading them while the backlog alone fills the budget.
+    if Config.ADMISSION_ENABLED and admission.saturated():
+        raise _too_busy(admission.retry_after())
     try:
-        with id_lock:
-            video_id_counter += 1
-            video_id = video_id_counter
-            save_video_id_counter(video_id_counter)
+        video_id = await run_in_threadpool(job_store.create_job, "uploading")
 
         unique_input_filename = f"video_{video_id}.mp4"
         unique_output_dir = f"output/{video_id}"
@@ -74,60 +121,265 @@ async def summarize_video(
         input_dir = "input"
         os.makedirs(input_dir, exist_ok=True)
         input_path = os.path.join(input_dir, unique_input_filename)
-        with open(input_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-
-        processor = ImportantVideo(input_path, lang=lang, num_scenes=num_scenes, tts_speed=tts_speed)
-        logger.info(f"Processing video: {file.filename} as {unique_input_filename} with video_id: {video_id}")
-        processor.downscale(downscale)
-        processor.detect_scenes()
-        processor.top_scenes()
-        transcripts = processor.convert_clips_to_text(unique_output_dir)
-        audio_paths = processor.text_to_speech(transcripts, unique_output_dir)
-        merged_clips = processor.merge_audio_with_clips(audio_paths, unique_output_dir)
-        processor.merge_all_clips(merged_clips, unique_output_dir)
+        try:
+            upload = await ingest_upload(request, input_path, Config.MAX_UPLOAD_MB * 1024 * 1024)
+        except UploadTooLarge as e:
+            await run_in_threadpool(job_store.update_job, video_id, status="rejected", error=str(e))
+            raise HTTPException(status_code=413, detail=str(e))
+        except UploadMissing as e:
+            await run_in_threadpool(job_store.update_job, video_id, status="rejected", error=str(e))
+            raise HTTPException(status_code=400, detail=str(e))
+        except UploadAborted as e:
+            # Nobody is left to read the response, but the job must not stay "uploading".
+            logger.warning(f"Upload for video_id {video_id} aborted: {str(e)}")
+            await run_in_threadpool(job_store.update_job, video_id, status="rejected", error=str(e))
+            raise HTTPException(status_code=400, detail=str(e))
 
-        output_path = os.path.join(unique_output_dir, Config.FINAL_OUTPUT)
-        if not os.path.exists(output_path):
-            logger.error(f"Final video not found at {output_path}")
-            raise HTTPException(status_code=500, detail="Failed to generate summarized video")
+        try:
+            probe = await run_in_threadpool(probe_video, input_path)
+        except Exception as e:
+            safe_remove(input_path)
+            await run_in_threadpool(job_store.update_job, video_id, status="rejected", error="Uploaded file is not a readable video")
+            logger.error(f"Uploaded file is not a readable video: {str(e)}")
+            raise HTTPException(status_code=400, detail="Uploaded file is not a readable video")
 
-        logger.info(f"Generated final video: {output_path} for video_id: {video_id}")
-        return {"output_path": output_path, "video_id": str(video_id)}
+        decision = {"admitted": True, "num_scenes": options.num_scenes, "downscale": options.downscale, "cost": None, "degraded": False}
+        if Config.ADMISSION_ENABLED:
+            decision = admission.admit(video_id, probe, options.num_scenes, options.downscale, len(langs), options.allow_degrade)
+            if not decision["admitted"]:
+                safe_remove(input_path)
+                await run_in_threadpool(job_store.update_job, video_id, status="rejected", error="Processing capacity is exhausted")
+                raise _too_busy(admission.retry_after(decision["cost"]))
+            metrics.inc("pipeline_admission_total", decision="degraded" if decision["degraded"] else "admitted")
+
+        # admit() has committed budget for this job; give it back if the job never gets queued.
+        try:
+            params = {
+                "lang": ",".join(langs),
+                "num_scenes": decision["num_scenes"],
+                "downscale": decision["downscale"],
+                "tts_speed": options.tts_speed,
+                "video_hash": upload["sha256"],
+                "probe": probe,
+                "streaming": Config.API_HLS_ENABLED,
+                "final_mp4": final_mp4,
+                "encode_profile": options.encode_profile,
+                "language_output": options.language_output,
+                "estimated_cost": decision["cost"],
+                "profile": options.profile
+            }
+            await run_in_threadpool(
+                job_store.update_job,
+                video_id,
+                filename=upload["filename"],
+                input_path=input_path,
+                duration=probe.get("duration"),
+                params={key: value for key, value in params.items() if key != "probe"}
+            )
+            # Submitting writes the queued status to the job store, so it stays off the event loop too.
+            if Config.ADMISSION_ENABLED:
+                await run_in_threadpool(_submit_admitted, video_id, input_path, unique_output_dir, params)
+            else:
+                await run_in_threadpool(job_queue.submit, video_id, input_path, unique_output_dir, params)
+        except Exception:
+            admission.release(video_id)
+            raise
+        logger.info(f"Queued video: {upload['filename']} as {unique_input_filename} with video_id: {video_id}")
+
+        output_path = os.path.join(unique_output_dir, Config.FINAL_OUTPUT)
+        return {
+            "output_path": output_path if params["final_mp4"] else None,
+            "playlist_url": _playlist_url(video_id) if params["streaming"] else None,
+            "video_id": video_id,
+            "status": "queued",
+            "status_url": f"/jobs/{video_id}",
+            "degraded": {"num_scenes": decision["num_scenes"], "downscale": decision["downscale"]} if decision["degraded"] else None
+        }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing video: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/analytics/{video_id}")
-async def get_analytics(video_id: str):
+def _playlist_url(video_id: str) -> str:
+    return f"/output/{video_id}/{Config.OUTPUT_HLS}/{Config.HLS_PLAYLIST}"
+
+def _etag(video_id: str, version: int) -> str:
+    return f'"{video_id}-{version}"'
+
+def _not_modified(request: Request, etag: str) -> bool:
+    return etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+
+@app.get("/jobs/")
+async def list_jobs(
+    status: str = None,
+    min_duration: float = None,
+    max_duration: float = None,
+    since: float = None,
+    until: float = None,
+    limit: int = 50,
+    offset: int = 0
+):
+    """Jobs newest first, filtered by status, input duration (seconds) and creation time (Unix seconds)."""
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+    jobs = await run_in_threadpool(job_store.list_jobs, status, min_duration, max_duration, since, until, limit, offset)
+    return {"jobs": jobs, "limit": limit, "offset": offset}
+
+@app.get("/jobs/{video_id}")
+async def get_job_status(video_id: str, request: Request, response: Response):
     if not video_id.isdigit():
         logger.error(f"Invalid video_id: {video_id}. Must be numeric.")
         raise HTTPException(status_code=400, detail="Video ID must be numeric")
 
-    analytics_path = f"output/{video_id}/analytics.json"
-    logger.info(f"Fetching analytics from: {analytics_path}")
-    if not os.path.exists(analytics_path):
-        logger.error(f"Analytics file not found for video_id: {video_id}")
-        raise HTTPException(status_code=404, detail="Analytics data not found")
+    status = await run_in_threadpool(job_store.get_job, video_id)
+    if status is None:
+        logger.error(f"Job not found for video_id: {video_id}")
+        raise HTTPException(status_code=404, detail="Job not found")
+    etag = _etag(video_id, status["version"])
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if status["params"].get("streaming"):
+        status["playlist_url"] = _playlist_url(video_id)
+    response.headers["ETag"] = etag
+    return status
+
+@app.post("/jobs/{video_id}/resume")
+async def resume_job(
+    video_id: str,
+    lang: str = None,
+    num_scenes: int = None,
+    downscale: int = None,
+    tts_speed: float = None,
+    encode_profile: str = None
+):
+    """Re-queue a failed or interrupted job; stages still valid for the (possibly changed) parameters are reused."""
+    if not video_id.isdigit():
+        logger.error(f"Invalid video_id: {video_id}. Must be numeric.")
+        raise HTTPException(status_code=400, detail="Video ID must be numeric")
+
+    if encode_profile is not None and encode_profile not in Config.ENCODE_PROFILES:
+        raise HTTPException(status_code=400, detail=f"encode_profile must be one of {sorted(Config.ENCODE_PROFILES)}")
+
+    output_folder = f"output/{video_id}"
+    manifest = read_manifest(output_folder)
+    if manifest is None:
+        logger.error(f"No checkpoint manifest for video_id: {video_id}")
+        raise HTTPException(status_code=404, detail="No checkpoint found for this job")
+    if job_queue.active(video_id):
+        raise HTTPException(status_code=409, detail="Job is already queued or running")
+
+    params = dict(manifest["job"])
+    input_path = params.pop("input_path")
+    if not os.path.exists(input_path):
+        logger.error(f"Input video for video_id {video_id} no longer exists: {input_path}")
+        raise HTTPException(status_code=410, detail="Input video is no longer available")
+    overrides = {"lang": lang, "num_scenes": num_scenes, "downscale": downscale, "tts_speed": tts_speed, "encode_profile": encode_profile}
+    params.update({key: value for key, value in overrides.items() if value is not None})
+    params["resume"] = True
+    if Config.ADMISSION_ENABLED:
+        # Estimated as a full run, and never degraded: changed settings would invalidate the checkpoints.
+        probe = await run_in_threadpool(probe_video, input_path)
+        decision = admission.admit(video_id, probe, params["num_scenes"], params["downscale"], len(str(params["lang"]).split(",")), degrade=False)
+        if not decision["admitted"]:
+            raise _too_busy(admission.retry_after(decision["cost"]))
+        metrics.inc("pipeline_admission_total", decision="admitted")
+        await run_in_threadpool(_submit_admitted, video_id, input_path, output_folder, params)
+    else:
+        await run_in_threadpool(job_queue.submit, video_id, input_path, output_folder, params)
+    logger.info(f"Resuming video_id: {video_id} (completed stages: {list(manifest['stages'])})")
+    return {
+        "output_path": os.path.join(output_folder, Config.FINAL_OUTPUT),
+        "video_id": video_id,
+        "status": "queued",
+        "status_url": f"/jobs/{video_id}",
+        "checkpointed_stages": list(manifest["stages"])
+    }
+
+@app.get("/admission/")
+async def get_admission():
+    """Committed work against the admission budget."""
+    return {"enabled": Config.ADMISSION_ENABLED, **admission.status()}
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@lru_cache(maxsize=128)
+def _cached_analytics(video_id: str, version: int) -> dict:
+    # Keyed on the job version, so any write to the job makes the cached copy unreachable.
+    return job_store.get_analytics(video_id)
+
+def _legacy_analytics(video_id: str) -> dict:
+    # Jobs processed before the job store kept their analytics next to their outputs.
+    path = os.path.join("output", video_id, "analytics.json")
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+@app.get("/analytics/{video_id}")
+async def get_analytics(video_id: str, request: Request, response: Response):
+    if not video_id.isdigit():
+        logger.error(f"Invalid video_id: {video_id}. Must be numeric.")
+        raise HTTPException(status_code=400, detail="Video ID must be numeric")
 
     try:
-        with open(analytics_path, 'r') as f:
-            analytics_data = json.load(f)
-        logger.info(f"Successfully retrieved analytics for video_id: {video_id}")
-        return analytics_data
+        version = await run_in_threadpool(job_store.version, video_id)
+        etag = _etag(video_id, version)
+        if version is not None and _not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        analytics_data = await run_in_threadpool(_cached_analytics, video_id, version) if version is not None else None
+        if analytics_data is None:
+            analytics_data = await run_in_threadpool(_legacy_analytics, video_id)
     except Exception as e:
         logger.error(f"Error reading analytics for video_id {video_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve analytics")
 
+    if analytics_data is None:
+        logger.error(f"Analytics not found for video_id: {video_id}")
+        raise HTTPException(status_code=404, detail="Analytics data not found")
+    if version is not None:
+        response.headers["ETag"] = etag
+    return analytics_data
+
+OUTPUT_MEDIA_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+    ".mp4": "video/mp4",
+    ".mp3": "audio/mpeg",
+    ".m4a": "audio/mp4",
+    ".txt": "text/plain; charset=utf-8"
+}
+
 @app.get("/output/{path:path}")
-async def serve_output_file(path: str):
-    file_path = os.path.join("output", path)
-    logger.info(f"Serving output file: {file_path}")
-    if not os.path.exists(file_path):
+async def serve_output_file(path: str, request: Request):
+    output_root = os.path.realpath("output")
+    file_path = os.path.realpath(os.path.join(output_root, path))
+    # Only job media and transcripts are served; not manifest.json or analytics.json, which
+    # hold input paths and params, nor anything else that ends up under output/.
+    extension = os.path.splitext(file_path)[1].lower()
+    if os.path.commonpath([output_root, file_path]) != output_root or extension not in OUTPUT_MEDIA_TYPES or not os.path.isfile(file_path):
         logger.error(f"Output file not found: {file_path}")
         raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path)
+
+    size = os.path.getsize(file_path)
+    media_type = OUTPUT_MEDIA_TYPES[extension]
+    headers = {"Accept-Ranges": "bytes"}
+    if media_type == OUTPUT_MEDIA_TYPES[".m3u8"]:
+        # Playlists grow while the job runs, so players must always revalidate them.
+        headers["Cache-Control"] = "no-cache"
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except ValueError:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    if byte_range is None:
+        return FileResponse(file_path, media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers.update({"Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(end - start + 1)})
+    return StreamingResponse(iter_file(file_path, start, end), status_code=206, media_type=media_type, headers=headers)
 
 if __name__ == "__main__":
     import uvicorn
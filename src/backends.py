@@ -0,0 +1,147 @@
+import logging
+from abc import ABC, abstractmethod
+from src.config import Config
+from src.utils import run_ffmpeg
+
+logger = logging.getLogger("VideoProcessor")
+
+class TranslationBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    def translate_batch(self, texts: list, source: str, target: str) -> list:
+        raise NotImplementedError
+
+class GoogleTranslationBackend(TranslationBackend):
+    """Google Translate, packing many transcripts into each request.
+
+    Texts are joined with newlines up to ``Config.TRANSLATION_BATCH_CHARS`` per request;
+    if a response does not split back into the same number of lines, that chunk is
+    translated text by text instead.
+    """
+    name = "google"
+
+    def translate_batch(self, texts: list, source: str, target: str) -> list:
+        from deep_translator import GoogleTranslator
+        translator = GoogleTranslator(source=source, target=target)
+        texts = [" ".join(text.split()) for text in texts]
+        translated = []
+        for chunk in self._chunks(texts):
+            result = translator.translate("\n".join(chunk))
+            lines = result.split("\n") if result else []
+            if len(lines) != len(chunk):
+                logger.warning(f"Batched translation returned {len(lines)} lines for {len(chunk)} texts, translating individually")
+                lines = [translator.translate(text) for text in chunk]
+            translated.extend(line.strip() for line in lines)
+        return translated
+
+    def _chunks(self, texts: list) -> list:
+        chunks, chunk, size = [], [], 0
+        for text in texts:
+            if chunk and size + len(text) + 1 > Config.TRANSLATION_BATCH_CHARS:
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(text)
+            size += len(text) + 1
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+class OfflineTranslationBackend(TranslationBackend):
+    """Returns the source text unchanged; for tests and air-gapped runs."""
+    name = "offline"
+
+    def translate_batch(self, texts: list, source: str, target: str) -> list:
+        return list(texts)
+
+class TTSBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    def synthesize(self, text: str, lang: str, slow: bool, audio_path: str) -> None:
+        raise NotImplementedError
+
+class GTTSBackend(TTSBackend):
+    name = "gtts"
+
+    def synthesize(self, text: str, lang: str, slow: bool, audio_path: str) -> None:
+        from gtts import gTTS
+        gTTS(text=text, lang=lang, slow=slow).save(audio_path)
+
+class OfflineTTSBackend(TTSBackend):
+    """Writes a tone whose length follows the word count; for tests and air-gapped runs."""
+    name = "offline"
+
+    def synthesize(self, text: str, lang: str, slow: bool, audio_path: str) -> None:
+        seconds_per_word = 0.6 if slow else 0.4
+        duration = max(1.0, len(text.split()) * seconds_per_word)
+        cmd = [
+            "ffmpeg", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration:.2f}",
+            "-ac", "1", "-ar", "24000",
+            audio_path
+        ]
+        run_ffmpeg(cmd, "Offline speech synthesis failed")
+
+TRANSLATION_BACKENDS = {
+    backend.name: backend for backend in (GoogleTranslationBackend, OfflineTranslationBackend)
+}
+TTS_BACKENDS = {
+    backend.name: backend for backend in (GTTSBackend, OfflineTTSBackend)
+}
+
+def get_translation_backend(name: str = None) -> TranslationBackend:
+    name = name or Config.TRANSLATION_BACKEND
+    if name not in TRANSLATION_BACKENDS:
+        raise ValueError(f"Unknown translation backend: {name}")
+    return TRANSLATION_BACKENDS[name]()
+
+def get_tts_backend(name: str = None) -> TTSBackend:
+    name = name or Config.TTS_BACKEND
+    if name not in TTS_BACKENDS:
+        raise ValueError(f"Unknown TTS backend: {name}")
+    return TTS_BACKENDS[name]()
+
+class MemoizedTranslator:
+    """Translate through ``backend``, remembering every phrase in the artifact cache."""
+
+    def __init__(self, backend: TranslationBackend, cache, source: str, target: str):
+        self.backend = backend
+        self.cache = cache
+        self.source = source
+        self.target = target
+
+    def _key(self, text: str) -> str:
+        return self.cache.key(self.backend.name, self.source, self.target, text)
+
+    def translate_batch(self, texts: list) -> list:
+        """Return one entry per text: the translation, or the exception that text raised."""
+        results = [None] * len(texts)
+        pending = []
+        for index, text in enumerate(texts):
+            cached = self.cache.get_json("translations", self._key(text))
+            if cached is not None:
+                results[index] = cached["text"]
+            else:
+                pending.append(index)
+        if not pending:
+            return results
+        try:
+            translated = self.backend.translate_batch([texts[i] for i in pending], self.source, self.target)
+        except Exception as e:
+            if len(pending) == 1:
+                # Already a single text; retrying it alone would repeat the same request.
+                translated = [e]
+            else:
+                logger.warning(f"Batched translation failed, translating individually: {str(e)}")
+                translated = []
+                for index in pending:
+                    try:
+                        translated.extend(self.backend.translate_batch([texts[index]], self.source, self.target))
+                    except Exception as item_error:
+                        translated.append(item_error)
+        for index, text in zip(pending, translated):
+            results[index] = text
+            if not isinstance(text, Exception):
+                self.cache.put_json("translations", self._key(texts[index]), {"text": text})
+        return results
@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import concurrent.futures
+from src.config import Config
+from src.cache import ArtifactCache
+from src.models import whisper_registry
+from src.utils import probe_duration
+from src.important_video import ImportantVideo, add_pipeline_arguments, processor_options
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("VideoProcessor")
+
+# Which resource each stage mostly occupies; stages of different videos in different lanes overlap.
+STAGE_LANES = {
+    "downscale": "analyze",
+    "detect_scenes": "analyze",
+    "top_scenes": "analyze",
+    "convert_clips_to_text": "transcribe",
+    "text_to_speech": "speech",
+    "merge_audio_with_clips": "render",
+    "merge_all_clips": "render",
+    "render_filtergraph": "render",
+    "mux_languages": "render"
+}
+
+class LaneTracker:
+    """``progress`` callback for one video that holds the lane of the stage it is running.
+
+    ``ImportantVideo.process`` calls it before each stage, so entering a stage in another
+    lane releases the previous lane and waits for a free slot in the new one.
+    """
+
+    def __init__(self, lanes: dict):
+        self.lanes = lanes
+        self.lane = None
+        self.waits = {}
+
+    def __call__(self, stage: str, percent: int) -> None:
+        lane = STAGE_LANES.get(stage)
+        if lane == self.lane:
+            return
+        self.release()
+        if lane is None:
+            return
+        start_time = time.time()
+        self.lanes[lane].acquire()
+        self.waits[lane] = self.waits.get(lane, 0.0) + time.time() - start_time
+        self.lane = lane
+
+    def release(self) -> None:
+        if self.lane is not None:
+            self.lanes[self.lane].release()
+            self.lane = None
+
+def collect_videos(source: str, output_root: str) -> list:
+    """Batch items from a directory of videos or a manifest.
+
+    A manifest is either a text file with one video path per line (``#`` starts a comment
+    line) or a JSON list of objects with a ``video`` path and optional ``output``, ``lang``,
+    ``scenes`` and ``tts_speed`` overrides. Relative ``video`` and ``output`` paths are
+    resolved against the manifest's folder. Videos without an ``output`` get a folder under
+    ``output_root`` named after the file, never one another entry already uses.
+    """
+    if os.path.isdir(source):
+        entries = [
+            {"video": os.path.join(source, name)}
+            for name in sorted(os.listdir(source))
+            if os.path.splitext(name)[1].lower() in Config.VIDEO_EXTENSIONS
+        ]
+    else:
+        base = os.path.dirname(os.path.abspath(source))
+        with open(source, 'r', encoding='utf-8') as f:
+            if source.endswith(".json"):
+                entries = json.load(f)
+            else:
+                entries = [{"video": line.strip()} for line in f if line.strip() and not line.strip().startswith("#")]
+        for entry in entries:
+            entry["video"] = os.path.join(base, entry["video"])
+            if "output" in entry:
+                entry["output"] = os.path.join(base, entry["output"])
+    used = set()
+    for entry in entries:
+        if "output" in entry:
+            output = os.path.abspath(entry["output"])
+            if output in used:
+                raise ValueError(f"Several videos in {source} write to {entry['output']}")
+            used.add(output)
+    for entry in entries:
+        if "output" not in entry:
+            name = os.path.splitext(os.path.basename(entry["video"]))[0]
+            candidate, k = name, 1
+            while os.path.abspath(os.path.join(output_root, candidate)) in used:
+                k += 1
+                candidate = f"{name}_{k}"
+            entry["output"] = os.path.join(output_root, candidate)
+            used.add(os.path.abspath(entry["output"]))
+    return entries
+
+def run_video(entry: dict, options: dict, downscale: int, resume: bool, lanes: dict, cache: ArtifactCache) -> dict:
+    tracker = LaneTracker(lanes)
+    start_time = time.time()
+    result = {"video": entry["video"], "output": entry["output"], "status": "failed", "error": None}
+    processor = None
+    try:
+        overrides = {key: entry[key] for key in ("lang", "tts_speed") if key in entry}
+        if "scenes" in entry:
+            overrides["num_scenes"] = entry["scenes"]
+        processor = ImportantVideo(entry["video"], **{**options, **overrides}, cache=cache)
+        output_path = processor.process(entry["output"], downscale, progress=tracker, resume=resume)
+        if not os.path.exists(output_path):
+            raise RuntimeError("No output was produced")
+        result.update(status="completed", output_path=output_path)
+    except Exception as e:
+        logger.error(f"Failed to process {entry['video']}: {str(e)}")
+        result["error"] = str(e)
+    finally:
+        tracker.release()
+    result["seconds"] = time.time() - start_time
+    result["lane_wait"] = tracker.waits
+    if processor is not None:
+        result["stages"] = {
+            span["name"]: span["duration"]
+            for span in processor.spans.spans if span.get("kind") == "stage"
+        }
+        result["resumed_stages"] = processor.analytics.get("resumed_stages", [])
+        try:
+            result["video_duration"] = (processor.probe or {}).get("duration") or probe_duration(entry["video"])
+        except Exception:
+            result["video_duration"] = None
+    return result
+
+def run_batch(entries: list, options: dict, downscale: int = Config.DEFAULT_DOWNSCALE, resume: bool = False, in_flight: int = Config.BATCH_IN_FLIGHT, lane_limits: dict = None) -> dict:
+    """Process ``entries`` with up to ``in_flight`` videos in progress, one stage lane each at a time."""
+    lanes = {lane: threading.BoundedSemaphore(limit) for lane, limit in (lane_limits or Config.BATCH_LANES).items()}
+    cache = ArtifactCache()
+    whisper_registry.preload([options.get("whisper_size") or Config.WHISPER_MODEL])
+    start_time = time.time()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=in_flight) as executor:
+        futures = [executor.submit(run_video, entry, options, downscale, resume, lanes, cache) for entry in entries]
+        results = []
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results.append(result)
+            logger.info(f"[{len(results)}/{len(entries)}] {result['status']}: {result['video']} in {result['seconds']:.1f} seconds")
+    wall_time = time.time() - start_time
+    completed = [r for r in results if r["status"] == "completed"]
+    video_seconds = sum(r.get("video_duration") or 0.0 for r in completed)
+    order = {entry["output"]: k for k, entry in enumerate(entries)}
+    return {
+        "videos": len(entries),
+        "completed": len(completed),
+        "failed": len(results) - len(completed),
+        "wall_time": wall_time,
+        "videos_per_hour": len(completed) * 3600 / wall_time if wall_time > 0 else None,
+        "video_seconds_per_second": video_seconds / wall_time if wall_time > 0 else None,
+        # Total time spent inside stages over wall time: how much the lanes overlapped.
+        "overlap": sum(sum(r.get("stages", {}).values()) for r in results) / wall_time if wall_time > 0 else None,
+        "failures": [{"video": r["video"], "error": r["error"]} for r in results if r["status"] != "completed"],
+        "results": sorted(results, key=lambda r: order[r["output"]])
+    }
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize every video in a directory or manifest")
+    parser.add_argument("source", help="Directory of videos, a text file of paths, or a JSON manifest")
+    parser.add_argument("--output", default="output", help="Root folder; each video gets its own subfolder")
+    parser.add_argument("--in-flight", type=int, default=Config.BATCH_IN_FLIGHT, help="Videos processed concurrently (each in a different stage)")
+    parser.add_argument("--summary", default=None, help="Where to write the JSON summary (default: <output>/batch_summary.json)")
+    add_pipeline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    entries = collect_videos(args.source, args.output)
+    if not entries:
+        logger.error(f"No videos found in {args.source}")
+        return 1
+    logger.info(f"Processing {len(entries)} videos with {args.in_flight} in flight")
+    summary = run_batch(entries, processor_options(args), args.downscale, args.resume, args.in_flight)
+
+    summary_path = args.summary or os.path.join(args.output, "batch_summary.json")
+    os.makedirs(os.path.dirname(summary_path) or ".", exist_ok=True)
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    for result in summary["results"]:
+        logger.info(f"{result['status']:>9}  {result['seconds']:8.1f}s  {result['video']}{'  ' + result['error'] if result['error'] else ''}")
+    logger.info(
+        f"Completed {summary['completed']}/{summary['videos']} videos in {summary['wall_time']:.1f} seconds "
+        f"({summary['videos_per_hour'] or 0:.1f} videos/hour, overlap {summary['overlap'] or 0:.2f}x); summary saved to {summary_path}"
+    )
+    return 0 if summary["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
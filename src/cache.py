@@ -0,0 +1,151 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from src.config import Config
+
+logger = logging.getLogger("VideoProcessor")
+
+class ArtifactCache:
+    """Content-addressed store for stage artifacts, shared by every job and bounded by LRU eviction.
+
+    Entries live at ``{root}/{stage}/{key[:2]}/{key}{suffix}``; reads refresh the file's
+    mtime so eviction drops the least recently used entries first. The cache's size is
+    tracked as entries are written, so the directory is only walked once to seed that
+    total and again when a write takes it over budget.
+    """
+
+    def __init__(self, root: str = Config.CACHE_DIR, max_mb: float = Config.CACHE_MAX_MB, enabled: bool = Config.CACHE_ENABLED):
+        self.root = root
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._size = None
+
+    @staticmethod
+    def key(*parts) -> str:
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, stage: str, key: str, suffix: str) -> str:
+        return os.path.join(self.root, stage, key[:2], f"{key}{suffix}")
+
+    def _record(self, stage: str, hit: bool) -> None:
+        with self._lock:
+            counts = self.stats.setdefault(stage, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def _lookup(self, stage: str, key: str, suffix: str) -> str:
+        if not self.enabled:
+            return None
+        path = self._path(stage, key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            self._record(stage, False)
+            return None
+        self._record(stage, True)
+        return path
+
+    def _store(self, path: str, write) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            write(temp_path)
+            size = os.path.getsize(temp_path)
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry {path}: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self._walk()[1]
+            else:
+                self._size += size - replaced
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def get_json(self, stage: str, key: str):
+        path = self._lookup(stage, key, ".json")
+        if path is None:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {str(e)}")
+            return None
+
+    def put_json(self, stage: str, key: str, value) -> None:
+        if not self.enabled:
+            return
+
+        def write(temp_path: str) -> None:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+
+        self._store(self._path(stage, key, ".json"), write)
+
+    def get_file(self, stage: str, key: str, dest: str, suffix: str = "") -> bool:
+        """Copy a cached file to ``dest``; returns False on a miss."""
+        path = self._lookup(stage, key, suffix)
+        if path is None:
+            return False
+        try:
+            shutil.copyfile(path, dest)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to restore cache entry {path}: {str(e)}")
+            return False
+
+    def put_file(self, stage: str, key: str, src: str, suffix: str = "") -> None:
+        if not self.enabled or not os.path.exists(src):
+            return
+        self._store(self._path(stage, key, suffix), lambda temp_path: shutil.copyfile(src, temp_path))
+
+    def _walk(self) -> tuple:
+        """(mtime, size, path) of every entry and their total size, from one walk of the cache."""
+        entries = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits in ``max_bytes``.
+
+        Walks the directory, so the running total is resynced with writes made by other
+        processes sharing the cache.
+        """
+        entries, total = self._walk()
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._size = total
+        if removed:
+            logger.info(f"Evicted {removed} cache entries from {self.root}")
+        return removed
@@ -0,0 +1,91 @@
+import os
+import json
+import time
+import logging
+from src.cache import ArtifactCache
+from src.config import Config
+from src.utils import file_sha256
+
+logger = logging.getLogger("VideoProcessor")
+
+def read_manifest(output_folder: str) -> dict:
+    path = os.path.join(output_folder, Config.MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable manifest {path}: {str(e)}")
+        return None
+
+class StageManifest:
+    """Per-job record of completed stages, their artifacts (with checksums) and restorable state.
+
+    Stage keys are chained: each one hashes the previous stage's key with the parameters
+    the stage depends on, so changing ``lang`` re-runs transcription onwards but keeps the
+    scene detection. The first stage that is missing, stale or has a modified artifact
+    ends the resume and every later stage is recomputed.
+    """
+
+    def __init__(self, output_folder: str, job: dict, resume: bool = False):
+        self.output_folder = output_folder
+        self.path = os.path.join(output_folder, Config.MANIFEST_FILE)
+        self.data = {"job": job, "stages": {}}
+        self.resumed = []
+        self._key = None
+        self._keys = {}
+        previous = read_manifest(output_folder) if resume else None
+        self._previous = previous["stages"] if previous else {}
+        self._resuming = bool(self._previous)
+
+    def _write(self) -> None:
+        os.makedirs(self.output_folder, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def _intact(self, stage: str, artifacts: dict) -> bool:
+        for name, checksum in artifacts.items():
+            path = os.path.join(self.output_folder, name)
+            if not os.path.exists(path) or file_sha256(path) != checksum:
+                logger.info(f"Checkpoint for {stage} is stale: {name} is missing or modified")
+                return False
+        return True
+
+    def restore(self, stage: str, *params) -> dict:
+        """Return the saved state of ``stage`` if it can be reused, else None (the stage must run)."""
+        self._key = ArtifactCache.key(self._key, stage, *params)
+        self._keys[stage] = self._key
+        entry = self._previous.get(stage)
+        if not self._resuming or entry is None:
+            self._resuming = False
+            return None
+        if entry["key"] != self._key or not self._intact(stage, entry["artifacts"]):
+            if entry["key"] != self._key:
+                logger.info(f"Checkpoint for {stage} is stale: parameters changed")
+            self._resuming = False
+            return None
+        self.data["stages"][stage] = entry
+        self.resumed.append(stage)
+        self._write()
+        return entry["state"]
+
+    def record(self, stage: str, state: dict, artifacts: list = ()) -> bool:
+        """Checkpoint a finished stage; stages whose artifacts were not produced are not recorded."""
+        missing = [path for path in artifacts if not os.path.exists(path)]
+        if missing:
+            logger.warning(f"Not checkpointing {stage}: missing {missing}")
+            return False
+        self.data["stages"][stage] = {
+            "key": self._keys[stage],
+            "state": state,
+            "artifacts": {
+                os.path.relpath(path, self.output_folder): file_sha256(path)
+                for path in artifacts
+            },
+            "completed_at": time.time()
+        }
+        self._write()
+        return True
@@ -3,7 +3,111 @@ class Config:
     DEFAULT_NUM_SCENES = 10
     DEFAULT_TTS_SPEED = 1.0
     DEFAULT_DOWNSCALE = 2
+    SCENE_THRESHOLD = 30.0
+    SCENE_DETECT_WORKERS = 0
+    SCENE_DETECT_FRAME_SKIP = 0
+    SCENE_SHARD_MIN_SECONDS = 300.0
+    SCENE_SHARD_WARMUP = 2.0
+    FINGERPRINT_SIZE = 8
+    FINGERPRINT_INTERVAL = 1.0
+    # Scenes whose mean thumbnail varies less than this (grey levels, std) are too flat to hash.
+    FINGERPRINT_MIN_STD = 4.0
+    # Largest fraction of differing fingerprint bits at which two scenes count as duplicates; 0 disables.
+    DEDUP_THRESHOLD = 0.1
+    AUDIO_SAMPLE_RATE = 16000
+    WHISPER_MODEL = "base"
+    WHISPER_PRELOAD = ["base"]
+    WHISPER_IDLE_TTL = 600.0
+    # Third-party modules each stage imports on first use; none may load when src.api or the CLIs are imported.
+    STAGE_DEPENDENCIES = {
+        "detect_scenes": ["scenedetect", "cv2"],
+        "convert_clips_to_text": ["whisper", "torch", "deep_translator"],
+        "text_to_speech": ["gtts"]
+    }
+    TRANSCRIBE_BATCH_SIZE = 4
+    TRANSCRIBE_MAX_WORKERS = 4
+    TRANSCRIBE_CORES_PER_WORKER = 2
+    TRANSCRIBE_WORKER_MEMORY_MB = 512
+    VAD_ENABLED = True
+    VAD_FRAME_MS = 30
+    VAD_THRESHOLD_DB = -45.0
+    VAD_NOISE_MARGIN_DB = 8.0
+    # Speech over a steady bed: energy in these bands above the band's typical level.
+    VAD_BAND_HZ = (100.0, 4000.0)
+    VAD_BANDS = 12
+    VAD_BAND_MARGIN_DB = 6.0
+    VAD_BAND_MIN_SHARE_DB = -10.0
+    VAD_MIN_SPEECH_SECONDS = 0.5
+    VAD_PAD_SECONDS = 0.3
+    TRANSLATION_BACKEND = "google"
+    TRANSLATION_BATCH_CHARS = 4500
+    TTS_BACKEND = "gtts"
+    TTS_CONCURRENCY = 4
+    # With several languages: "tracks" adds one audio track per language to the final MP4,
+    # "files" writes one MP4 per extra language next to it. The video is never re-encoded.
+    LANGUAGE_OUTPUT = "tracks"
+    # Narration longer than its clip is sped up by at most this factor, then cut.
+    LANGUAGE_MAX_TEMPO = 1.3
+    # MP4 language tags are ISO 639-2; other codes are written as given.
+    LANGUAGE_CODES = {
+        "en": "eng", "hi": "hin", "mr": "mar", "ta": "tam", "te": "tel", "bn": "ben",
+        "gu": "guj", "kn": "kan", "ml": "mal", "pa": "pan", "ur": "urd", "or": "ori"
+    }
+    SCRATCH_DIR = None
+    SCRATCH_USE_TMPFS = True
+    CACHE_ENABLED = True
+    CACHE_DIR = "cache"
+    CACHE_MAX_MB = 2048
+    MAX_UPLOAD_MB = 4096
+    JOB_WORKERS = 1
+    ADMISSION_ENABLED = True
+    # Outstanding CPU-seconds of admitted work (0: ADMISSION_BACKLOG_SECONDS per core) and memory
+    # for the jobs that can run at once (0: 75% of the memory available at startup).
+    ADMISSION_CPU_SECONDS = 0
+    ADMISSION_BACKLOG_SECONDS = 600
+    ADMISSION_MEMORY_MB = 0
+    # Cost model; CPU-seconds per second of input video and megapixel for decode and detection
+    # (detection divided by downscale squared), per second of selected scenes for Whisper and
+    # per second and megapixel for encodes, and per scene and language for TTS.
+    ADMISSION_COSTS = {
+        "decode": 0.05,
+        "detect": 0.05,
+        "whisper": 0.5,
+        "encode": 0.5,
+        "tts": 0.5,
+        "scene_seconds": 15.0,
+        "memory_mb": 1500,
+        "memory_mb_per_mpx": 200
+    }
+    # Before rejecting, try raising downscale up to this and halving num_scenes down to this.
+    ADMISSION_MAX_DOWNSCALE = 8
+    ADMISSION_MIN_SCENES = 3
+    ADMISSION_RETRY_AFTER = (5, 600)
+    BATCH_IN_FLIGHT = 4
+    BATCH_LANES = {"analyze": 1, "transcribe": 1, "speech": 1, "render": 1}
+    VIDEO_EXTENSIONS = [".mp4", ".mkv", ".mov", ".avi", ".webm"]
+    # Outside output/, which the API serves to clients.
+    JOB_DB = "data/jobs.db"
+    MANIFEST_FILE = "manifest.json"
+    CLIP_ENCODE_ARGS = ["-c:v", "libx264", "-c:a", "aac", "-ar", "44100", "-ac", "2"]
+    # libx264 preset/CRF per profile; "balanced" is x264's own default.
+    ENCODE_PROFILES = {
+        "fast": {"preset": "veryfast", "crf": 26},
+        "balanced": {"preset": "medium", "crf": 23},
+        "quality": {"preset": "slow", "crf": 20}
+    }
+    ENCODE_PROFILE = "balanced"
+    FFMPEG_CPU_BUDGET = 0
+    FFMPEG_THREADS = 2
+    RENDERER = "clips"
+    WRITE_SCENE_CLIPS = False
+    # HLS segments are only useful to clients polling the API; the CLI, batch and benchmark opt in with --hls.
+    HLS_ENABLED = False
+    API_HLS_ENABLED = True
+    WRITE_FINAL_MP4 = True
     OUTPUT_TRANSCRIPTS = "transcripts"
     OUTPUT_AUDIO = "audio"
     OUTPUT_VIDEO_CLIPS = "video_with_audio"
-    FINAL_OUTPUT = "final_merged_video.mp4"
\ No newline at end of file
+    FINAL_OUTPUT = "final_merged_video.mp4"
+    OUTPUT_HLS = "hls"
+    HLS_PLAYLIST = "playlist.m3u8"
\ No newline at end of file
@@ -0,0 +1,65 @@
+import numpy as np
+from src.config import Config
+
+def thumbnail(frame: np.ndarray, size: int = Config.FINGERPRINT_SIZE) -> np.ndarray:
+    """Grayscale ``size`` x ``size`` block average of a decoded (height, width[, channels]) frame."""
+    height, width = frame.shape[0] // size, frame.shape[1] // size
+    if height == 0 or width == 0:
+        raise ValueError(f"Frame {frame.shape[:2]} is smaller than the {size}x{size} fingerprint")
+    blocks = frame[:height * size, :width * size].reshape(size, height, size, width, -1)
+    return blocks.mean(axis=(1, 3, 4)).astype(np.uint8)
+
+class FrameSampler:
+    """Thumbnails of one decoded frame every ``interval`` seconds, fed by the scene detector."""
+
+    def __init__(self, fps: float, interval: float = Config.FINGERPRINT_INTERVAL, size: int = Config.FINGERPRINT_SIZE):
+        self.step = max(1, int(round(fps * interval)))
+        self.size = size
+        self.frames = []
+        self.thumbnails = []
+
+    def add(self, frame_num: int, frame: np.ndarray) -> None:
+        if self.frames and frame_num - self.frames[-1] < self.step:
+            return
+        self.frames.append(frame_num)
+        self.thumbnails.append(thumbnail(frame, self.size))
+
+    def samples(self, start_frame: int = 0, end_frame: int = None) -> tuple:
+        """(frame numbers, thumbnails) sampled in ``[start_frame, end_frame)`` as arrays."""
+        frames = np.array(self.frames, dtype=np.int64)
+        thumbnails = np.array(self.thumbnails, dtype=np.uint8).reshape(-1, self.size, self.size)
+        keep = frames >= start_frame
+        if end_frame is not None:
+            keep &= frames < end_frame
+        return frames[keep], thumbnails[keep]
+
+def scene_fingerprints(frames: np.ndarray, thumbnails: np.ndarray, bounds: list) -> list:
+    """Average hash of each (start, end) frame range's mean thumbnail, as packed bits.
+
+    Averaging over the scene makes the hash describe the shot rather than one frame of
+    it. Scenes without a sampled frame, or too flat to hash (solid colours, black, fades,
+    which would all hash to the same bits), get None and are never treated as duplicates.
+    """
+    fingerprints = []
+    for start, end in bounds:
+        selected = thumbnails[(frames >= start) & (frames < end)]
+        if len(selected) == 0:
+            fingerprints.append(None)
+            continue
+        mean = selected.mean(axis=0)
+        if mean.std() < Config.FINGERPRINT_MIN_STD:
+            fingerprints.append(None)
+            continue
+        fingerprints.append(np.packbits(mean > np.median(mean)))
+    return fingerprints
+
+def distance(a: np.ndarray, b: np.ndarray) -> float:
+    """Fraction of differing bits between two fingerprints."""
+    return np.unpackbits(a ^ b).mean()
+
+def encode_fingerprints(fingerprints: list) -> list:
+    """Hex strings for JSON caches and checkpoints."""
+    return [fingerprint.tobytes().hex() if fingerprint is not None else None for fingerprint in fingerprints]
+
+def decode_fingerprints(encoded: list) -> list:
+    return [np.frombuffer(bytes.fromhex(value), dtype=np.uint8) if value is not None else None for value in encoded]
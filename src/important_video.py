@@ -1,17 +1,23 @@
-from scenedetect import VideoManager, SceneManager, ContentDetector
 import os
 import logging
 import time
 import concurrent.futures
 import argparse
-from gtts import gTTS
-import shutil
-from src.utils import run_ffmpeg, safe_remove
+from src.utils import run_ffmpeg, safe_remove, decode_audio, file_sha256, probe_duration, probe_video, scratch_dir
+from src.cache import ArtifactCache
+from src.backends import get_translation_backend, get_tts_backend, MemoizedTranslator
 from src.config import Config
-import whisper
+from src.models import whisper_registry
+from src.transcription import TranscriptionEngine
+from src.scene_detection import detect_scene_list, scene_timecodes
+from src.fingerprint import distance, encode_fingerprints, decode_fingerprints
+from src.metrics import SpanRecorder, stage_span, profiled
+from src.checkpoint import StageManifest
+from src.store import analytics_sections
+from src.streaming import HLSPlaylist
+from src.vad import find_speech, scene_energies
+from src.scheduler import ffmpeg_scheduler, encode_args, decode_args
 import numpy as np
-import librosa
-from deep_translator import GoogleTranslator
 import json
 
 # Configure logging
@@ -21,24 +27,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger("VideoProcessor")
 
+# Analytics keys and processing_steps entries each checkpointed stage writes, restored on resume.
+STAGE_ANALYTICS = {
+    "detect_scenes": (("scenes",), ("scene_detection",)),
+    "top_scenes": (("summary_clips",), ("top_scenes", "audio_decode")),
+    "convert_clips_to_text": (("transcripts",), ("whisper_model", "convert_clips_to_text")),
+    "text_to_speech": (("audio_files",), ("text_to_speech",)),
+    "merge_audio_with_clips": (("video_clips", "stream", "scheduler"), ("merge_audio_with_clips",)),
+    "merge_all_clips": (("final_output",), ()),
+    "render_filtergraph": (("video_clips", "final_output", "scheduler"), ("render_filtergraph",)),
+    "mux_languages": (("final_output", "languages"), ("mux_languages",)),
+}
+
 class ImportantVideo:
-    def __init__(self, video_path: str, lang: str = Config.DEFAULT_LANG, num_scenes: int = Config.DEFAULT_NUM_SCENES, tts_speed: float = Config.DEFAULT_TTS_SPEED):
+    def __init__(self, video_path: str, lang: str = Config.DEFAULT_LANG, num_scenes: int = Config.DEFAULT_NUM_SCENES, tts_speed: float = Config.DEFAULT_TTS_SPEED, whisper_size: str = Config.WHISPER_MODEL, video_hash: str = None, cache: ArtifactCache = None, translation_backend: str = None, tts_backend: str = None, renderer: str = Config.RENDERER, write_clips: bool = Config.WRITE_SCENE_CLIPS, probe: dict = None, frame_skip: int = Config.SCENE_DETECT_FRAME_SKIP, job_id: str = None, store=None, streaming: bool = Config.HLS_ENABLED, final_mp4: bool = Config.WRITE_FINAL_MP4, vad: bool = Config.VAD_ENABLED, encode_profile: str = Config.ENCODE_PROFILE, dedup_threshold: float = Config.DEDUP_THRESHOLD, language_output: str = Config.LANGUAGE_OUTPUT):
         logger.info(f"Initializing processor for video: {video_path}")
         if not os.path.exists(video_path):
             logger.error(f"Video file not found: {video_path}")
             raise FileNotFoundError(f"Video file not found: {video_path}")
         
         self.video_path = video_path
-        self.lang = lang
+        # ``lang`` is one code, a comma-separated string or a list; the first is the primary
+        # language, narrated in the clips and stream, and the rest share its analysis.
+        self.langs = list(dict.fromkeys(
+            code.strip() for code in (lang.split(",") if isinstance(lang, str) else lang) if code.strip()
+        ))
+        if not self.langs:
+            raise ValueError("At least one language is required")
+        self.lang = self.langs[0]
         self.num_scenes = num_scenes
         self.tts_speed = tts_speed
         self.scenes_list = None
+        self.scene_fingerprints = None
         self.summary_clips = None
-        self.video_manager = VideoManager([video_path])
-        self.scene_manager = SceneManager()
-        self.scene_manager.add_detector(ContentDetector(threshold=30.0))
-        self.whisper_model = whisper.load_model("base")
-        self.translator = GoogleTranslator(source='en', target='hi')
+        self.playlist = None
+        self.audio_track = None
+        self.audio_sr = Config.AUDIO_SAMPLE_RATE
+        self.downscale_factor = None
+        self.frame_skip = frame_skip
+        self.dedup_threshold = dedup_threshold
+        self.whisper_size = whisper_size
+        self.video_hash = video_hash
+        self.probe = probe
+        self.spans = SpanRecorder()
+        self.cache = cache if cache is not None else ArtifactCache()
+        translation = get_translation_backend(translation_backend)
+        self.translators = {code: MemoizedTranslator(translation, self.cache, source='en', target=code) for code in self.langs}
+        self.translator = self.translators[self.lang]
+        self.tts_backend = get_tts_backend(tts_backend)
+        if renderer not in ("clips", "filtergraph"):
+            raise ValueError(f"Unknown renderer: {renderer}")
+        self.renderer = renderer
+        self.write_clips = write_clips
+        if not final_mp4 and not (streaming and renderer == "clips"):
+            raise ValueError("The final MP4 can only be skipped when streaming with the clips renderer")
+        self.streaming = streaming
+        self.vad = vad
+        if encode_profile not in Config.ENCODE_PROFILES:
+            raise ValueError(f"Unknown encode profile: {encode_profile}")
+        self.encode_profile = encode_profile
+        self.final_mp4 = final_mp4
+        if language_output not in ("tracks", "files"):
+            raise ValueError(f"Unknown language output: {language_output}")
+        if len(self.langs) > 1 and not final_mp4:
+            raise ValueError("Additional languages are muxed into the final MP4, so it cannot be skipped")
+        self.language_output = language_output
+        self.started_at = time.time()
+        self.job_id = job_id
+        self.store = store
+        self._saved_sections = {}
         self.analytics = {
             "input_file": video_path,
             "input_size": os.path.getsize(video_path) / (1024 * 1024),  # Size in MB
@@ -48,39 +105,102 @@ class ImportantVideo:
             "audio_files": {},
             "video_clips": [],
             "final_output": None,
+            "cache": self.cache.stats,
+            "spans": self.spans.spans,
+            "scheduler": {
+                "encode_profile": encode_profile,
+                "threads_per_encode": ffmpeg_scheduler.threads,
+                "max_concurrent_encodes": ffmpeg_scheduler.max_concurrent,
+                "ffmpeg_queue_wait": 0.0
+            },
             "logs": []
         }
+        if video_hash:
+            self.analytics["input_hash"] = video_hash
+        if probe:
+            self.analytics["probe"] = probe
 
     def _save_analytics(self, output_folder: str):
+        if self.store is not None and self.job_id is not None:
+            # Only sections that changed since the last save are written to the job store.
+            sections = analytics_sections(self.analytics)
+            changed = {key: value for key, value in sections.items() if self._saved_sections.get(key) != value}
+            self.store.put_analytics(self.job_id, changed)
+            self._saved_sections.update(changed)
+            logger.info(f"Saved {len(changed)} analytics section(s) for job {self.job_id}")
+            return
         analytics_path = os.path.join(output_folder, "analytics.json")
         os.makedirs(output_folder, exist_ok=True)
         with open(analytics_path, 'w') as f:
             json.dump(self.analytics, f, indent=2)
         logger.info(f"Saved analytics to {analytics_path}")
 
+    def _video_hash(self) -> str:
+        if self.video_hash is None:
+            self.video_hash = file_sha256(self.video_path)
+            self.analytics["input_hash"] = self.video_hash
+        return self.video_hash
+
+    def _probe(self) -> dict:
+        if self.probe is None:
+            self.probe = probe_video(self.video_path, spans=self.spans)
+            self.analytics["probe"] = self.probe
+        return self.probe
+
+    def _queue_wait(self, stage: str) -> float:
+        """Seconds this stage's encodes spent waiting for an ffmpeg slot; also added to the job total."""
+        wait = sum(span["duration"] for span in self.spans.spans if span["name"] == "ffmpeg_queue" and span["stage"] == stage)
+        self.analytics["scheduler"]["ffmpeg_queue_wait"] += wait
+        return wait
+
+    def _scene_bounds(self, scene: tuple) -> tuple:
+        return max(0, scene[0].get_seconds() - 0.5), scene[1].get_seconds() + 0.5
+
+    @stage_span("downscale")
     def downscale(self, factor: int = Config.DEFAULT_DOWNSCALE) -> None:
         start_time = time.time()
         if factor < 1:
             logger.warning(f"Invalid downscale factor: {factor}")
             raise ValueError("Downscale factor must be >= 1")
         logger.debug(f"Setting downscale factor to {factor}")
-        self.video_manager.set_downscale_factor(factor)
+        self.downscale_factor = factor
         self.analytics["processing_steps"]["downscale"] = {
             "factor": factor,
             "time_taken": time.time() - start_time
         }
 
+    @stage_span("detect_scenes")
     def detect_scenes(self) -> None:
         logger.info("Starting scene detection")
         start_time = time.time()
+        cache_key = self.cache.key(
+            self._video_hash(), self.downscale_factor, Config.SCENE_THRESHOLD, self.frame_skip,
+            Config.FINGERPRINT_SIZE, Config.FINGERPRINT_INTERVAL, Config.FINGERPRINT_MIN_STD
+        )
+        cached = self.cache.get_json("scenes", cache_key)
         try:
-            self.video_manager.start()
-            self.scene_manager.detect_scenes(frame_source=self.video_manager)
-            self.scenes_list = self.scene_manager.get_scene_list()
+            stats = {"segments": 0, "frame_skip": self.frame_skip}
+            if cached is not None:
+                fps = cached["fps"]
+                self.scenes_list = scene_timecodes(cached["scenes"], fps)
+                self.scene_fingerprints = decode_fingerprints(cached["fingerprints"])
+            else:
+                # Only probe for keyframes when there is more than one core to shard across.
+                probe = self._probe() if (Config.SCENE_DETECT_WORKERS or os.cpu_count() or 1) > 1 else self.probe
+                self.scenes_list, self.scene_fingerprints, stats = detect_scene_list(
+                    self.video_path, probe, Config.SCENE_THRESHOLD, self.downscale_factor, self.frame_skip
+                )
+                self.cache.put_json("scenes", cache_key, {
+                    "fps": self.scenes_list[0][0].get_framerate() if self.scenes_list else None,
+                    "scenes": [[s.get_frames(), e.get_frames()] for s, e in self.scenes_list],
+                    "fingerprints": encode_fingerprints(self.scene_fingerprints)
+                })
             logger.info(f"Scene detection completed: found {len(self.scenes_list)} scenes in {time.time() - start_time:.2f} seconds")
             self.analytics["processing_steps"]["scene_detection"] = {
                 "num_scenes_detected": len(self.scenes_list),
-                "threshold": 30.0,
+                "threshold": Config.SCENE_THRESHOLD,
+                "cached": cached is not None,
+                **stats,
                 "time_taken": time.time() - start_time
             }
             self.analytics["scenes"] = [
@@ -93,31 +213,38 @@ class ImportantVideo:
             logger.error(f"Error during scene detection: {str(e)}")
             self.analytics["logs"].append(f"Error during scene detection: {str(e)}")
             raise
-        finally:
-            self.video_manager.release()
 
-    def _extract_audio_energy(self, start_time: float, duration: float) -> float:
-        temp_audio = f"temp_energy_{int(time.time())}.wav"
+    def _load_audio_track(self) -> np.ndarray:
+        """Decode the mono audio track once; later stages slice this buffer instead of re-running ffmpeg."""
+        if self.audio_track is not None:
+            return self.audio_track
+        start_time = time.time()
         try:
-            cmd = [
-                "ffmpeg", "-y",
-                "-i", self.video_path,
-                "-ss", str(start_time),
-                "-t", str(duration),
-                "-vn", "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1",
-                temp_audio
-            ]
-            run_ffmpeg(cmd, "Audio energy extraction failed")
-            audio, sr = librosa.load(temp_audio, sr=16000)
-            rms = librosa.feature.rms(y=audio)[0].mean()
-            return rms
+            if self.probe is not None and not any(stream["codec_type"] == "audio" for stream in self.probe["streams"]):
+                logger.warning("Input has no audio stream, skipping audio decode")
+                self.audio_track = np.zeros(0, dtype=np.float32)
+            else:
+                self.audio_track = decode_audio(self.video_path, self.audio_sr, spans=self.spans)
         except Exception as e:
-            logger.error(f"Error calculating audio energy: {str(e)}")
-            self.analytics["logs"].append(f"Error calculating audio energy: {str(e)}")
-            return 0.0
-        finally:
-            safe_remove(temp_audio)
+            logger.error(f"Error decoding audio track: {str(e)}")
+            self.analytics["logs"].append(f"Error decoding audio track: {str(e)}")
+            self.audio_track = np.zeros(0, dtype=np.float32)
+        self.analytics["processing_steps"]["audio_decode"] = {
+            "sample_rate": self.audio_sr,
+            "duration": len(self.audio_track) / self.audio_sr,
+            "size_mb": self.audio_track.nbytes / (1024 * 1024),
+            "time_taken": time.time() - start_time
+        }
+        logger.info(f"Decoded {len(self.audio_track) / self.audio_sr:.2f}s of audio in {time.time() - start_time:.2f} seconds")
+        return self.audio_track
+
+    def _audio_slice(self, start: float, end: float) -> np.ndarray:
+        audio = self._load_audio_track()
+        first = min(len(audio), max(0, int(round(start * self.audio_sr))))
+        last = min(len(audio), max(first, int(round(end * self.audio_sr))))
+        return audio[first:last]
 
+    @stage_span("top_scenes")
     def top_scenes(self) -> None:
         start_time = time.time()
         if not self.scenes_list:
@@ -126,19 +253,32 @@ class ImportantVideo:
             raise ValueError("No scenes detected. Run detect_scenes() first.")
         
         logger.info(f"Selecting top {self.num_scenes} scenes with balanced duration and energy")
-        scene_scores = []
-        for start, end in self.scenes_list:
-            duration = end.get_seconds() - start.get_seconds()
-            if duration < 5.0:
-                continue
-            energy = self._extract_audio_energy(start.get_seconds(), duration)
-            score = duration * (1.0 + energy)
-            scene_scores.append((start, end, score))
+        candidates, fingerprints = [], []
+        for (start, end), fingerprint in zip(self.scenes_list, self.scene_fingerprints or [None] * len(self.scenes_list)):
+            if end.get_seconds() - start.get_seconds() >= 5.0:
+                candidates.append((start, end))
+                fingerprints.append(fingerprint)
+        bounds = np.array([[s.get_seconds(), e.get_seconds()] for s, e in candidates], dtype=np.float64).reshape(-1, 2)
+        # Keyed on the candidates themselves: any detection setting that moves a cut changes the scores.
+        cache_key = self.cache.key(self._video_hash(), self.audio_sr, bounds.tolist())
+        cached = self.cache.get_json("scores", cache_key)
+        if cached is not None:
+            scores = cached["scores"]
+        else:
+            durations = bounds[:, 1] - bounds[:, 0]
+            scores = (durations * (1.0 + scene_energies(self._load_audio_track(), self.audio_sr, bounds))).tolist()
+            self.cache.put_json("scores", cache_key, {"scores": scores})
+        scene_scores = [(s, e, float(score), fp) for (s, e), score, fp in zip(candidates, scores, fingerprints)]
         
         sorted_scenes = sorted(scene_scores, key=lambda x: x[2], reverse=True)
-        self.summary_clips = [(s, e) for s, e, _ in sorted_scenes][:self.num_scenes]
+        self.summary_clips, pruned = self._select_distinct(sorted_scenes)
+        if pruned:
+            logger.info(f"Pruned {len(pruned)} near-duplicate scenes before transcription")
         self.analytics["processing_steps"]["top_scenes"] = {
             "num_scenes_selected": len(self.summary_clips),
+            "dedup_threshold": self.dedup_threshold,
+            "duplicates_pruned": len(pruned),
+            "pruned_scenes": pruned,
             "time_taken": time.time() - start_time
         }
         self.analytics["summary_clips"] = [
@@ -147,40 +287,67 @@ class ImportantVideo:
         ]
         logger.debug(f"Selected {len(self.summary_clips)} scenes: {[f'{s.get_seconds()}-{e.get_seconds()}s' for s, e in self.summary_clips]}")
 
-    def _process_scene(self, i: int, scene: tuple, text_dir: str) -> tuple:
-        start_time = time.time()
-        scene_start_time = scene[0].get_seconds() - 0.5
-        scene_end_time = scene[1].get_seconds() + 0.5
-        temp_audio = f"temp_audio_{i}_{int(time.time())}.wav"
+    def _select_distinct(self, sorted_scenes: list) -> tuple:
+        """Take the best-scoring scenes in order, skipping any whose fingerprint is within
+        ``dedup_threshold`` of one already taken (a repeat of the same shot).
+
+        Returns the selected (start, end) pairs and a record of each scene skipped before
+        ``num_scenes`` were found.
+        """
+        selected, kept, pruned = [], [], []
+        for start, end, _, fingerprint in sorted_scenes:
+            if len(selected) == self.num_scenes:
+                break
+            if self.dedup_threshold > 0 and fingerprint is not None:
+                closest = min(((distance(fingerprint, other), k) for k, other in kept), default=None)
+                if closest is not None and closest[0] <= self.dedup_threshold:
+                    s, e = selected[closest[1]]
+                    pruned.append({
+                        "start": start.get_seconds(),
+                        "end": end.get_seconds(),
+                        "duplicate_of": {"start": s.get_seconds(), "end": e.get_seconds()},
+                        "distance": float(closest[0])
+                    })
+                    continue
+                kept.append((fingerprint, len(selected)))
+            selected.append((start, end))
+        return selected, pruned
+
+    def _scene_audio(self, scene: tuple) -> np.ndarray:
+        return self._audio_slice(*self._scene_bounds(scene))
+
+    def _scene_label(self, i: int, lang: str) -> str:
+        """Analytics key for scene ``i``; the primary language keeps the plain ``scene_<i>``."""
+        return f"scene_{i}" if lang == self.lang else f"scene_{i}_{lang}"
+
+    def _process_scene(self, i: int, result: dict, text_dir: str, translation=None, lang: str = None) -> tuple:
+        lang = lang or self.lang
+        label = self._scene_label(i, lang)
+        transcript_path = os.path.join(text_dir, f"{label}_transcript.txt")
+        start_time = time.time() - result["time_taken"]
         try:
-            cmd = [
-                "ffmpeg", "-y",
-                "-i", self.video_path,
-                "-ss", str(max(0, scene_start_time)),
-                "-to", str(scene_end_time),
-                "-vn", "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1",
-                temp_audio
-            ]
-            run_ffmpeg(cmd, f"Audio extraction failed for scene {i}")
-            if not os.path.exists(temp_audio) or os.path.getsize(temp_audio) == 0:
+            if result["error"] is not None:
+                raise result["error"]
+            if result["text"] is None:
                 logger.warning(f"Audio extraction failed for scene {i}")
                 text = f"Scene {i} summary in Hindi"
             else:
-                result = self.whisper_model.transcribe(temp_audio, language="en", fp16=False)
                 text = result["text"].strip()
                 logger.debug(f"Raw Whisper output for scene {i}: '{text}'")
                 if not text:
                     logger.warning(f"No speech detected in scene {i}")
                     text = f"Scene {i} summary in Hindi"
                 else:
-                    text = self.translator.translate(text)
-                    logger.info(f"Translated to Hindi for scene {i}: {text[:50]}...")
+                    if isinstance(translation, Exception):
+                        raise translation
+                    text = translation
+                    logger.info(f"Translated to {lang} for scene {i}: {text[:50]}...")
         
-            transcript_path = os.path.join(text_dir, f"scene_{i}_transcript.txt")
             with open(transcript_path, 'w', encoding='utf-8') as f:
                 f.write(text)
             logger.info(f"Transcribed scene {i}: {text[:50]}...")
-            self.analytics["transcripts"][f"scene_{i}"] = {
+            self.analytics["transcripts"][label] = {
+                "lang": lang,
                 "text": text,
                 "file": transcript_path,
                 "time_taken": time.time() - start_time
@@ -190,18 +357,48 @@ class ImportantVideo:
             logger.error(f"Error processing scene {i}: {str(e)}")
             self.analytics["logs"].append(f"Error processing scene {i}: {str(e)}")
             text = f"Scene {i} summary in Hindi"
-            transcript_path = os.path.join(text_dir, f"scene_{i}_transcript.txt")
             with open(transcript_path, 'w', encoding='utf-8') as f:
                 f.write(text)
-            self.analytics["transcripts"][f"scene_{i}"] = {
+            self.analytics["transcripts"][label] = {
+                "lang": lang,
                 "text": text,
                 "file": transcript_path,
                 "time_taken": time.time() - start_time
             }
             return (f"scene_{i}", text)
-        finally:
-            safe_remove(temp_audio)
 
+    def _gate_speech(self, scene_audio: dict, results: dict) -> dict:
+        """Drop speechless scenes from ``scene_audio`` (they get empty text, hence the fallback) and trim silence from the rest."""
+        start_time = time.time()
+        gated, trimmed, saved = [], 0, 0.0
+        with self.spans.span("vad", scenes=len(scene_audio)):
+            for i, audio in list(scene_audio.items()):
+                if audio.size == 0:
+                    continue
+                region = find_speech(audio, self.audio_sr)
+                if region is None:
+                    logger.info(f"No speech found in scene {i} by VAD, skipping Whisper")
+                    del scene_audio[i]
+                    results[i] = {"text": "", "error": None, "time_taken": 0.0}
+                    gated.append(i)
+                    saved += len(audio) / self.audio_sr
+                    continue
+                start, end, _ = region
+                if end - start < len(audio):
+                    scene_audio[i] = audio[start:end]
+                    trimmed += 1
+                    saved += (len(audio) - (end - start)) / self.audio_sr
+        logger.info(f"VAD gated {len(gated)} scene(s) and trimmed {trimmed}, saving {saved:.1f}s of Whisper audio")
+        return {
+            "enabled": True,
+            "gated_scenes": gated,
+            "num_gated": len(gated),
+            "num_trimmed": trimmed,
+            "audio_seconds_saved": saved,
+            "time_taken": time.time() - start_time
+        }
+
+    @stage_span("convert_clips_to_text")
     def convert_clips_to_text(self, output_folder: str) -> dict:
         start_time = time.time()
         if not self.summary_clips:
@@ -212,66 +409,141 @@ class ImportantVideo:
         text_dir = os.path.join(output_folder, Config.OUTPUT_TRANSCRIPTS)
         os.makedirs(text_dir, exist_ok=True)
         
-        logger.info("Starting audio-to-text conversion using Whisper sequentially")
-        transcripts = {}
+        results = {}
+        scene_audio = {}
+        cache_keys = {}
         for i, scene in enumerate(self.summary_clips, 1):
-            scene_key, text = self._process_scene(i, scene, text_dir)
-            transcripts[scene_key] = text
+            cache_keys[i] = self.cache.key(self._video_hash(), *self._scene_bounds(scene), self.whisper_size, self.vad)
+            cached = self.cache.get_json("transcripts", cache_keys[i])
+            if cached is not None:
+                results[i] = {"text": cached["text"], "error": None, "time_taken": 0.0}
+            else:
+                scene_audio[i] = self._scene_audio(scene)
+        vad_stats = self._gate_speech(scene_audio, results) if self.vad else {"enabled": False}
+        
+        engine_stats = {"workers": 0, "batch_size": 0, "num_inference_calls": 0}
+        if scene_audio:
+            model_stats = {}
+            with whisper_registry.borrow(self.whisper_size, stats=model_stats) as (model, lock):
+                engine = TranscriptionEngine(model, spans=self.spans, lock=lock)
+                logger.info(f"Starting audio-to-text conversion using Whisper on {len(scene_audio)} scenes")
+                results.update(engine.transcribe(scene_audio))
+                engine_stats = engine.stats
+            self.analytics["processing_steps"]["whisper_model"] = model_stats
+            for i in scene_audio:
+                if results[i]["error"] is None and results[i]["text"] is not None:
+                    self.cache.put_json("transcripts", cache_keys[i], {"text": results[i]["text"]})
+        
+        to_translate = {
+            i: result["text"].strip() for i, result in results.items()
+            if result["error"] is None and result["text"] and result["text"].strip()
+        }
+        # Whisper ran once; only translation is repeated per language.
+        translate_start = time.time()
+        transcripts = {}
+        for lang, translator in self.translators.items():
+            with self.spans.span("translate", texts=len(to_translate), backend=translator.backend.name, lang=lang):
+                translations = dict(zip(to_translate, translator.translate_batch(list(to_translate.values()))))
+            transcripts[lang] = dict(
+                self._process_scene(i, results[i], text_dir, translations.get(i), lang)
+                for i in range(1, len(self.summary_clips) + 1)
+            )
+        translate_time = time.time() - translate_start
         
         self.analytics["processing_steps"]["convert_clips_to_text"] = {
-            "num_transcripts": len(transcripts),
+            "num_transcripts": len(transcripts[self.lang]),
+            "languages": self.langs,
+            **engine_stats,
+            "translation_backend": self.translator.backend.name,
+            "translation_time": translate_time,
+            "vad": vad_stats,
             "time_taken": time.time() - start_time
         }
-        logger.info(f"Transcription completed. Transcripts saved in {text_dir}")
+        logger.info(f"Transcription completed with {engine_stats['workers']} workers. Transcripts saved in {text_dir}")
         self._save_analytics(output_folder)
         return transcripts
 
+    def _synthesize(self, text: str, audio_path: str, lang: str) -> None:
+        cache_key = self.cache.key(self.tts_backend.name, text, lang, self.tts_speed)
+        if self.cache.get_file("tts", cache_key, audio_path, ".mp3"):
+            return
+        with self.spans.span("tts", backend=self.tts_backend.name):
+            self.tts_backend.synthesize(text, lang, self.tts_speed < 1.0, audio_path)
+        if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
+            self.cache.put_file("tts", cache_key, audio_path, ".mp3")
+
+    def _speak_scene(self, scene: str, text: str, audio_dir: str, lang: str = None) -> str:
+        lang = lang or self.lang
+        label = self._scene_label(int(scene.split('_')[1]), lang)
+        audio_path = os.path.join(audio_dir, f"{scene}_{lang}.mp3")
+        try:
+            if not text.strip():
+                text = f"Scene {scene.split('_')[1]} summary in Hindi"
+            logger.debug(f"Generating TTS for {scene}: {text}")
+            tts_start = time.time()
+            self._synthesize(text, audio_path, lang)
+            if not os.path.exists(audio_path) or os.path.getsize(audio_path) == 0:
+                logger.error(f"Failed to generate audio for {scene}: File missing or empty")
+                self.analytics["logs"].append(f"Failed to generate audio for {scene}: File missing or empty")
+                return None
+            self.analytics["audio_files"][label] = {
+                "lang": lang,
+                "file": audio_path,
+                "size_mb": os.path.getsize(audio_path) / (1024 * 1024),
+                "time_taken": time.time() - tts_start
+            }
+            logger.info(f"Generated {lang} speech for {scene}")
+            return audio_path
+        except Exception as e:
+            logger.error(f"Error generating speech for {scene}: {str(e)}")
+            self.analytics["logs"].append(f"Error generating speech for {scene}: {str(e)}")
+        try:
+            text = f"Scene {scene.split('_')[1]} summary in Hindi"
+            tts_start = time.time()
+            self._synthesize(text, audio_path, lang)
+            if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
+                self.analytics["audio_files"][label] = {
+                    "lang": lang,
+                    "file": audio_path,
+                    "size_mb": os.path.getsize(audio_path) / (1024 * 1024),
+                    "time_taken": time.time() - tts_start
+                }
+                logger.info(f"Generated fallback {lang} speech for {scene}")
+                return audio_path
+        except Exception as e:
+            logger.error(f"Error generating fallback speech for {scene}: {str(e)}")
+            self.analytics["logs"].append(f"Error generating fallback speech for {scene}: {str(e)}")
+        return None
+
+    @stage_span("text_to_speech")
     def text_to_speech(self, transcripts: dict, output_folder: str) -> dict:
         start_time = time.time()
         audio_dir = os.path.join(output_folder, Config.OUTPUT_AUDIO)
         os.makedirs(audio_dir, exist_ok=True)
         
-        audio_paths = {}
-        logger.info(f"Converting transcripts to {self.lang} speech")
-        for scene, text in transcripts.items():
-            try:
-                if not text.strip():
-                    text = f"Scene {scene.split('_')[1]} summary in Hindi"
-                logger.debug(f"Generating TTS for {scene}: {text}")
-                tts_start = time.time()
-                tts = gTTS(text=text, lang=self.lang, slow=self.tts_speed < 1.0)
-                audio_path = os.path.join(audio_dir, f"{scene}_{self.lang}.mp3")
-                tts.save(audio_path)
-                if not os.path.exists(audio_path) or os.path.getsize(audio_path) == 0:
-                    logger.error(f"Failed to generate audio for {scene}: File missing or empty")
-                    self.analytics["logs"].append(f"Failed to generate audio for {scene}: File missing or empty")
-                    continue
-                audio_paths[scene] = audio_path
-                self.analytics["audio_files"][scene] = {
-                    "file": audio_path,
-                    "size_mb": os.path.getsize(audio_path) / (1024 * 1024),
-                    "time_taken": time.time() - tts_start
+        logger.info(f"Converting transcripts to {', '.join(self.langs)} speech with {self.tts_backend.name}")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=Config.TTS_CONCURRENCY) as executor:
+            futures = {
+                lang: {
+                    scene: executor.submit(self._speak_scene, scene, text, audio_dir, lang)
+                    for scene, text in scene_texts.items()
                 }
-                logger.info(f"Generated {self.lang} speech for {scene}")
-            except Exception as e:
-                logger.error(f"Error generating speech for {scene}: {str(e)}")
-                self.analytics["logs"].append(f"Error generating speech for {scene}: {str(e)}")
-                text = f"Scene {scene.split('_')[1]} summary in Hindi"
-                tts_start = time.time()
-                tts = gTTS(text=text, lang=self.lang, slow=self.tts_speed < 1.0)
-                audio_path = os.path.join(audio_dir, f"{scene}_{self.lang}.mp3")
-                tts.save(audio_path)
-                if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
-                    audio_paths[scene] = audio_path
-                    self.analytics["audio_files"][scene] = {
-                        "file": audio_path,
-                        "size_mb": os.path.getsize(audio_path) / (1024 * 1024),
-                        "time_taken": time.time() - tts_start
-                    }
-                    logger.info(f"Generated fallback {self.lang} speech for {scene}")
+                for lang, scene_texts in transcripts.items()
+            }
+            audio_paths = {
+                lang: {scene: future.result() for scene, future in scene_futures.items()}
+                for lang, scene_futures in futures.items()
+            }
+        audio_paths = {
+            lang: {scene: path for scene, path in paths.items() if path}
+            for lang, paths in audio_paths.items()
+        }
         
         self.analytics["processing_steps"]["text_to_speech"] = {
-            "num_audio_files": len(audio_paths),
+            "num_audio_files": sum(len(paths) for paths in audio_paths.values()),
+            "languages": {lang: len(paths) for lang, paths in audio_paths.items()},
+            "backend": self.tts_backend.name,
+            "concurrency": Config.TTS_CONCURRENCY,
             "time_taken": time.time() - start_time
         }
         self._save_analytics(output_folder)
@@ -279,37 +551,43 @@ class ImportantVideo:
 
     def _merge_clip(self, i: int, scene: tuple, audio_path: str, video_dir: str, video_name: str) -> str:
         start_time = time.time()
-        scene_start_time = scene[0].get_seconds() - 0.5
-        scene_end_time = scene[1].get_seconds() + 0.5
+        scene_start_time, scene_end_time = self._scene_bounds(scene)
+        duration = scene_end_time - scene_start_time
         output_clip = os.path.join(video_dir, f"{video_name}-scene-{i}.mp4")
-        temp_video = f"temp_video_{i}_{int(time.time())}.mp4"
+        has_audio = bool(audio_path and os.path.exists(audio_path))
+        audio_hash = file_sha256(audio_path) if has_audio else None
+        cache_key = self.cache.key(self._video_hash(), scene_start_time, scene_end_time, audio_hash, encode_args(self.encode_profile))
+        if self.cache.get_file("clips", cache_key, output_clip, ".mp4"):
+            logger.info(f"Reused cached clip for scene {i}")
+            self.analytics["video_clips"].append({
+                "file": output_clip,
+                "size_mb": os.path.getsize(output_clip) / (1024 * 1024),
+                "scene_number": i,
+                "cached": True,
+                "time_taken": time.time() - start_time
+            })
+            return output_clip
         
         try:
-            cmd_extract = [
-                "ffmpeg", "-y",
-                "-i", self.video_path,
-                "-ss", str(max(0, scene_start_time)),
-                "-to", str(scene_end_time),
-                "-c:v", "libx264", "-an",
-                temp_video
-            ]
-            run_ffmpeg(cmd_extract, f"Video extraction failed for scene {i}")
-            
-            if audio_path and os.path.exists(audio_path):
-                cmd_merge = [
+            # Input-side seek plus a single encode; narration (or silence, so every clip has
+            # the same streams for the stream-copy concat) is muxed in the same pass.
+            if not has_audio:
+                logger.warning(f"No audio for scene {i}, adding a silent track")
+            with ffmpeg_scheduler.slot(self.spans) as threads:
+                # -threads before each -i caps that input's decoder; after them it only caps the encoder.
+                cmd = [
                     "ffmpeg", "-y",
-                    "-i", temp_video,
-                    "-i", audio_path,
-                    "-c:v", "copy", "-c:a", "aac",
-                    "-map", "0:v:0", "-map", "1:a:0",
-                    "-shortest",
-                    output_clip
+                    *decode_args(threads), "-ss", str(scene_start_time), "-t", str(duration),
+                    "-i", self.video_path
                 ]
-                run_ffmpeg(cmd_merge, f"Audio merge failed for scene {i}")
-                logger.info(f"Merged clip for scene {i} with audio")
-            else:
-                logger.warning(f"No audio for scene {i}, saving video only")
-                shutil.move(temp_video, output_clip)
+                if has_audio:
+                    cmd += [*decode_args(threads), "-i", audio_path]
+                else:
+                    cmd += ["-f", "lavfi", "-t", str(duration), "-i", "anullsrc=channel_layout=stereo:sample_rate=44100"]
+                cmd += ["-map", "0:v:0", "-map", "1:a:0", *encode_args(self.encode_profile, threads), "-shortest", output_clip]
+                run_ffmpeg(cmd, f"Clip render failed for scene {i}", spans=self.spans)
+            logger.info(f"Rendered clip for scene {i}{' with audio' if has_audio else ''}")
+            self.cache.put_file("clips", cache_key, output_clip, ".mp4")
             
             self.analytics["video_clips"].append({
                 "file": output_clip,
@@ -321,18 +599,42 @@ class ImportantVideo:
         except Exception as e:
             logger.error(f"Error merging clip {i}: {str(e)}")
             self.analytics["logs"].append(f"Error merging clip {i}: {str(e)}")
-            if os.path.exists(temp_video):
-                shutil.move(temp_video, output_clip)
-            self.analytics["video_clips"].append({
-                "file": output_clip,
-                "size_mb": os.path.getsize(output_clip) / (1024 * 1024),
-                "scene_number": i,
-                "time_taken": time.time() - start_time
-            })
-            return output_clip
-        finally:
-            safe_remove(temp_video)
+            safe_remove(output_clip)
+            return None
 
+    def _open_playlist(self, output_folder: str) -> HLSPlaylist:
+        longest = max(end - start for start, end in map(self._scene_bounds, self.summary_clips))
+        playlist = HLSPlaylist(os.path.join(output_folder, Config.OUTPUT_HLS), longest)
+        self.playlist = playlist
+        self.analytics["stream"] = {
+            "playlist": playlist.path,
+            "segments": 0,
+            "first_segment_after": None
+        }
+        logger.info(f"Streaming scene segments to {playlist.path}")
+        return playlist
+
+    def _publish_segment(self, playlist: HLSPlaylist, clip: str) -> None:
+        """Remux a finished clip into an MPEG-TS segment and append it to the playlist."""
+        segment = playlist.segment_path(len(playlist.segments))
+        try:
+            run_ffmpeg(
+                ["ffmpeg", "-y", "-i", clip, "-c", "copy", "-f", "mpegts", segment],
+                f"Segment remux failed for {clip}", spans=self.spans
+            )
+            playlist.add(segment, probe_duration(clip, spans=self.spans))
+        except Exception as e:
+            logger.error(f"Error publishing segment for {clip}: {str(e)}")
+            self.analytics["logs"].append(f"Error publishing segment for {clip}: {str(e)}")
+            safe_remove(segment)
+            return
+        stream = self.analytics["stream"]
+        stream["segments"] = len(playlist.segments)
+        if stream["first_segment_after"] is None:
+            stream["first_segment_after"] = time.time() - self.started_at
+            logger.info(f"First segment playable {stream['first_segment_after']:.2f} seconds after processing started")
+
+    @stage_span("merge_audio_with_clips")
     def merge_audio_with_clips(self, audio_paths: dict, output_folder: str) -> list:
         start_time = time.time()
         video_dir = os.path.join(output_folder, Config.OUTPUT_VIDEO_CLIPS)
@@ -342,23 +644,36 @@ class ImportantVideo:
         video_name = os.path.basename(self.video_path).split('.')[0]
         logger.info("Merging audio with video clips in parallel")
         
-        with concurrent.futures.ThreadPoolExecutor() as executor:
+        playlist = self._open_playlist(output_folder) if self.streaming else None
+        # More threads than encode slots would only queue inside the scheduler.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=ffmpeg_scheduler.max_concurrent) as executor:
             futures = [
                 executor.submit(
                     self._merge_clip, i, scene, audio_paths.get(f"scene_{i}"), video_dir, video_name
                 )
                 for i, scene in enumerate(self.summary_clips, 1)
             ]
-            merged_clips = [future.result() for future in concurrent.futures.as_completed(futures)]
+            # Collected in scene order, so each clip is published as soon as it and every
+            # clip before it are done.
+            for future in futures:
+                clip = future.result()
+                if clip:
+                    merged_clips.append(clip)
+                    if playlist is not None:
+                        self._publish_segment(playlist, clip)
+        if playlist is not None:
+            playlist.end()
         
         self.analytics["processing_steps"]["merge_audio_with_clips"] = {
             "num_clips": len(merged_clips),
+            "queue_wait": self._queue_wait("merge_audio_with_clips"),
             "time_taken": time.time() - start_time
         }
         logger.info(f"Merged {len(merged_clips)} clips")
         self._save_analytics(output_folder)
         return merged_clips
 
+    @stage_span("merge_all_clips")
     def merge_all_clips(self, merged_clips: list, output_folder: str) -> None:
         start_time = time.time()
         final_output = os.path.join(output_folder, Config.FINAL_OUTPUT)
@@ -367,22 +682,24 @@ class ImportantVideo:
             self.analytics["logs"].append("No clips available to merge")
             raise ValueError("No clips to merge into final video")
         
-        logger.info("Merging all clips into a single video")
-        concat_list_path = os.path.join(output_folder, "concat_list.txt")
-        with open(concat_list_path, 'w') as f:
-            for clip in merged_clips:
-                f.write(f"file '{os.path.abspath(clip)}'\n")
-        
+        logger.info("Concatenating all clips into a single video without re-encoding")
+        # The concat list goes to ffmpeg's stdin instead of a file next to the outputs.
+        concat_list = "".join(
+            "file '{}'\n".format(os.path.abspath(clip).replace("'", "'\\''"))
+            for clip in merged_clips
+        )
         cmd_concat = [
             "ffmpeg", "-y",
             "-f", "concat",
             "-safe", "0",
-            "-i", concat_list_path,
-            "-c:v", "libx264", "-c:a", "aac",
+            "-protocol_whitelist", "file,pipe",
+            "-i", "pipe:0",
+            "-c", "copy",
+            "-movflags", "+faststart",
             final_output
         ]
         try:
-            run_ffmpeg(cmd_concat, "Final video merge failed")
+            run_ffmpeg(cmd_concat, "Final video merge failed", spans=self.spans, input=concat_list.encode("utf-8"))
             logger.info(f"Final video saved at {final_output}")
             self.analytics["final_output"] = {
                 "file": final_output,
@@ -393,32 +710,443 @@ class ImportantVideo:
             logger.error(f"Error merging clips: {str(e)}")
             self.analytics["logs"].append(f"Error merging clips: {str(e)}")
         finally:
-            safe_remove(concat_list_path)
             self._save_analytics(output_folder)
 
+    @stage_span("render_filtergraph")
+    def render_filtergraph(self, audio_paths: dict, output_folder: str) -> None:
+        """Render the final video (and, with ``write_clips``, the per-scene clips) in one ffmpeg run.
+
+        Each scene is its own input-seeked view of the source rather than a ``trim`` of a
+        single decoded stream: scenes are in score order, so trimming one stream would
+        make ``split`` buffer raw frames for every scene that comes earlier in the file.
+        Video and narration are both cut to the shorter of the two, as ``-shortest`` does.
+        """
+        start_time = time.time()
+        final_output = os.path.join(output_folder, Config.FINAL_OUTPUT)
+        if not self.summary_clips:
+            logger.error("No clips available to merge")
+            self.analytics["logs"].append("No clips available to merge")
+            raise ValueError("No clips to merge into final video")
+        
+        scenes = list(enumerate(self.summary_clips, 1))
+        narration = {i: audio_paths.get(f"scene_{i}") for i, _ in scenes}
+        narration = {i: path for i, path in narration.items() if path and os.path.exists(path)}
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            audio_durations = dict(zip(narration, executor.map(lambda path: probe_duration(path, spans=self.spans), narration.values())))
+        
+        video_inputs, audio_inputs, filters, outputs, concat_pads = [], [], [], [], []
+        video_dir = os.path.join(output_folder, Config.OUTPUT_VIDEO_CLIPS)
+        video_name = os.path.basename(self.video_path).split('.')[0]
+        clip_files = []
+        for k, (i, scene) in enumerate(scenes):
+            scene_start_time, scene_end_time = self._scene_bounds(scene)
+            duration = scene_end_time - scene_start_time
+            if i in narration:
+                duration = min(duration, audio_durations[i])
+            video_inputs.append(["-ss", str(scene_start_time), "-t", str(duration), "-i", self.video_path])
+            filters.append(f"[{k}:v:0]setpts=PTS-STARTPTS[v{i}]")
+            if i in narration:
+                audio_index = len(scenes) + len(audio_inputs)
+                audio_inputs.append(["-i", narration[i]])
+                audio_source = f"[{audio_index}:a:0]"
+            else:
+                audio_source = "anullsrc=channel_layout=stereo:sample_rate=44100,"
+            filters.append(
+                f"{audio_source}atrim=duration={duration},asetpts=PTS-STARTPTS,"
+                f"aresample=44100,aformat=channel_layouts=stereo[a{i}]"
+            )
+            if self.write_clips:
+                output_clip = os.path.join(video_dir, f"{video_name}-scene-{i}.mp4")
+                filters.append(f"[v{i}]split[vc{i}][vo{i}]")
+                filters.append(f"[a{i}]asplit[ac{i}][ao{i}]")
+                outputs.append((["-map", f"[vo{i}]", "-map", f"[ao{i}]"], output_clip))
+                clip_files.append((i, output_clip))
+                concat_pads.append(f"[vc{i}][ac{i}]")
+            else:
+                concat_pads.append(f"[v{i}][a{i}]")
+        filters.append(f"{''.join(concat_pads)}concat=n={len(scenes)}:v=1:a=1[outv][outa]")
+        
+        if clip_files:
+            os.makedirs(video_dir, exist_ok=True)
+        logger.info(f"Rendering {len(scenes)} scenes into {final_output} with a single filtergraph")
+        try:
+            with ffmpeg_scheduler.slot(self.spans) as threads:
+                output_args = encode_args(self.encode_profile, threads)
+                cmd = [
+                    "ffmpeg", "-y",
+                    *(arg for args in video_inputs + audio_inputs for arg in [*decode_args(threads), *args]),
+                    "-filter_complex_threads", str(threads),
+                    "-filter_complex", ";".join(filters),
+                    "-map", "[outv]", "-map", "[outa]",
+                    *output_args,
+                    "-movflags", "+faststart",
+                    final_output
+                ]
+                for maps, output_clip in outputs:
+                    cmd += [*maps, *output_args, output_clip]
+                run_ffmpeg(cmd, "Filtergraph render failed", spans=self.spans)
+            logger.info(f"Final video saved at {final_output}")
+            for i, output_clip in clip_files:
+                self.analytics["video_clips"].append({
+                    "file": output_clip,
+                    "size_mb": os.path.getsize(output_clip) / (1024 * 1024),
+                    "scene_number": i,
+                    "time_taken": time.time() - start_time
+                })
+            self.analytics["final_output"] = {
+                "file": final_output,
+                "size_mb": os.path.getsize(final_output) / (1024 * 1024),
+                "time_taken": time.time() - start_time
+            }
+        except Exception as e:
+            logger.error(f"Error rendering filtergraph: {str(e)}")
+            self.analytics["logs"].append(f"Error rendering filtergraph: {str(e)}")
+        finally:
+            self.analytics["processing_steps"]["render_filtergraph"] = {
+                "num_clips": len(scenes),
+                "write_clips": self.write_clips,
+                "queue_wait": self._queue_wait("render_filtergraph"),
+                "time_taken": time.time() - start_time
+            }
+            self._save_analytics(output_folder)
+
+    def _language_timeline(self, narration: dict, merged_clips: list = None) -> list:
+        """(scene number, duration) of each scene in the final video, in order.
+
+        Clips renderer output is measured from the clips that made it into the concat;
+        the filtergraph cuts every scene to the shorter of it and its primary narration.
+        """
+        if merged_clips is not None:
+            numbers = {clip["file"]: clip["scene_number"] for clip in self.analytics["video_clips"]}
+            return [(numbers[clip], probe_duration(clip, spans=self.spans)) for clip in merged_clips]
+        timeline = []
+        for i, scene in enumerate(self.summary_clips, 1):
+            scene_start_time, scene_end_time = self._scene_bounds(scene)
+            duration = scene_end_time - scene_start_time
+            path = narration.get(f"scene_{i}")
+            if path and os.path.exists(path):
+                duration = min(duration, probe_duration(path, spans=self.spans))
+            timeline.append((i, duration))
+        return timeline
+
+    def _language_track(self, lang: str, narration: dict, timeline: list, track_path: str) -> dict:
+        """Encode ``lang``'s narration as one audio track laid out on the final video's timeline.
+
+        Each scene's narration is padded with silence to its clip's length, or sped up (up to
+        ``Config.LANGUAGE_MAX_TEMPO``) and cut when it runs longer.
+        """
+        inputs, filters, pads = [], [], []
+        stats = {"file": track_path, "tempo_adjusted": 0, "missing_narration": 0}
+        for k, (i, duration) in enumerate(timeline):
+            path = narration.get(f"scene_{i}")
+            if path and os.path.exists(path):
+                source = f"[{len(inputs)}:a:0]"
+                inputs.append(path)
+                tempo = min(Config.LANGUAGE_MAX_TEMPO, probe_duration(path, spans=self.spans) / duration) if duration > 0 else 1.0
+                if tempo > 1.0:
+                    source += f"atempo={tempo:.3f},"
+                    stats["tempo_adjusted"] += 1
+            else:
+                source = "anullsrc=channel_layout=stereo:sample_rate=44100,"
+                stats["missing_narration"] += 1
+            filters.append(
+                f"{source}apad,atrim=duration={duration},asetpts=PTS-STARTPTS,"
+                f"aresample=44100,aformat=channel_layouts=stereo[a{k}]"
+            )
+            pads.append(f"[a{k}]")
+        filters.append(f"{''.join(pads)}concat=n={len(pads)}:v=0:a=1[outa]")
+        with ffmpeg_scheduler.slot(self.spans) as threads:
+            run_ffmpeg(
+                ["ffmpeg", "-y", *(arg for path in inputs for arg in [*decode_args(threads), "-i", path]),
+                 "-filter_complex_threads", str(threads), "-filter_complex", ";".join(filters), "-map", "[outa]",
+                 "-c:a", "aac", "-ar", "44100", "-ac", "2", "-threads", str(threads), track_path],
+                f"Audio track render failed for {lang}", spans=self.spans
+            )
+        return stats
+
+    @stage_span("mux_languages")
+    def mux_languages(self, audio_paths: dict, output_folder: str, merged_clips: list = None, work_dir: str = None) -> list:
+        """Add the narration of every extra language to the final video without re-encoding it.
+
+        With ``language_output="tracks"`` the final MP4 gets one audio track per language
+        (the primary one first and default); with ``"files"`` each extra language gets its
+        own MP4 next to it. The intermediate narration tracks go to ``work_dir`` (a scratch
+        directory) when given, else to the audio folder. Returns the files written.
+        """
+        start_time = time.time()
+        final_output = os.path.join(output_folder, Config.FINAL_OUTPUT)
+        if not os.path.exists(final_output):
+            raise ValueError("No final video to add language tracks to")
+        audio_dir = os.path.join(output_folder, Config.OUTPUT_AUDIO)
+        extra_langs = self.langs[1:]
+        timeline = self._language_timeline(audio_paths[self.lang], merged_clips)
+        logger.info(f"Rendering {', '.join(extra_langs)} narration tracks over {len(timeline)} scenes")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=ffmpeg_scheduler.max_concurrent) as executor:
+            futures = {
+                lang: executor.submit(
+                    self._language_track, lang, audio_paths.get(lang, {}), timeline,
+                    os.path.join(work_dir or audio_dir, f"summary_{lang}.m4a")
+                )
+                for lang in extra_langs
+            }
+            languages = {lang: future.result() for lang, future in futures.items()}
+        
+        written = [] if work_dir else [stats["file"] for stats in languages.values()]
+        tag = lambda index, lang: [
+            f"-metadata:s:a:{index}", f"language={Config.LANGUAGE_CODES.get(lang, lang)}",
+            f"-metadata:s:a:{index}", f"title={lang}"
+        ]
+        if self.language_output == "tracks":
+            # Next to the final MP4 rather than in work_dir, so the os.replace stays on one filesystem.
+            muxed = os.path.join(output_folder, f"{os.path.splitext(Config.FINAL_OUTPUT)[0]}.muxing.mp4")
+            cmd = ["ffmpeg", "-y", "-i", final_output]
+            for lang in extra_langs:
+                cmd += ["-i", languages[lang]["file"]]
+            cmd += ["-map", "0:v:0", "-map", "0:a:0"]
+            for k, lang in enumerate(extra_langs, 1):
+                cmd += ["-map", f"{k}:a:0"]
+            cmd += ["-c", "copy", *tag(0, self.lang), "-disposition:a:0", "default"]
+            for k, lang in enumerate(extra_langs, 1):
+                cmd += [*tag(k, lang), f"-disposition:a:{k}", "0"]
+            cmd += ["-movflags", "+faststart", muxed]
+            try:
+                run_ffmpeg(cmd, "Language track mux failed", spans=self.spans)
+                os.replace(muxed, final_output)
+            finally:
+                safe_remove(muxed)
+            for lang in extra_langs:
+                languages[lang]["output"] = final_output
+            written.append(final_output)
+            self.analytics["final_output"] = {
+                **(self.analytics["final_output"] or {}),
+                "file": final_output,
+                "size_mb": os.path.getsize(final_output) / (1024 * 1024),
+                "audio_tracks": self.langs
+            }
+        else:
+            name, ext = os.path.splitext(Config.FINAL_OUTPUT)
+            for lang in extra_langs:
+                output = os.path.join(output_folder, f"{name}_{lang}{ext}")
+                run_ffmpeg(
+                    ["ffmpeg", "-y", "-i", final_output, "-i", languages[lang]["file"],
+                     "-map", "0:v:0", "-map", "1:a:0", "-c", "copy", *tag(0, lang),
+                     "-movflags", "+faststart", output],
+                    f"Language file mux failed for {lang}", spans=self.spans
+                )
+                languages[lang]["output"] = output
+                written.append(output)
+        if work_dir:
+            # The tracks are removed with the scratch directory; only the muxed outputs remain.
+            for stats in languages.values():
+                stats.pop("file")
+        self.analytics["languages"] = {self.lang: {"output": final_output, "primary": True}, **languages}
+        self.analytics["processing_steps"]["mux_languages"] = {
+            "languages": self.langs,
+            "output": self.language_output,
+            "time_taken": time.time() - start_time
+        }
+        logger.info(f"Added {len(extra_langs)} language(s) as {self.language_output} in {time.time() - start_time:.2f} seconds")
+        self._save_analytics(output_folder)
+        return written
+
+    def _job_params(self, downscale_factor: int) -> dict:
+        """Everything needed to re-run this job; stored in the manifest for resuming."""
+        return {
+            "input_path": self.video_path,
+            "video_hash": self._video_hash(),
+            "lang": ",".join(self.langs),
+            "num_scenes": self.num_scenes,
+            "tts_speed": self.tts_speed,
+            "downscale": downscale_factor,
+            "frame_skip": self.frame_skip,
+            "dedup_threshold": self.dedup_threshold,
+            "whisper_size": self.whisper_size,
+            "translation_backend": self.translator.backend.name,
+            "tts_backend": self.tts_backend.name,
+            "renderer": self.renderer,
+            "write_clips": self.write_clips,
+            "streaming": self.streaming,
+            "final_mp4": self.final_mp4,
+            "vad": self.vad,
+            "encode_profile": self.encode_profile,
+            "language_output": self.language_output
+        }
+
+    def _stage_state(self, stage: str, result) -> dict:
+        keys, steps = STAGE_ANALYTICS[stage]
+        state = {
+            "result": result,
+            "analytics": {key: self.analytics[key] for key in keys if key in self.analytics},
+            "steps": {step: self.analytics["processing_steps"][step] for step in steps if step in self.analytics["processing_steps"]}
+        }
+        scenes = {"detect_scenes": self.scenes_list, "top_scenes": self.summary_clips}.get(stage)
+        if scenes:
+            state["fps"] = scenes[0][0].get_framerate()
+            state["scenes"] = [[s.get_frames(), e.get_frames()] for s, e in scenes]
+        if stage == "detect_scenes" and self.scene_fingerprints is not None:
+            state["fingerprints"] = encode_fingerprints(self.scene_fingerprints)
+        return state
+
+    def _restore_stage(self, stage: str, state: dict):
+        logger.info(f"Resuming {stage} from checkpoint")
+        self.analytics.update(state["analytics"])
+        for step, value in state["steps"].items():
+            self.analytics["processing_steps"][step] = {**value, "resumed": True}
+        if "scenes" in state:
+            scenes = scene_timecodes(state["scenes"], state["fps"])
+            if stage == "detect_scenes":
+                self.scenes_list = scenes
+                self.scene_fingerprints = decode_fingerprints(state.get("fingerprints", [None] * len(scenes)))
+            else:
+                self.summary_clips = scenes
+        return state["result"]
+
+    def _run_stage(self, manifest: StageManifest, stage: str, params: tuple, run, artifacts=lambda result: []):
+        """Run ``stage`` unless the manifest holds a valid checkpoint for it, then checkpoint it."""
+        state = manifest.restore(stage, *params)
+        if state is not None:
+            result = self._restore_stage(stage, state)
+        else:
+            result = run()
+            manifest.record(stage, self._stage_state(stage, result), artifacts(result))
+        self._save_analytics(manifest.output_folder)
+        return result
+
+    def process(self, output_folder: str, downscale_factor: int = Config.DEFAULT_DOWNSCALE, progress=None, resume: bool = False) -> str:
+        """Run every stage in order; ``progress(stage, percent)`` is called before each one.
+
+        Completed stages are checkpointed in the job's manifest; with ``resume`` the stages
+        still valid for the current parameters are restored instead of recomputed.
+        """
+        def report(stage: str, percent: int) -> None:
+            if progress is not None:
+                progress(stage, percent)
+
+        self.started_at = time.time()
+        if self.store is not None and self.job_id is not None:
+            # A re-run may skip stages or languages the last run had; checkpointed stages
+            # put their analytics back as they are restored.
+            self.store.clear_analytics(self.job_id)
+            self._saved_sections = {}
+        final_output = os.path.join(output_folder, Config.FINAL_OUTPUT)
+        manifest = StageManifest(output_folder, self._job_params(downscale_factor), resume=resume)
+        self.analytics["resumed_stages"] = manifest.resumed
+        # Extra language tracks are muxed into the final MP4 in place, so it is checkpointed
+        # with mux_languages rather than with the render that first wrote it.
+        muxed_in_place = len(self.langs) > 1 and self.language_output == "tracks"
+        rendered_final = [] if muxed_in_place else [final_output]
+        report("downscale", 0)
+        self.downscale(downscale_factor)
+        report("detect_scenes", 5)
+        self._run_stage(manifest, "detect_scenes", (self._video_hash(), downscale_factor, Config.SCENE_THRESHOLD, self.frame_skip, Config.FINGERPRINT_SIZE, Config.FINGERPRINT_INTERVAL, Config.FINGERPRINT_MIN_STD), self.detect_scenes)
+        report("top_scenes", 25)
+        self._run_stage(manifest, "top_scenes", (self.num_scenes, self.dedup_threshold), self.top_scenes)
+        report("convert_clips_to_text", 35)
+        transcripts = self._run_stage(
+            manifest, "convert_clips_to_text", (self.whisper_size, self.vad, self.langs, self.translator.backend.name),
+            lambda: self.convert_clips_to_text(output_folder),
+            lambda result: [entry["file"] for entry in self.analytics["transcripts"].values()]
+        )
+        report("text_to_speech", 65)
+        audio_paths = self._run_stage(
+            manifest, "text_to_speech", (self.tts_backend.name, self.langs, self.tts_speed),
+            lambda: self.text_to_speech(transcripts, output_folder),
+            lambda result: [path for paths in result.values() for path in paths.values()]
+        )
+        merged_clips = None
+        if self.renderer == "filtergraph":
+            report("render_filtergraph", 75)
+            self._run_stage(
+                manifest, "render_filtergraph", (encode_args(self.encode_profile), self.write_clips),
+                lambda: self.render_filtergraph(audio_paths[self.lang], output_folder),
+                lambda result: rendered_final + [clip["file"] for clip in self.analytics["video_clips"]]
+            )
+        else:
+            report("merge_audio_with_clips", 75)
+            merged_clips = self._run_stage(
+                manifest, "merge_audio_with_clips", (encode_args(self.encode_profile), self.streaming),
+                lambda: self.merge_audio_with_clips(audio_paths[self.lang], output_folder),
+                lambda result: list(result) + (self.playlist.files() if self.playlist else [])
+            )
+            if not self.final_mp4:
+                if not merged_clips:
+                    raise ValueError("No clips were rendered for the stream")
+                self._save_analytics(output_folder)
+                return os.path.join(output_folder, Config.OUTPUT_HLS, Config.HLS_PLAYLIST)
+            report("merge_all_clips", 90)
+            self._run_stage(
+                manifest, "merge_all_clips", (),
+                lambda: self.merge_all_clips(merged_clips, output_folder),
+                lambda result: rendered_final
+            )
+        if len(self.langs) > 1:
+            report("mux_languages", 95)
+            with scratch_dir(f"{self.job_id or 'job'}_") as scratch:
+                self._run_stage(
+                    manifest, "mux_languages", (self.language_output,),
+                    lambda: self.mux_languages(audio_paths, output_folder, merged_clips, scratch),
+                    lambda result: result
+                )
+        self._save_analytics(output_folder)
+        return final_output
+
+def add_pipeline_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """Options shared by the single-video and batch CLIs."""
+    parser.add_argument("--lang", default=Config.DEFAULT_LANG, help="Language for text-to-speech (e.g., 'hi', 'en'), or several comma-separated (e.g., 'hi,mr,ta')")
+    parser.add_argument("--language-output", choices=["tracks", "files"], default=Config.LANGUAGE_OUTPUT, help="With several languages: one audio track per language in the final MP4, or one MP4 per language")
+    parser.add_argument("--scenes", type=int, default=Config.DEFAULT_NUM_SCENES, help="Number of scenes to summarize")
+    parser.add_argument("--downscale", type=int, default=Config.DEFAULT_DOWNSCALE, help="Downscale factor for processing")
+    parser.add_argument("--tts-speed", type=float, default=Config.DEFAULT_TTS_SPEED, help="Speech speed (0.5 to 2.0)")
+    parser.add_argument("--frame-skip", type=int, default=Config.SCENE_DETECT_FRAME_SKIP, help="Frames to skip between scene-detection samples (faster, less precise)")
+    parser.add_argument("--dedup-threshold", type=float, default=Config.DEDUP_THRESHOLD, help="Drop top scenes whose fingerprint differs from a selected one in at most this fraction of bits (0 disables)")
+    parser.add_argument("--whisper-model", default=Config.WHISPER_MODEL, help="Whisper model size (e.g., 'tiny', 'base', 'small')")
+    parser.add_argument("--translation-backend", default=Config.TRANSLATION_BACKEND, help="Translation backend ('google' or 'offline')")
+    parser.add_argument("--tts-backend", default=Config.TTS_BACKEND, help="Text-to-speech backend ('gtts' or 'offline')")
+    parser.add_argument("--renderer", choices=["clips", "filtergraph"], default=Config.RENDERER, help="Render per-scene clips then concatenate, or everything in one filtergraph")
+    parser.add_argument("--write-clips", action="store_true", default=Config.WRITE_SCENE_CLIPS, help="Also write per-scene clips when using the filtergraph renderer")
+    parser.add_argument("--hls", action=argparse.BooleanOptionalAction, default=Config.HLS_ENABLED, help="Publish each scene as an HLS segment as soon as its clip is rendered (clips renderer)")
+    parser.add_argument("--final-mp4", action=argparse.BooleanOptionalAction, default=Config.WRITE_FINAL_MP4, help="Concatenate the clips into a single MP4 at the end")
+    parser.add_argument("--vad", action=argparse.BooleanOptionalAction, default=Config.VAD_ENABLED, help="Skip Whisper on scenes without speech and trim silence around speech")
+    parser.add_argument("--encode-profile", choices=list(Config.ENCODE_PROFILES), default=Config.ENCODE_PROFILE, help="x264 preset/CRF profile for rendered clips")
+    parser.add_argument("--resume", action="store_true", help="Reuse stages checkpointed in the output folder's manifest that are still valid for these parameters")
+    return parser
+
+def processor_options(args: argparse.Namespace) -> dict:
+    """ImportantVideo keyword arguments for parsed ``add_pipeline_arguments`` options."""
+    return {
+        "lang": args.lang,
+        "num_scenes": args.scenes,
+        "tts_speed": args.tts_speed,
+        "whisper_size": args.whisper_model,
+        "translation_backend": args.translation_backend,
+        "tts_backend": args.tts_backend,
+        "renderer": args.renderer,
+        "write_clips": args.write_clips,
+        "frame_skip": args.frame_skip,
+        "dedup_threshold": args.dedup_threshold,
+        "streaming": args.hls,
+        "final_mp4": args.final_mp4,
+        "vad": args.vad,
+        "encode_profile": args.encode_profile,
+        "language_output": args.language_output
+    }
+
 def main():
     parser = argparse.ArgumentParser(description="Video summarization and localization tool")
     parser.add_argument("--video", required=True, help="Path to input video file")
     parser.add_argument("--output", default="output", help="Output folder")
-    parser.add_argument("--lang", default=Config.DEFAULT_LANG, help="Language for text-to-speech (e.g., 'hi', 'en')")
-    parser.add_argument("--scenes", type=int, default=Config.DEFAULT_NUM_SCENES, help="Number of scenes to summarize")
-    parser.add_argument("--downscale", type=int, default=Config.DEFAULT_DOWNSCALE, help="Downscale factor for processing")
-    parser.add_argument("--tts-speed", type=float, default=Config.DEFAULT_TTS_SPEED, help="Speech speed (0.5 to 2.0)")
+    parser.add_argument("--profile", choices=["cprofile", "py-spy"], default=None, help="Profile the run and save the report in the output folder")
+    add_pipeline_arguments(parser)
     args = parser.parse_args()
 
     try:
         logger.info(f"Processing video: {args.video}")
-        processor = ImportantVideo(args.video, lang=args.lang, num_scenes=args.scenes, tts_speed=args.tts_speed)
-        processor.downscale(args.downscale)
-        processor.detect_scenes()
-        processor.top_scenes()
-        transcripts = processor.convert_clips_to_text(args.output)
-        audio_paths = processor.text_to_speech(transcripts, args.output)
-        merged_clips = processor.merge_audio_with_clips(audio_paths, args.output)
-        processor.merge_all_clips(merged_clips, args.output)
+        processor = ImportantVideo(args.video, **processor_options(args))
+        with profiled(args.profile, args.output):
+            processor.process(args.output, args.downscale, resume=args.resume)
         logger.info("Video processing completed successfully")
     except Exception as e:
         logger.exception(f"Error processing video: {str(e)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
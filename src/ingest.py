@@ -0,0 +1,109 @@
+import hashlib
+import logging
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from multipart.multipart import MultipartParser, parse_options_header
+from src.utils import safe_remove
+
+logger = logging.getLogger("VideoProcessorAPI")
+
+class UploadTooLarge(Exception):
+    pass
+
+class UploadMissing(Exception):
+    pass
+
+class UploadAborted(Exception):
+    pass
+
+class _FilePartSink:
+    """MultipartParser callbacks that stream the ``file`` part to disk while hashing it."""
+
+    def __init__(self, dest, field_name: str, max_bytes: int):
+        self.dest = dest
+        self.field_name = field_name.encode()
+        self.max_bytes = max_bytes
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.filename = None
+        self.found = False
+        self._in_file_part = False
+        self._header_field = b""
+        self._header_value = b""
+        self._headers = {}
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._in_file_part = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name") == self.field_name and not self.found:
+            self._in_file_part = True
+            self.found = True
+            self.filename = options.get(b"filename", b"").decode("utf-8", "replace")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_file_part:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {self.max_bytes // (1024 * 1024)} MB limit")
+        self.digest.update(chunk)
+        self.dest.write(chunk)
+
+async def ingest_upload(request: Request, dest_path: str, max_bytes: int, field_name: str = "file") -> dict:
+    """Stream a multipart upload straight into ``dest_path``.
+
+    The body is parsed chunk by chunk as it arrives, so the file is written once (no
+    spooled temp copy) and the SHA-256 is computed on the way; parsing, hashing and disk
+    writes run in the threadpool so the event loop only awaits network reads.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise UploadMissing("Expected a multipart/form-data upload")
+    try:
+        with open(dest_path, "wb") as f:
+            sink = _FilePartSink(f, field_name, max_bytes)
+            parser = MultipartParser(options[b"boundary"], sink.callbacks())
+            try:
+                async for chunk in request.stream():
+                    if chunk:
+                        await run_in_threadpool(parser.write, chunk)
+            except ClientDisconnect as e:
+                raise UploadAborted("Client disconnected during upload") from e
+            await run_in_threadpool(parser.finalize)
+        if not sink.found:
+            raise UploadMissing(f"No '{field_name}' field in upload")
+    except Exception:
+        safe_remove(dest_path)
+        raise
+    logger.info(f"Ingested {sink.size / (1024 * 1024):.2f} MB upload into {dest_path}")
+    return {
+        "filename": sink.filename,
+        "size": sink.size,
+        "sha256": sink.digest.hexdigest()
+    }
@@ -0,0 +1,148 @@
+import os
+import time
+import logging
+import threading
+import multiprocessing
+import concurrent.futures
+import concurrent.futures.process
+from src.config import Config
+from src.models import whisper_registry
+from src.metrics import metrics, profiled
+from src.store import job_store
+from src.scheduler import ffmpeg_scheduler
+
+logger = logging.getLogger("VideoProcessorAPI")
+
+def run_job(video_id: str, input_path: str, output_folder: str, params: dict) -> dict:
+    """Pool worker entry point: run the whole ImportantVideo pipeline for one job."""
+    from src.important_video import ImportantVideo
+
+    def progress(stage: str, percent: int) -> None:
+        job_store.update_job(video_id, status="running", stage=stage, percent=percent)
+
+    queue_wait = time.time() - params["queued_at"] if "queued_at" in params else None
+    progress("starting", 0)
+    processor = ImportantVideo(
+        input_path,
+        lang=params["lang"],
+        num_scenes=params["num_scenes"],
+        tts_speed=params["tts_speed"],
+        translation_backend=params.get("translation_backend"),
+        tts_backend=params.get("tts_backend"),
+        renderer=params.get("renderer", Config.RENDERER),
+        whisper_size=params.get("whisper_size", Config.WHISPER_MODEL),
+        write_clips=params.get("write_clips", Config.WRITE_SCENE_CLIPS),
+        frame_skip=params.get("frame_skip", Config.SCENE_DETECT_FRAME_SKIP),
+        dedup_threshold=params.get("dedup_threshold", Config.DEDUP_THRESHOLD),
+        streaming=params.get("streaming", Config.HLS_ENABLED),
+        final_mp4=params.get("final_mp4", Config.WRITE_FINAL_MP4),
+        vad=params.get("vad", Config.VAD_ENABLED),
+        encode_profile=params.get("encode_profile", Config.ENCODE_PROFILE),
+        language_output=params.get("language_output", Config.LANGUAGE_OUTPUT),
+        video_hash=params.get("video_hash"),
+        probe=params.get("probe"),
+        job_id=video_id,
+        store=job_store
+    )
+    processor.analytics["scheduler"]["job_queue_wait"] = queue_wait
+    with profiled(params.get("profile"), output_folder) as profile_path:
+        output_path = processor.process(output_folder, params["downscale"], progress, resume=params.get("resume", False))
+    if not os.path.exists(output_path):
+        raise RuntimeError("Failed to generate summarized video")
+    job_store.update_job(video_id, status="completed", stage="completed", percent=100, output_path=output_path, profile=profile_path)
+    return {"output_path": output_path, "spans": processor.spans.spans, "queue_wait": queue_wait}
+
+def _init_worker(preload: list, ffmpeg_slots) -> None:
+    # Every worker encodes against the same slots, so concurrent jobs share one CPU budget.
+    ffmpeg_scheduler.install(ffmpeg_slots)
+    whisper_registry.preload(preload)
+
+def _warm_up() -> int:
+    return os.getpid()
+
+class JobQueue:
+    """Runs pipeline jobs on a process pool; workers report progress through the job store.
+
+    If a worker dies (an OOM kill or a native crash) the pool is broken for good: every job
+    still in it fails, and the pool is replaced so later submissions run again.
+    """
+
+    def __init__(self, max_workers: int = Config.JOB_WORKERS, job=run_job, preload: list = None):
+        self.max_workers = max_workers
+        self.job = job
+        self.preload = Config.WHISPER_PRELOAD if preload is None else preload
+        self._executor = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.preload, context.BoundedSemaphore(ffmpeg_scheduler.max_concurrent))
+        )
+        with self._lock:
+            self._executor = executor
+        # Spawn the workers now so Whisper is loaded before the first upload arrives.
+        for _ in range(self.max_workers):
+            executor.submit(_warm_up)
+        logger.info(f"Started job queue with {self.max_workers} worker process(es)")
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _replace_broken(self, executor: concurrent.futures.ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                # Another failed job or submission already replaced it.
+                return
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.warning("A job worker process died; starting a new worker pool")
+        self.start()
+
+    def active(self, video_id: str) -> bool:
+        with self._lock:
+            return video_id in self._futures
+
+    def submit(self, video_id: str, input_path: str, output_folder: str, params: dict) -> concurrent.futures.Future:
+        if self._executor is None:
+            self.start()
+        job_store.update_job(video_id, status="queued", stage="queued", percent=0, error=None)
+        params = {**params, "queued_at": time.time()}
+        executor = self._executor
+        try:
+            future = executor.submit(self.job, video_id, input_path, output_folder, params)
+        except concurrent.futures.process.BrokenProcessPool:
+            self._replace_broken(executor)
+            executor = self._executor
+            future = executor.submit(self.job, video_id, input_path, output_folder, params)
+        with self._lock:
+            self._futures[video_id] = future
+
+        def on_done(done: concurrent.futures.Future) -> None:
+            with self._lock:
+                self._futures.pop(video_id, None)
+            error = done.exception() if not done.cancelled() else RuntimeError("Job cancelled")
+            if isinstance(error, concurrent.futures.process.BrokenProcessPool):
+                error = RuntimeError("The worker process running this job died")
+                self._replace_broken(executor)
+            if error is not None:
+                logger.error(f"Job {video_id} failed: {str(error)}")
+                metrics.inc("pipeline_jobs_total", status="failed")
+                job_store.update_job(video_id, status="failed", error=str(error))
+            else:
+                result = done.result()
+                metrics.inc("pipeline_jobs_total", status="completed")
+                metrics.observe_spans(result["spans"])
+                if result.get("queue_wait") is not None:
+                    metrics.observe("pipeline_job_queue_wait_seconds", result["queue_wait"])
+                logger.info(f"Job {video_id} completed: {result['output_path']}")
+
+        future.add_done_callback(on_done)
+        return future
@@ -0,0 +1,179 @@
+import os
+import time
+import shutil
+import signal
+import logging
+import cProfile
+import threading
+import subprocess
+import functools
+from contextlib import contextmanager
+
+logger = logging.getLogger("VideoProcessor")
+
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+RSS_BUCKETS_MB = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+class SpanRecorder:
+    """Timing spans for one job; stored in analytics["spans"] and aggregated by the API."""
+
+    def __init__(self):
+        self.spans = []
+        self.stage = None
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, duration: float, **fields) -> dict:
+        span = {"name": name, "stage": self.stage, "start": start, "duration": duration, **fields}
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, name: str, **fields):
+        start_wall = time.time()
+        start_cpu = time.process_time()
+        try:
+            yield fields
+        finally:
+            # process_time covers every thread in the process, so overlapping spans share it.
+            self.add(name, start_wall, time.time() - start_wall, cpu_time=time.process_time() - start_cpu, **fields)
+
+def stage_span(name: str):
+    """Decorator for ImportantVideo stages: record a span and tag sub-spans with the stage name."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            previous = self.spans.stage
+            self.spans.stage = name
+            try:
+                with self.spans.span(name, kind="stage"):
+                    return method(self, *args, **kwargs)
+            finally:
+                self.spans.stage = previous
+        return wrapper
+    return decorator
+
+class _Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+def _labels(labels: dict, extra: dict = None) -> str:
+    items = {**labels, **(extra or {})}
+    if not items:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for value in items.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(items, escaped)) + "}"
+
+class MetricsRegistry:
+    """Process-wide histograms and counters rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def observe(self, metric: str, value: float, buckets: tuple = DURATION_BUCKETS, **labels) -> None:
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._histograms.setdefault(key, _Histogram(buckets)).observe(value)
+
+    def inc(self, metric: str, value: float = 1.0, **labels) -> None:
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe_spans(self, spans: list) -> None:
+        for span in spans:
+            labels = {"name": span["name"], "stage": span.get("stage") or span["name"]}
+            self.observe("pipeline_span_seconds", span["duration"], **labels)
+            if span.get("cpu_time") is not None:
+                self.inc("pipeline_span_cpu_seconds_total", span["cpu_time"], **labels)
+            if span.get("max_rss_mb") is not None:
+                self.observe("pipeline_subprocess_max_rss_mb", span["max_rss_mb"], buckets=RSS_BUCKETS_MB, **labels)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        seen = set()
+        for (name, labels), histogram in histograms:
+            labels = dict(labels)
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels, {'le': bound})} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(labels, {'le': '+Inf'})} {histogram.count}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram.total}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_labels(dict(labels))} {value}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+metrics.describe("pipeline_span_seconds", "Wall-clock seconds per pipeline stage and sub-step.")
+metrics.describe("pipeline_span_cpu_seconds_total", "CPU seconds per pipeline stage and sub-step (user + system for subprocesses).")
+metrics.describe("pipeline_subprocess_max_rss_mb", "Peak resident set size of ffmpeg/ffprobe subprocesses in MB.")
+metrics.describe("pipeline_jobs_total", "Finished summarization jobs by status.")
+metrics.describe("pipeline_job_queue_wait_seconds", "Seconds jobs waited in the job queue before a worker picked them up.")
+metrics.describe("pipeline_admission_total", "Summarize and resume requests by admission decision.")
+
+@contextmanager
+def profiled(kind: str, output_folder: str):
+    """Profile the enclosed block with ``cprofile`` or an attached ``py-spy``; yields the report path."""
+    if not kind:
+        yield None
+        return
+    os.makedirs(output_folder, exist_ok=True)
+    if kind == "cprofile":
+        path = os.path.join(output_folder, "profile.pstats")
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield path
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+            logger.info(f"Saved cProfile stats to {path}")
+    elif kind == "py-spy":
+        if shutil.which("py-spy") is None:
+            raise ValueError("py-spy profiling requested but py-spy is not installed")
+        path = os.path.join(output_folder, "profile.svg")
+        spy = subprocess.Popen(
+            ["py-spy", "record", "--subprocesses", "-o", path, "--pid", str(os.getpid())],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            yield path
+        finally:
+            # py-spy writes its report when interrupted, not when terminated.
+            spy.send_signal(signal.SIGINT)
+            spy.wait()
+            logger.info(f"Saved py-spy flame graph to {path}")
+    else:
+        raise ValueError(f"Unknown profiler: {kind}")
@@ -0,0 +1,135 @@
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from src.config import Config
+
+logger = logging.getLogger("VideoProcessor")
+
+class WhisperRegistry:
+    """Process-wide cache of Whisper models that jobs borrow instead of loading their own copy.
+
+    An unpinned model is dropped once it has gone ``idle_ttl`` seconds without a borrower;
+    each release arms a timer for that, so a worker that stops getting jobs still frees it.
+    """
+
+    def __init__(self, idle_ttl: float = Config.WHISPER_IDLE_TTL):
+        self.idle_ttl = idle_ttl
+        self.startup = None
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._models = {}
+        self._pinned = set()
+        self._loaders = {}
+        self._timers = {}
+
+    def register(self, size: str, loader) -> None:
+        """Serve ``size`` from ``loader()`` instead of ``whisper.load_model`` (e.g. a stub for benchmarks)."""
+        with self._lock:
+            self._loaders[size] = loader
+            self._models.pop(size, None)
+
+    def _load(self, size: str) -> dict:
+        """Return the entry for ``size``, loading the model if needed, with its caller counted as a user.
+
+        The user is counted under the same lock hold that finds or inserts the entry, so the
+        idle-eviction timer can never drop it in between.
+        """
+        with self._lock:
+            load_lock = self._load_locks.setdefault(size, threading.Lock())
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(size)
+                if entry is not None:
+                    entry["users"] += 1
+                    return entry
+            logger.info(f"Loading Whisper model '{size}'")
+            start_time = time.time()
+            loader = self._loaders.get(size)
+            if loader is None:
+                import whisper
+                loader = lambda: whisper.load_model(size)
+            model = loader()
+            entry = {
+                "model": model,
+                # Whisper decoding mutates hooks on the model, so one inference at a time.
+                "lock": threading.Lock(),
+                "users": 1,
+                "last_used": time.time(),
+                "load_time": time.time() - start_time,
+                "loaded_at": time.time()
+            }
+            with self._lock:
+                self._models[size] = entry
+            logger.info(f"Loaded Whisper model '{size}' in {entry['load_time']:.2f} seconds")
+            return entry
+
+    def preload(self, sizes: list = None) -> dict:
+        start_time = time.time()
+        sizes = Config.WHISPER_PRELOAD if sizes is None else sizes
+        for size in sizes:
+            entry = self._load(size)
+            with self._lock:
+                entry["users"] -= 1
+                self._pinned.add(size)
+        self.startup = {
+            "sizes": list(sizes),
+            "time_taken": time.time() - start_time
+        }
+        return self.startup
+
+    def evict_idle(self) -> list:
+        now = time.time()
+        evicted = []
+        with self._lock:
+            for size, entry in list(self._models.items()):
+                if size in self._pinned or entry["users"] > 0:
+                    continue
+                if now - entry["last_used"] >= self.idle_ttl:
+                    del self._models[size]
+                    evicted.append(size)
+        for size in evicted:
+            logger.info(f"Evicted idle Whisper model '{size}'")
+        return evicted
+
+    def _schedule_eviction(self, size: str) -> None:
+        timer = threading.Timer(self.idle_ttl, self.evict_idle)
+        timer.daemon = True
+        with self._lock:
+            previous = self._timers.pop(size, None)
+            self._timers[size] = timer
+        if previous is not None:
+            previous.cancel()
+        timer.start()
+
+    @contextmanager
+    def borrow(self, size: str = None, stats: dict = None):
+        """Yield ``(model, lock)`` for a shared model; every inference on it must hold ``lock``.
+
+        ``stats`` (if given) is filled with load/wait timings for analytics.
+        """
+        size = size or Config.WHISPER_MODEL
+        self.evict_idle()
+        start_time = time.time()
+        with self._lock:
+            cached = size in self._models
+        entry = self._load(size)
+        if stats is not None:
+            stats.update({
+                "model": size,
+                "cache_hit": cached,
+                "load_time": entry["load_time"],
+                "borrow_wait": time.time() - start_time,
+                "startup": self.startup
+            })
+        try:
+            yield entry["model"], entry["lock"]
+        finally:
+            with self._lock:
+                entry["users"] -= 1
+                entry["last_used"] = time.time()
+                idle = entry["users"] == 0 and size not in self._pinned
+            if idle:
+                self._schedule_eviction(size)
+
+whisper_registry = WhisperRegistry()
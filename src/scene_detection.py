@@ -0,0 +1,118 @@
+import os
+import bisect
+import logging
+import multiprocessing
+import concurrent.futures
+import numpy as np
+from src.config import Config
+from src.fingerprint import FrameSampler, scene_fingerprints
+
+logger = logging.getLogger("VideoProcessor")
+
+def _sampling_detector(sampler: FrameSampler):
+    """A detector that reports no cuts and hands frames to ``sampler``, so fingerprints come from the same decode."""
+    from scenedetect import SceneDetector
+
+    class SamplingDetector(SceneDetector):
+        def process_frame(self, frame_num, frame_img):
+            sampler.add(frame_num, frame_img)
+            return []
+
+    return SamplingDetector()
+
+def detect_segment(video_path: str, start: float, end: float, threshold: float, downscale: int = None, frame_skip: int = 0) -> dict:
+    """Find cuts in ``[start, end)`` seconds (``end=None`` means end of file).
+
+    Decoding starts ``Config.SCENE_SHARD_WARMUP`` seconds early so the detector has a
+    previous frame and the same min-scene-length state at the seam as a sequential pass
+    would; cuts found in the warm-up belong to the previous segment and are dropped.
+    Frame numbers are returned so the result pickles cheaply across processes, along with
+    the fingerprint thumbnails sampled inside the segment.
+    """
+    from scenedetect import open_video, SceneManager, ContentDetector, FrameTimecode
+    video = open_video(video_path)
+    fps = video.frame_rate
+    manager = SceneManager()
+    manager.add_detector(ContentDetector(threshold=threshold))
+    sampler = FrameSampler(fps)
+    manager.add_detector(_sampling_detector(sampler))
+    if downscale:
+        manager.auto_downscale = False
+        manager.downscale = downscale
+    seek_to = max(0.0, start - Config.SCENE_SHARD_WARMUP)
+    if seek_to > 0:
+        video.seek(FrameTimecode(seek_to, fps))
+    end_time = FrameTimecode(end, fps) if end is not None else None
+    manager.detect_scenes(video=video, end_time=end_time, frame_skip=frame_skip)
+    scenes = manager.get_scene_list(start_in_scene=True)
+    start_frame = FrameTimecode(start, fps).get_frames()
+    end_frame = end_time.get_frames() if end_time is not None else None
+    cuts = [
+        s.get_frames() for s, _ in scenes[1:]
+        if s.get_frames() >= start_frame and (end_frame is None or s.get_frames() < end_frame)
+    ]
+    sample_frames, thumbnails = sampler.samples(start_frame, end_frame)
+    return {
+        "fps": fps,
+        "cuts": cuts,
+        "sample_frames": sample_frames,
+        "thumbnails": thumbnails,
+        "video_end": scenes[-1][1].get_frames() if scenes else start_frame
+    }
+
+def scene_timecodes(frames, fps: float) -> list:
+    """(start, end) frame numbers to the ``FrameTimecode`` pairs the rest of the pipeline uses."""
+    from scenedetect import FrameTimecode
+    return [(FrameTimecode(start, fps), FrameTimecode(end, fps)) for start, end in frames]
+
+def plan_segments(duration: float, keyframes: list, workers: int) -> list:
+    """Split ``[0, duration)`` into up to ``workers`` spans whose inner boundaries sit on keyframes."""
+    boundaries = [0.0]
+    for k in range(1, workers):
+        target = duration * k / workers
+        index = bisect.bisect_left(keyframes, target)
+        if index < len(keyframes) and boundaries[-1] < keyframes[index] < duration:
+            boundaries.append(keyframes[index])
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:] + [None])]
+
+def detect_scene_list(video_path: str, probe: dict, threshold: float, downscale: int = None, frame_skip: int = 0) -> tuple:
+    """Return ``(scene_list, fingerprints, stats)`` with the same scenes a single sequential pass produces.
+
+    ``fingerprints`` holds one ``scene_fingerprints`` entry per scene.
+    """
+    workers = Config.SCENE_DETECT_WORKERS or os.cpu_count() or 1
+    duration = probe.get("duration", 0.0) if probe else 0.0
+    keyframes = probe.get("keyframes", []) if probe else []
+    if workers > 1 and duration >= Config.SCENE_SHARD_MIN_SECONDS and keyframes:
+        segments = plan_segments(duration, keyframes, workers)
+    else:
+        segments = [(0.0, None)]
+
+    if len(segments) == 1:
+        results = [detect_segment(video_path, 0.0, None, threshold, downscale, frame_skip)]
+    else:
+        logger.info(f"Detecting scenes in {len(segments)} keyframe-aligned segments")
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=len(segments), mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [
+                executor.submit(detect_segment, video_path, start, end, threshold, downscale, frame_skip)
+                for start, end in segments
+            ]
+            results = [future.result() for future in futures]
+
+    fps = results[0]["fps"]
+    cuts = sorted({cut for result in results for cut in result["cuts"]})
+    stats = {"segments": len(segments), "frame_skip": frame_skip}
+    # Like SceneManager.get_scene_list(), no cuts means no scenes.
+    if not cuts:
+        return [], [], stats
+    bounds = [0] + cuts + [results[-1]["video_end"]]
+    scenes = list(zip(bounds, bounds[1:]))
+    fingerprints = scene_fingerprints(
+        np.concatenate([result["sample_frames"] for result in results]),
+        np.concatenate([result["thumbnails"] for result in results]),
+        scenes
+    )
+    stats["fingerprint_samples"] = sum(len(result["sample_frames"]) for result in results)
+    return scene_timecodes(scenes, fps), fingerprints, stats
@@ -0,0 +1,52 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from src.config import Config
+
+def encode_args(profile: str = Config.ENCODE_PROFILE, threads: int = None) -> list:
+    """Output options for a clip encode: codecs from ``CLIP_ENCODE_ARGS`` plus the profile's preset and CRF."""
+    if profile not in Config.ENCODE_PROFILES:
+        raise ValueError(f"Unknown encode profile: {profile}")
+    settings = Config.ENCODE_PROFILES[profile]
+    args = [*Config.CLIP_ENCODE_ARGS, "-preset", settings["preset"], "-crf", str(settings["crf"])]
+    if threads:
+        args += ["-threads", str(threads)]
+    return args
+
+def decode_args(threads: int = None) -> list:
+    """Input options capping one input's decoder at ``threads`` threads; they go before its ``-i``."""
+    return ["-threads", str(threads)] if threads else []
+
+class FfmpegScheduler:
+    """CPU budget for encoding ffmpeg runs, shared by every job in the process.
+
+    The budget (``Config.FFMPEG_CPU_BUDGET`` cores, default all of them) is split into
+    slots of ``Config.FFMPEG_THREADS`` threads. Each encode holds one slot and tells its
+    encoder and every input decoder to use that many threads, and encodes beyond the budget queue. Job pool workers install a
+    semaphore shared with their siblings so the budget also holds across concurrent jobs.
+    """
+
+    def __init__(self, cpu_budget: int = Config.FFMPEG_CPU_BUDGET, threads: int = Config.FFMPEG_THREADS):
+        budget = cpu_budget or os.cpu_count() or 1
+        self.threads = max(1, min(threads, budget))
+        self.max_concurrent = max(1, budget // self.threads)
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrent)
+
+    def install(self, semaphore) -> None:
+        """Use a semaphore shared with other processes (created with ``max_concurrent`` permits)."""
+        self._semaphore = semaphore
+
+    @contextmanager
+    def slot(self, spans=None):
+        """Wait for a free slot and yield the thread count the encode should use."""
+        start_time = time.time()
+        self._semaphore.acquire()
+        if spans is not None:
+            spans.add("ffmpeg_queue", start_time, time.time() - start_time)
+        try:
+            yield self.threads
+        finally:
+            self._semaphore.release()
+
+ffmpeg_scheduler = FfmpegScheduler()
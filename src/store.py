@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+from contextlib import closing
+from src.config import Config
+
+logger = logging.getLogger("VideoProcessorAPI")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL,
+    stage TEXT,
+    percent INTEGER NOT NULL DEFAULT 0,
+    filename TEXT,
+    input_path TEXT,
+    output_path TEXT,
+    duration REAL,
+    params TEXT,
+    profile TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at);
+CREATE INDEX IF NOT EXISTS jobs_duration ON jobs (duration);
+CREATE TABLE IF NOT EXISTS analytics (
+    job_id INTEGER NOT NULL REFERENCES jobs (id),
+    section TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (job_id, section)
+);
+"""
+
+JOB_FIELDS = ("status", "stage", "percent", "filename", "input_path", "output_path", "duration", "params", "profile", "error")
+
+def analytics_sections(analytics: dict) -> dict:
+    """Split an analytics document into independently stored sections, encoded as JSON text."""
+    sections = {}
+    for key, value in analytics.items():
+        if key == "processing_steps":
+            for step, data in value.items():
+                sections[f"processing_steps.{step}"] = json.dumps(data)
+        else:
+            sections[key] = json.dumps(value)
+    return sections
+
+class JobStore:
+    """SQLite index of jobs and their analytics, shared by the API and the pool worker processes.
+
+    Every write bumps the job's ``version``, which the API uses as the ETag for status and
+    analytics reads. Connections are opened per call so the store is safe to use from any
+    thread or process; WAL mode lets readers proceed while a worker is writing.
+    """
+
+    def __init__(self, path: str = Config.JOB_DB, legacy_ids_file: str = None, legacy_path: str = None):
+        self.path = path
+        self._initialized = False
+        self._legacy_ids_file = legacy_ids_file
+        self._legacy_path = legacy_path
+
+    def _move_legacy_db(self) -> None:
+        # Earlier versions kept the database under output/, where the API served it.
+        if not self._legacy_path or not os.path.exists(self._legacy_path) or os.path.exists(self.path):
+            return
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self._legacy_path + suffix):
+                os.replace(self._legacy_path + suffix, self.path + suffix)
+        logger.info(f"Moved job database from {self._legacy_path} to {self.path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._move_legacy_db()
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            self._initialize(conn)
+        return conn
+
+    def _initialize(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        if self._legacy_ids_file and os.path.exists(self._legacy_ids_file):
+            # Continue numbering after IDs handed out by the old video_ids.json counter.
+            with open(self._legacy_ids_file, 'r') as f:
+                last_id = json.load(f).get("last_id", 0)
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT COUNT(*) FROM sqlite_sequence WHERE name = 'jobs'").fetchone()[0] == 0:
+                conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('jobs', ?)", (last_id,))
+                logger.info(f"Seeded job IDs from {self._legacy_ids_file} (last_id={last_id})")
+            conn.execute("COMMIT")
+        self._initialized = True
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["video_id"] = str(job.pop("id"))
+        job["params"] = json.loads(job["params"]) if job["params"] else {}
+        return job
+
+    def create_job(self, status: str = "uploading", **fields) -> str:
+        """Allocate the next job ID; the INSERT is atomic across processes."""
+        now = time.time()
+        fields = {"status": status, "percent": 0, **fields}
+        if "params" in fields:
+            fields["params"] = json.dumps(fields["params"])
+        columns = [name for name in JOB_FIELDS if name in fields]
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                f"INSERT INTO jobs ({', '.join(columns)}, created_at, updated_at) "
+                f"VALUES ({', '.join('?' for _ in columns)}, ?, ?)",
+                [fields[name] for name in columns] + [now, now]
+            )
+            return str(cursor.lastrowid)
+
+    def update_job(self, job_id: str, **fields) -> None:
+        if "params" in fields:
+            fields["params"] = json.dumps(fields["params"])
+        unknown = set(fields) - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+        assignments = "".join(f"{name} = ?, " for name in fields)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                f"UPDATE jobs SET {assignments}updated_at = ?, version = version + 1 WHERE id = ?",
+                list(fields.values()) + [time.time(), int(job_id)]
+            )
+
+    def get_job(self, job_id: str) -> dict:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (int(job_id),)).fetchone()
+        return self._row(row) if row else None
+
+    def version(self, job_id: str) -> int:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT version FROM jobs WHERE id = ?", (int(job_id),)).fetchone()
+        return row[0] if row else None
+
+    def list_jobs(self, status: str = None, min_duration: float = None, max_duration: float = None, since: float = None, until: float = None, limit: int = 50, offset: int = 0) -> list:
+        """Jobs newest first; ``duration`` is the input video length in seconds, ``since``/``until`` bound creation time."""
+        clauses, args = [], []
+        for clause, value in (
+            ("status = ?", status),
+            ("duration >= ?", min_duration),
+            ("duration <= ?", max_duration),
+            ("created_at >= ?", since),
+            ("created_at <= ?", until)
+        ):
+            if value is not None:
+                clauses.append(clause)
+                args.append(value)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT * FROM jobs {where}ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                args + [limit, offset]
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def put_analytics(self, job_id: str, sections: dict) -> None:
+        """Upsert only the given sections (from ``analytics_sections``) in one transaction."""
+        if not sections:
+            return
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO analytics (job_id, section, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (job_id, section) DO UPDATE SET value = excluded.value",
+                [(int(job_id), section, value) for section, value in sections.items()]
+            )
+            conn.execute("UPDATE jobs SET updated_at = ?, version = version + 1 WHERE id = ?", (time.time(), int(job_id)))
+            conn.execute("COMMIT")
+
+    def clear_analytics(self, job_id: str) -> None:
+        """Drop every analytics section of the job, so a new run does not inherit stale ones."""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM analytics WHERE job_id = ?", (int(job_id),))
+            conn.execute("UPDATE jobs SET updated_at = ?, version = version + 1 WHERE id = ?", (time.time(), int(job_id)))
+            conn.execute("COMMIT")
+
+    def get_analytics(self, job_id: str) -> dict:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT section, value FROM analytics WHERE job_id = ?", (int(job_id),)).fetchall()
+        if not rows:
+            return None
+        analytics = {"processing_steps": {}}
+        for section, value in rows:
+            if section.startswith("processing_steps."):
+                analytics["processing_steps"][section.split(".", 1)[1]] = json.loads(value)
+            else:
+                analytics[section] = json.loads(value)
+        return analytics
+
+job_store = JobStore(legacy_ids_file="video_ids.json", legacy_path="output/jobs.db")
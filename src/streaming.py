@@ -0,0 +1,89 @@
+import os
+import math
+import re
+from src.config import Config
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+class HLSPlaylist:
+    """EVENT-type HLS playlist under ``folder`` that grows as scene segments are published.
+
+    Segments are published in scene order; each is its own encode, so they are separated
+    by discontinuity tags instead of sharing one timeline. The playlist is written before
+    the first segment so players can start polling it straight away.
+    """
+
+    def __init__(self, folder: str, target_duration: float):
+        self.folder = folder
+        self.path = os.path.join(folder, Config.HLS_PLAYLIST)
+        self.target_duration = max(1, math.ceil(target_duration))
+        self.segments = []
+        self.ended = False
+        os.makedirs(folder, exist_ok=True)
+        self._write()
+
+    def _write(self) -> None:
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{self.target_duration}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+            "#EXT-X-PLAYLIST-TYPE:EVENT"
+        ]
+        for k, (name, duration) in enumerate(self.segments):
+            if k > 0:
+                lines.append("#EXT-X-DISCONTINUITY")
+            lines += [f"#EXTINF:{duration:.3f},", name]
+        if self.ended:
+            lines.append("#EXT-X-ENDLIST")
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, self.path)
+
+    def segment_path(self, index: int) -> str:
+        return os.path.join(self.folder, f"segment_{index}.ts")
+
+    def add(self, path: str, duration: float) -> None:
+        self.segments.append((os.path.basename(path), duration))
+        self._write()
+
+    def end(self) -> None:
+        self.ended = True
+        self._write()
+
+    def files(self) -> list:
+        return [self.path] + [os.path.join(self.folder, name) for name, _ in self.segments]
+
+def parse_range(header: str, size: int) -> tuple:
+    """Parse a single-range ``Range`` header into inclusive (start, end) offsets.
+
+    Returns None when the header is absent or not a single byte range (serve the whole
+    file) and raises ValueError when the range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+    return start, end
+
+def iter_file(path: str, start: int, end: int, chunk_size: int = 1024 * 1024):
+    """Yield bytes ``start``..``end`` (inclusive) of ``path`` in chunks."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+import logging
+import threading
+import concurrent.futures
+import numpy as np
+from src.config import Config
+from src.utils import available_memory_mb
+
+logger = logging.getLogger("VideoProcessor")
+
+# Whisper decodes 30 second windows; shorter scenes can share a batched decode.
+WHISPER_WINDOW_SAMPLES = 30 * Config.AUDIO_SAMPLE_RATE
+
+def _is_whisper_model(model) -> bool:
+    # A real Whisper model can only exist once whisper has been imported, so stubs never pull it in.
+    whisper = sys.modules.get("whisper")
+    return whisper is not None and isinstance(model, whisper.model.Whisper)
+
+class TranscriptionEngine:
+    """Run Whisper over in-memory scene audio.
+
+    Scenes that fit in one 30s Whisper window are decoded together in batches of
+    ``batch_size``; a batched result that ``transcribe`` would have retried at a higher
+    temperature is re-run through ``transcribe`` so the per-scene text stays the same.
+
+    Only one inference runs on the model at a time, under ``lock``: Whisper's decoder
+    installs key/value cache hooks on the shared model, so concurrent decodes corrupt each
+    other. Worker threads overlap mel extraction and post-processing with that inference;
+    the speed-up comes from batching. Pass the registry's lock for a shared model.
+    """
+
+    def __init__(self, model, batch_size: int = Config.TRANSCRIBE_BATCH_SIZE, max_workers: int = Config.TRANSCRIBE_MAX_WORKERS, spans=None, lock=None):
+        self.model = model
+        self.lock = lock if lock is not None else threading.Lock()
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max_workers
+        self.can_batch = self.batch_size > 1 and _is_whisper_model(model)
+        self.stats = {}
+        self.spans = spans
+
+    def worker_count(self, num_tasks: int) -> int:
+        limits = [num_tasks, self.max_workers or num_tasks]
+        limits.append((os.cpu_count() or 1) // Config.TRANSCRIBE_CORES_PER_WORKER)
+        available_mb = available_memory_mb()
+        if available_mb is not None:
+            limits.append(int(available_mb // Config.TRANSCRIBE_WORKER_MEMORY_MB))
+        return max(1, min(limits))
+
+    def _transcribe_one(self, audio: np.ndarray) -> str:
+        with self.lock:
+            return self.model.transcribe(audio, language="en", fp16=False)["text"]
+
+    def _decode_batch(self, audios: list) -> list:
+        import torch
+        import whisper
+        n_mels = self.model.dims.n_mels
+        segments = []
+        for audio in audios:
+            # Same framing as transcribe(): mel of the zero-padded clip, then pad the content frames.
+            mel = whisper.log_mel_spectrogram(audio, n_mels, padding=whisper.audio.N_SAMPLES)
+            content_frames = mel.shape[-1] - whisper.audio.N_FRAMES
+            segments.append(whisper.pad_or_trim(mel[:, :content_frames], whisper.audio.N_FRAMES))
+        mel_batch = torch.stack(segments).to(self.model.device)
+        options = whisper.DecodingOptions(task="transcribe", language="en", temperature=0.0, fp16=False)
+        with self.lock:
+            results = self.model.decode(mel_batch, options)
+        texts = []
+        for audio, result in zip(audios, results):
+            if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                texts.append("")
+            elif result.compression_ratio > 2.4 or result.avg_logprob < -1.0:
+                texts.append(self._transcribe_one(audio))
+            else:
+                texts.append(result.text)
+        return texts
+
+    def _run_task(self, task: list) -> dict:
+        start_time = time.time()
+        indices = [i for i, _ in task]
+        audios = [audio for _, audio in task]
+        try:
+            if len(task) > 1:
+                texts = self._decode_batch(audios)
+            else:
+                texts = [self._transcribe_one(audios[0])]
+            if self.spans is not None:
+                self.spans.add("whisper", start_time, time.time() - start_time, scenes=len(task),
+                               audio_seconds=sum(len(audio) for audio in audios) / Config.AUDIO_SAMPLE_RATE)
+            share = (time.time() - start_time) / len(task)
+            return {i: {"text": text, "error": None, "time_taken": share} for i, text in zip(indices, texts)}
+        except Exception as e:
+            if len(task) > 1:
+                logger.warning(f"Batched decode failed for scenes {indices}, retrying one by one: {str(e)}")
+                results = {}
+                for item in task:
+                    results.update(self._run_task([item]))
+                return results
+            return {indices[0]: {"text": None, "error": e, "time_taken": time.time() - start_time}}
+
+    def _plan(self, items: dict) -> list:
+        tasks, batch = [], []
+        for i, audio in items.items():
+            if not self.can_batch or len(audio) > WHISPER_WINDOW_SAMPLES:
+                tasks.append([(i, audio)])
+                continue
+            batch.append((i, audio))
+            if len(batch) == self.batch_size:
+                tasks.append(batch)
+                batch = []
+        if batch:
+            tasks.append(batch)
+        return tasks
+
+    def transcribe(self, items: dict) -> dict:
+        """Map scene index -> mono 16 kHz audio to scene index -> {"text", "error", "time_taken"}.
+
+        Empty audio is not sent to Whisper and comes back with ``text`` set to None.
+        """
+        results = {i: {"text": None, "error": None, "time_taken": 0.0} for i, audio in items.items() if audio.size == 0}
+        tasks = self._plan({i: audio for i, audio in items.items() if audio.size > 0})
+        workers = self.worker_count(len(tasks)) if tasks else 0
+        self.stats = {
+            "workers": workers,
+            "batch_size": self.batch_size if self.can_batch else 1,
+            "num_inference_calls": len(tasks)
+        }
+        if not tasks:
+            return results
+        # Inference is serialized, so torch keeps all of its threads for each call.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for task_results in executor.map(self._run_task, tasks):
+                results.update(task_results)
+        return results
@@ -1,16 +1,186 @@
 import subprocess
 import os
+import json
+import time
+import hashlib
 import logging
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+import numpy as np
+from src.config import Config
 
 logger = logging.getLogger("VideoProcessor")
 
-def run_ffmpeg(cmd: list, error_message: str) -> None:
-    """Run an ffmpeg command and handle errors."""
-    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
-    if result.returncode != 0:
-        logger.error(f"{error_message}: {result.stderr.decode() if result.stderr else 'Unknown error'}")
-        raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+def _write_stdin(stream, data: bytes) -> None:
+    try:
+        stream.write(data)
+    except BrokenPipeError:
+        # The child exited early; its exit code and stderr report why.
+        pass
+    finally:
+        try:
+            stream.close()
+        except BrokenPipeError:
+            pass
+
+def _run_with_usage(cmd: list, input: bytes = None) -> tuple:
+    """Run ``cmd`` and return (returncode, stdout, stderr, rusage); rusage is None where wait4 is missing."""
+    if not hasattr(os, "wait4"):
+        result = subprocess.run(cmd, input=input, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+        return result.returncode, result.stdout, result.stderr, None
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    output = {}
+    readers = [
+        threading.Thread(target=lambda name, stream: output.__setitem__(name, stream.read()), args=(name, stream))
+        for name, stream in (("stdout", proc.stdout), ("stderr", proc.stderr))
+    ]
+    if input is not None:
+        readers.append(threading.Thread(target=_write_stdin, args=(proc.stdin, input)))
+    for reader in readers:
+        reader.start()
+    # wait4 reaps the child and reports its own CPU time and peak RSS, unlike RUSAGE_CHILDREN
+    # which mixes in every other subprocess that finished in the meantime.
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    for reader in readers:
+        reader.join()
+    proc.stdout.close()
+    proc.stderr.close()
+    return proc.returncode, output.get("stdout", b""), output.get("stderr", b""), usage
+
+def run_ffmpeg(cmd: list, error_message: str, spans=None, input: bytes = None) -> bytes:
+    """Run an ffmpeg/ffprobe command, record a span for it and return its stdout.
+
+    ``input`` is fed to the command's stdin (read it with ``-i pipe:0``).
+    """
+    start_time = time.time()
+    returncode, stdout, stderr, usage = _run_with_usage(cmd, input)
+    if spans is not None:
+        spans.add(
+            os.path.basename(cmd[0]),
+            start_time,
+            time.time() - start_time,
+            cpu_time=usage.ru_utime + usage.ru_stime if usage else None,
+            max_rss_mb=usage.ru_maxrss / 1024 if usage else None,
+            exit_code=returncode
+        )
+    if returncode != 0:
+        logger.error(f"{error_message}: {stderr.decode() if stderr else 'Unknown error'}")
+        raise subprocess.CalledProcessError(returncode, cmd, stdout, stderr)
     logger.debug(f"ffmpeg command succeeded: {' '.join(cmd)}")
+    return stdout
+
+def decode_audio(video_path: str, sample_rate: int = 16000, spans=None) -> np.ndarray:
+    """Decode the whole audio track to a mono float32 array in [-1, 1)."""
+    cmd = [
+        "ffmpeg", "-nostdin",
+        "-i", video_path,
+        "-vn", "-f", "s16le", "-acodec", "pcm_s16le", "-ar", str(sample_rate), "-ac", "1",
+        "pipe:1"
+    ]
+    stdout = run_ffmpeg(cmd, "Audio decode failed", spans)
+    audio = np.frombuffer(stdout, dtype=np.int16).astype(np.float32)
+    audio *= 1.0 / 32768.0
+    return audio
+
+def probe_duration(media_path: str, spans=None) -> float:
+    """Container duration in seconds as reported by ffprobe."""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        media_path
+    ]
+    return float(run_ffmpeg(cmd, f"ffprobe failed for {media_path}", spans).decode().strip())
+
+def probe_video(video_path: str, spans=None) -> dict:
+    """Container, stream and keyframe metadata from ffprobe, for stages that would otherwise re-open the file."""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_format", "-show_streams",
+        "-of", "json",
+        video_path
+    ]
+    info = json.loads(run_ffmpeg(cmd, f"ffprobe failed for {video_path}", spans).decode() or "{}")
+    streams = []
+    for stream in info.get("streams", []):
+        entry = {"index": stream.get("index"), "codec_type": stream.get("codec_type"), "codec_name": stream.get("codec_name")}
+        if stream.get("codec_type") == "video":
+            num, _, den = stream.get("avg_frame_rate", "0/1").partition("/")
+            entry.update({
+                "width": stream.get("width"),
+                "height": stream.get("height"),
+                "fps": float(num) / float(den) if den and float(den) else 0.0
+            })
+        elif stream.get("codec_type") == "audio":
+            entry.update({"sample_rate": int(stream.get("sample_rate", 0)), "channels": stream.get("channels")})
+        streams.append(entry)
+
+    # Packet flags carry the keyframe marker, so this reads the index without decoding frames.
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=p=0",
+        video_path
+    ]
+    try:
+        packets = run_ffmpeg(cmd, f"Keyframe probe failed for {video_path}", spans).decode()
+    except subprocess.CalledProcessError:
+        packets = ""
+    keyframes = []
+    for line in packets.splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" in flags and pts_time not in ("", "N/A"):
+            keyframes.append(float(pts_time))
+
+    fmt = info.get("format", {})
+    return {
+        "duration": float(fmt.get("duration", 0.0)),
+        "format": fmt.get("format_name"),
+        "bit_rate": int(fmt.get("bit_rate", 0)),
+        "streams": streams,
+        "keyframes": sorted(keyframes)
+    }
+
+def _scratch_root(tmpfs: bool) -> str:
+    if Config.SCRATCH_DIR:
+        return Config.SCRATCH_DIR
+    if tmpfs and os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+@contextmanager
+def scratch_dir(prefix: str = "job_", tmpfs: bool = Config.SCRATCH_USE_TMPFS):
+    """Yield a private scratch directory (on tmpfs when available) that is removed on exit."""
+    root = _scratch_root(tmpfs)
+    os.makedirs(root, exist_ok=True)
+    path = tempfile.mkdtemp(prefix=prefix, dir=root)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+def available_memory_mb() -> float:
+    """Best-effort available system memory in MB, or None if it cannot be determined."""
+    try:
+        with open("/proc/meminfo", 'r') as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
 
 def safe_remove(file_path: str) -> None:
     """Safely remove a file if it exists."""
@@ -18,4 +188,12 @@ def safe_remove(file_path: str) -> None:
         try:
             os.remove(file_path)
         except Exception as e:
-            logger.warning(f"Failed to remove {file_path}: {str(e)}")
\ No newline at end of file
+            logger.warning(f"Failed to remove {file_path}: {str(e)}")
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hex SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,92 @@
+import numpy as np
+from src.config import Config
+
+def frame_levels(audio: np.ndarray, sample_rate: int, frame_ms: float = Config.VAD_FRAME_MS) -> np.ndarray:
+    """RMS level in dBFS of each non-overlapping ``frame_ms`` frame (a trailing partial frame is dropped)."""
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    num_frames = len(audio) // frame_length
+    if num_frames == 0:
+        return np.zeros(0)
+    frames = audio[:num_frames * frame_length].reshape(num_frames, frame_length)
+    power = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame_length
+    return 10.0 * np.log10(np.maximum(power, 1e-12))
+
+def scene_energies(audio: np.ndarray, sample_rate: int, bounds: np.ndarray, frame_length: int = 2048, hop_length: int = 512) -> np.ndarray:
+    """Mean frame RMS for each (start, end) row of ``bounds``, in seconds.
+
+    Matches ``librosa.feature.rms`` defaults (centred frames, zero padding at the scene
+    edges) applied to each scene separately. Each scene is summed from a running sum of
+    squares over its own samples, so nothing track-sized is copied.
+    """
+    energies = np.zeros(len(bounds))
+    for k, (start, end) in enumerate(bounds):
+        first = min(len(audio), max(0, int(round(start * sample_rate))))
+        last = min(len(audio), max(first, int(round(end * sample_rate))))
+        length = last - first
+        squares = np.zeros(length + 1)
+        np.cumsum(np.square(audio[first:last], dtype=np.float64), out=squares[1:])
+        centers = np.arange(1 + length // hop_length) * hop_length
+        lo = np.clip(centers - frame_length // 2, 0, length)
+        hi = np.clip(centers + frame_length // 2, 0, length)
+        energies[k] = np.sqrt((squares[hi] - squares[lo]) / frame_length).mean()
+    return energies
+
+def band_excess(audio: np.ndarray, sample_rate: int, frame_ms: float = Config.VAD_FRAME_MS, block: int = 2048) -> tuple:
+    """Per-frame power above the scene's steady background, and the frame's total band power.
+
+    The ``Config.VAD_BAND_HZ`` range is split into ``Config.VAD_BANDS`` equal bands; a band
+    contributes whatever it carries beyond ``Config.VAD_BAND_MARGIN_DB`` over its median
+    across the scene. A constant bed (music, hum) sets those medians, so what rises above
+    them is the speech on top. Frames match ``frame_levels``; spectra are taken ``block``
+    frames at a time to bound memory.
+    """
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    num_frames = len(audio) // frame_length
+    if num_frames == 0:
+        return np.zeros(0), np.zeros(0)
+    window = np.hanning(frame_length)
+    scale = 2.0 / (frame_length * np.sum(window ** 2))
+    low, high = Config.VAD_BAND_HZ
+    band_of_bin = np.digitize(np.fft.rfftfreq(frame_length, 1.0 / sample_rate), np.linspace(low, high, Config.VAD_BANDS + 1)) - 1
+    in_range = (band_of_bin >= 0) & (band_of_bin < Config.VAD_BANDS)
+    bands = np.empty((num_frames, Config.VAD_BANDS))
+    for first in range(0, num_frames, block):
+        last = min(num_frames, first + block)
+        frames = audio[first * frame_length:last * frame_length].reshape(last - first, frame_length)
+        power = np.square(np.abs(np.fft.rfft(frames * window, axis=1))) * scale
+        bands[first:last] = np.stack(
+            [power[:, in_range & (band_of_bin == k)].sum(axis=1) for k in range(Config.VAD_BANDS)], axis=1
+        )
+    background = np.median(bands, axis=0) * 10 ** (Config.VAD_BAND_MARGIN_DB / 10)
+    return np.maximum(bands - background, 0.0).sum(axis=1), bands.sum(axis=1)
+
+def find_speech(audio: np.ndarray, sample_rate: int) -> tuple:
+    """Locate the voiced region of a scene with an energy VAD.
+
+    A frame counts as voiced when it is above ``Config.VAD_THRESHOLD_DB`` and at least
+    ``Config.VAD_NOISE_MARGIN_DB`` above the scene's noise floor (its quietest tenth of
+    frames), so silence and flat beds such as hum or steady music do not qualify while
+    speech, with its pauses between phrases, does. Speech over such a bed does not lift
+    the overall level that far, so a frame is also voiced when its ``band_excess`` is above
+    ``Config.VAD_THRESHOLD_DB`` and at least ``Config.VAD_BAND_MIN_SHARE_DB`` of the frame's
+    band power; noise spreads its fluctuations thinly and stays below that share.
+    Returns (start, end, voiced_seconds)
+    in samples with ``Config.VAD_PAD_SECONDS`` of padding, or None when there is less
+    than ``Config.VAD_MIN_SPEECH_SECONDS`` of voiced audio.
+    """
+    levels = frame_levels(audio, sample_rate)
+    if levels.size == 0:
+        return None
+    frame_length = max(1, int(sample_rate * Config.VAD_FRAME_MS / 1000))
+    noise_floor = np.percentile(levels, 10)
+    voiced = (levels > Config.VAD_THRESHOLD_DB) & (levels > noise_floor + Config.VAD_NOISE_MARGIN_DB)
+    excess, band_power = band_excess(audio, sample_rate)
+    voiced |= (excess > 10 ** (Config.VAD_THRESHOLD_DB / 10)) & (excess > band_power * 10 ** (Config.VAD_BAND_MIN_SHARE_DB / 10))
+    voiced_seconds = np.count_nonzero(voiced) * frame_length / sample_rate
+    if voiced_seconds < Config.VAD_MIN_SPEECH_SECONDS:
+        return None
+    indices = np.flatnonzero(voiced)
+    pad = int(Config.VAD_PAD_SECONDS * sample_rate)
+    start = max(0, indices[0] * frame_length - pad)
+    end = min(len(audio), (indices[-1] + 1) * frame_length + pad)
+    return int(start), int(end), float(voiced_seconds)
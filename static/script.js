@@ -61,7 +61,7 @@ function fetchAnalytics() {
     }
 
     console.log('Fetching analytics for video ID:', videoId);
-    fetch(`/analytics/${videoId}`, { cache: 'no-store' })
+    fetch(`/analytics/${videoId}`, { cache: 'no-cache' })
         .then(response => {
             console.log('Fetch response:', response.status, response.statusText);
             if (!response.ok) {
@@ -121,6 +121,9 @@ function populateAnalytics(data) {
                 Your browser does not support the video tag.
             </video>
         `);
+    } else if (data.stream && data.stream.playlist) {
+        updateElementHTML('final-output-player', '<video controls class="w-full max-w-md" id="final-output-stream"></video>');
+        attachStream(document.getElementById('final-output-stream'), `/${data.stream.playlist}`);
     } else {
         updateElementHTML('final-output-player', 'Not available');
     }
@@ -422,6 +425,72 @@ function populateAnalytics(data) {
     }
 }
 
+function attachStream(video, playlistUrl) {
+    console.log('Attaching HLS stream:', playlistUrl);
+    if (video.canPlayType('application/vnd.apple.mpegurl')) {
+        video.src = playlistUrl;
+    } else if (window.Hls && Hls.isSupported()) {
+        const hls = new Hls({ manifestLoadingMaxRetry: 10 });
+        hls.loadSource(playlistUrl);
+        hls.attachMedia(video);
+    } else {
+        console.warn('HLS playback is not supported in this browser');
+    }
+}
+
+function startLivePlayer(videoId, playlistUrl) {
+    const container = document.getElementById('live-player');
+    if (!container || container.dataset.videoId === String(videoId)) {
+        return;
+    }
+    container.dataset.videoId = String(videoId);
+    container.innerHTML = '<p class="mb-2 text-gray-700">Summary preview (more scenes appear as they finish):</p><video controls autoplay muted class="w-full max-w-md"></video>';
+    attachStream(container.querySelector('video'), playlistUrl);
+}
+
+function pollJobStatus(videoId) {
+    console.log('pollJobStatus called for video ID:', videoId);
+    const statusDiv = document.getElementById('upload-status');
+    const errorDiv = document.getElementById('error');
+    const progressBar = document.getElementById('progress-bar');
+    const progressContainer = document.getElementById('upload-progress');
+
+    fetch(`/jobs/${videoId}`, { cache: 'no-cache' })
+        .then(response => {
+            if (!response.ok) {
+                return response.text().then(text => {
+                    throw new Error(`Failed to fetch job status: ${response.status} ${text}`);
+                });
+            }
+            return response.json();
+        })
+        .then(job => {
+            console.log('Job status:', job);
+            progressBar.style.width = `${job.percent || 0}%`;
+            if (job.playlist_url && ['merge_audio_with_clips', 'merge_all_clips', 'completed'].includes(job.stage)) {
+                startLivePlayer(videoId, job.playlist_url);
+            }
+            if (job.status === 'completed') {
+                progressContainer.classList.add('hidden');
+                statusDiv.textContent = `Video ${videoId} processed successfully!`;
+                fetchAnalytics();
+            } else if (job.status === 'failed') {
+                progressContainer.classList.add('hidden');
+                statusDiv.textContent = '';
+                errorDiv.textContent = `Error: ${job.error || 'Processing failed'}`;
+            } else {
+                const stageName = (job.stage || job.status).replace(/_/g, ' ');
+                statusDiv.textContent = `Video ID: ${videoId} - ${stageName} (${job.percent || 0}%)`;
+                setTimeout(() => pollJobStatus(videoId), 2000);
+            }
+        })
+        .catch(error => {
+            console.error('Job status error:', error.message);
+            progressContainer.classList.add('hidden');
+            errorDiv.textContent = error.message;
+        });
+}
+
 document.getElementById('video-upload-form')?.addEventListener('submit', function(event) {
     event.preventDefault();
     console.log('Video upload form submitted');
@@ -462,14 +531,15 @@ document.getElementById('video-upload-form')?.addEventListener('submit', functio
     };
 
     xhr.onload = function() {
-        progressContainer.classList.add('hidden');
         if (xhr.status === 200) {
             const data = JSON.parse(xhr.responseText);
             console.log('Upload response:', data);
             statusDiv.textContent = `Video uploaded successfully! Video ID: ${data.video_id}`;
             document.getElementById('video-id').value = data.video_id;
-            fetchAnalytics();
+            progressBar.style.width = '0%';
+            pollJobStatus(data.video_id);
         } else {
+            progressContainer.classList.add('hidden');
             console.error('Upload failed:', xhr.status, xhr.statusText);
             statusDiv.textContent = '';
             errorDiv.textContent = `Error: ${xhr.statusText || 'Upload failed'}`;
@@ -0,0 +1,34 @@
+import unittest
+from src.admission import AdmissionController, estimate_cost, degraded_options
+
+PROBE = {"duration": 600.0, "streams": [{"codec_type": "video", "width": 1920, "height": 1080}, {"codec_type": "audio"}]}
+
+class TestAdmission(unittest.TestCase):
+    def test_cost_grows_with_work(self):
+        base = estimate_cost(PROBE, num_scenes=10, downscale=2)
+        self.assertGreater(estimate_cost(PROBE, 10, 2, languages=3)["cpu_seconds"], base["cpu_seconds"])
+        self.assertLess(estimate_cost(PROBE, 5, 2)["cpu_seconds"], base["cpu_seconds"])
+        self.assertLess(estimate_cost(PROBE, 10, 8)["memory_mb"], base["memory_mb"])
+        self.assertEqual(degraded_options(10, 2), [(10, 4), (10, 8), (5, 8)])
+
+    def test_admit_degrade_reject_release(self):
+        full = estimate_cost(PROBE, 10, 2)["cpu_seconds"]
+        controller = AdmissionController(cpu_seconds=full * 1.8, memory_mb=100000, workers=1)
+        self.assertFalse(controller.admit("1", PROBE, 10, 2)["degraded"])
+        degraded = controller.admit("2", PROBE, 10, 2)
+        self.assertTrue(degraded["admitted"] and degraded["degraded"])
+        self.assertLessEqual(degraded["cost"]["cpu_seconds"], full * 0.8)
+        rejected = controller.admit("3", PROBE, 10, 2, degrade=False)
+        self.assertFalse(rejected["admitted"])
+        self.assertGreaterEqual(controller.retry_after(rejected["cost"]), 5)
+        controller.release("1")
+        controller.release("2")
+        self.assertTrue(controller.admit("3", PROBE, 10, 2, degrade=False)["admitted"])
+
+    def test_oversized_job_admitted_when_idle(self):
+        controller = AdmissionController(cpu_seconds=1, memory_mb=1, workers=1)
+        self.assertTrue(controller.admit("1", PROBE, 10, 2)["admitted"])
+        self.assertTrue(controller.saturated())
+
+if __name__ == "__main__":
+    unittest.main()
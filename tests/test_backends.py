@@ -0,0 +1,99 @@
+import os
+import sys
+import types
+import tempfile
+import unittest
+from unittest import mock
+from src.cache import ArtifactCache
+from src.config import Config
+from src.backends import TranslationBackend, TTSBackend, GoogleTranslationBackend, MemoizedTranslator
+
+class FakeBackend(TranslationBackend):
+    """Upper-cases texts; any batch of more than one fails, and so does the text "bad"."""
+    name = "fake"
+
+    def __init__(self):
+        self.calls = []
+
+    def translate_batch(self, texts: list, source: str, target: str) -> list:
+        self.calls.append(list(texts))
+        if len(texts) > 1:
+            raise RuntimeError("batch rejected")
+        if texts[0] == "bad":
+            raise ValueError("untranslatable")
+        return [text.upper() for text in texts]
+
+class FakeGoogleTranslator:
+    """Stands in for deep_translator.GoogleTranslator; merges the lines of any request containing "merge"."""
+    requests = []
+
+    def __init__(self, source: str, target: str):
+        self.target = target
+
+    def translate(self, text: str) -> str:
+        FakeGoogleTranslator.requests.append(text)
+        if "merge" in text:
+            return text.replace("\n", " ").upper()
+        return text.upper()
+
+class TestBackendInterface(unittest.TestCase):
+    def test_backend_missing_its_method_cannot_be_created(self):
+        class NoTranslate(TranslationBackend):
+            name = "incomplete"
+
+        class NoSynthesize(TTSBackend):
+            name = "incomplete"
+
+        for backend in (TranslationBackend, TTSBackend, NoTranslate, NoSynthesize):
+            with self.subTest(backend=backend.__name__), self.assertRaises(TypeError):
+                backend()
+        self.assertEqual(FakeBackend().name, "fake")
+
+class TestMemoizedTranslator(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ArtifactCache(root=os.path.join(self.tmp.name, "cache"), max_mb=1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batch_failure_falls_back_to_items_with_per_item_errors(self):
+        backend = FakeBackend()
+        translator = MemoizedTranslator(backend, self.cache, source="en", target="hi")
+        results = translator.translate_batch(["one", "bad", "two"])
+        self.assertEqual(results[0], "ONE")
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], "TWO")
+        self.assertEqual(backend.calls, [["one", "bad", "two"], ["one"], ["bad"], ["two"]])
+
+        # Successes were cached; the failed text is retried on its own.
+        backend.calls.clear()
+        results = translator.translate_batch(["two", "bad", "one"])
+        self.assertEqual((results[0], results[2]), ("TWO", "ONE"))
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(backend.calls, [["bad"]])
+
+class TestGoogleTranslationBackend(unittest.TestCase):
+    def setUp(self):
+        FakeGoogleTranslator.requests = []
+        module = types.ModuleType("deep_translator")
+        module.GoogleTranslator = FakeGoogleTranslator
+        patcher = mock.patch.dict(sys.modules, {"deep_translator": module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_chunks_respect_char_budget(self):
+        with mock.patch.object(Config, "TRANSLATION_BATCH_CHARS", 10):
+            chunks = GoogleTranslationBackend()._chunks(["aaaa", "bbbb", "cc", "dddddddddddd", "e"])
+        self.assertEqual(chunks, [["aaaa", "bbbb"], ["cc"], ["dddddddddddd"], ["e"]])
+
+    def test_line_count_mismatch_translates_chunk_individually(self):
+        with mock.patch.object(Config, "TRANSLATION_BATCH_CHARS", 12):
+            translated = GoogleTranslationBackend().translate_batch(
+                ["a  b", "c\nd", "merge", "x", "y"], source="en", target="hi"
+            )
+        self.assertEqual(translated, ["A B", "C D", "MERGE", "X", "Y"])
+        self.assertEqual(FakeGoogleTranslator.requests, ["a b\nc d", "merge\nx\ny", "merge", "x", "y"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from src.batch import LaneTracker, collect_videos, run_batch
+
+class StubProcessor:
+    """Stands in for ImportantVideo: walks the stages and writes the final file, or fails on "broken" videos."""
+
+    def __init__(self, video_path, **kwargs):
+        self.video_path = video_path
+        self.kwargs = kwargs
+        self.analytics = {}
+        self.probe = {"duration": 10.0}
+        self.spans = mock.Mock(spans=[{"name": "detect_scenes", "kind": "stage", "duration": 0.5}])
+
+    def process(self, output_folder, downscale_factor, progress=None, resume=False):
+        for stage in ("detect_scenes", "convert_clips_to_text", "merge_all_clips"):
+            progress(stage, 0)
+        if "broken" in self.video_path:
+            raise RuntimeError("corrupt input")
+        os.makedirs(output_folder, exist_ok=True)
+        path = os.path.join(output_folder, "final_merged_video.mp4")
+        with open(path, 'wb') as f:
+            f.write(b"\0")
+        return path
+
+class TestCollectVideos(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "out")
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_directory_keeps_only_videos(self):
+        videos = os.path.join(self.tmp.name, "videos")
+        os.makedirs(videos)
+        for name in ("b.mp4", "a.MKV", "notes.txt"):
+            open(os.path.join(videos, name), 'wb').close()
+        entries = collect_videos(videos, self.root)
+        self.assertEqual([os.path.basename(e["video"]) for e in entries], ["a.MKV", "b.mp4"])
+        self.assertEqual([e["output"] for e in entries], [os.path.join(self.root, "a"), os.path.join(self.root, "b")])
+
+    def test_text_manifest_skips_blank_and_indented_comment_lines(self):
+        manifest = self.write("list.txt", "# videos\n  talk.mp4\n\n   # talk_old.mp4\nsub/talk.mp4\n")
+        entries = collect_videos(manifest, self.root)
+        self.assertEqual([e["video"] for e in entries], [os.path.join(self.tmp.name, "talk.mp4"), os.path.join(self.tmp.name, "sub", "talk.mp4")])
+        self.assertEqual([e["output"] for e in entries], [os.path.join(self.root, "talk"), os.path.join(self.root, "talk_2")])
+
+    def test_json_manifest_resolves_outputs_and_avoids_them(self):
+        manifest = self.write("batch.json", json.dumps([
+            {"video": "talk.mp4"},
+            {"video": "other.mp4", "output": os.path.relpath(os.path.join(self.root, "talk"), self.tmp.name), "lang": "mr"},
+            {"video": "/videos/intro.mp4", "output": "/elsewhere/intro"}
+        ]))
+        entries = collect_videos(manifest, self.root)
+        self.assertEqual(entries[0]["output"], os.path.join(self.root, "talk_2"))
+        self.assertEqual(os.path.abspath(entries[1]["output"]), os.path.join(self.root, "talk"))
+        self.assertEqual(entries[1]["lang"], "mr")
+        self.assertEqual((entries[2]["video"], entries[2]["output"]), ("/videos/intro.mp4", "/elsewhere/intro"))
+
+    def test_duplicate_explicit_outputs_are_refused(self):
+        manifest = self.write("batch.json", json.dumps([
+            {"video": "a.mp4", "output": "same"},
+            {"video": "b.mp4", "output": "./same"}
+        ]))
+        with self.assertRaises(ValueError):
+            collect_videos(manifest, self.root)
+
+class TestLaneTracker(unittest.TestCase):
+    def test_holds_one_lane_at_a_time(self):
+        lanes = {lane: threading.BoundedSemaphore(1) for lane in ("analyze", "transcribe", "render")}
+        tracker = LaneTracker(lanes)
+        tracker("downscale", 0)
+        tracker("detect_scenes", 10)
+        self.assertEqual(tracker.lane, "analyze")
+        self.assertFalse(lanes["analyze"].acquire(blocking=False))
+        tracker("convert_clips_to_text", 40)
+        self.assertTrue(lanes["analyze"].acquire(blocking=False))
+        lanes["analyze"].release()
+        tracker("unlisted_stage", 90)
+        self.assertIsNone(tracker.lane)
+        self.assertTrue(lanes["transcribe"].acquire(blocking=False))
+        lanes["transcribe"].release()
+        tracker.release()
+
+    def test_waits_for_a_busy_lane(self):
+        lanes = {"render": threading.BoundedSemaphore(1)}
+        first, second = LaneTracker(lanes), LaneTracker(lanes)
+        first("merge_all_clips", 80)
+        waiter = threading.Thread(target=second, args=("render_filtergraph", 80))
+        waiter.start()
+        time.sleep(0.1)
+        self.assertIsNone(second.lane)
+        first.release()
+        waiter.join(timeout=5)
+        self.assertEqual(second.lane, "render")
+        self.assertGreaterEqual(second.waits["render"], 0.05)
+        second.release()
+
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for patcher in (
+            mock.patch("src.batch.ImportantVideo", StubProcessor),
+            mock.patch("src.batch.ArtifactCache"),
+            mock.patch("src.batch.whisper_registry")
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_counts_failures_and_keeps_entry_order(self):
+        entries = [
+            {"video": f"/videos/{name}.mp4", "output": os.path.join(self.tmp.name, name), "scenes": 2}
+            for name in ("one", "broken", "three")
+        ]
+        summary = run_batch(entries, {"lang": "hi"}, in_flight=2, lane_limits={"analyze": 1, "transcribe": 1, "speech": 1, "render": 1})
+        self.assertEqual((summary["videos"], summary["completed"], summary["failed"]), (3, 2, 1))
+        self.assertEqual(summary["failures"], [{"video": "/videos/broken.mp4", "error": "corrupt input"}])
+        self.assertEqual([r["video"] for r in summary["results"]], [e["video"] for e in entries])
+        first = summary["results"][0]
+        self.assertEqual(first["output_path"], os.path.join(self.tmp.name, "one", "final_merged_video.mp4"))
+        self.assertEqual((first["stages"], first["video_duration"]), ({"detect_scenes": 0.5}, 10.0))
+        self.assertEqual(set(first["lane_wait"]), {"analyze", "transcribe", "render"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.cache import ArtifactCache
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_json_round_trip_counts_hits_and_misses(self):
+        cache = ArtifactCache(root=self.root, max_mb=1)
+        key = cache.key("hash", 2, 30.0)
+        self.assertIsNone(cache.get_json("scenes", key))
+        cache.put_json("scenes", key, {"fps": 25.0, "scenes": [[0, 100]]})
+        self.assertEqual(cache.get_json("scenes", key), {"fps": 25.0, "scenes": [[0, 100]]})
+        self.assertEqual(cache.stats["scenes"], {"hits": 1, "misses": 1})
+
+    def test_key_depends_on_every_part(self):
+        self.assertNotEqual(ArtifactCache.key("text", "hi", 1.0), ArtifactCache.key("text", "mr", 1.0))
+        self.assertEqual(ArtifactCache.key("text", "hi", 1.0), ArtifactCache.key("text", "hi", 1.0))
+
+    def test_evicts_least_recently_used_file(self):
+        cache = ArtifactCache(root=self.root, max_mb=2.5 / 1024)
+        src = os.path.join(self.tmp.name, "src.bin")
+        with open(src, 'wb') as f:
+            f.write(b"x" * 1024)
+        for index, key in enumerate(["old", "new"]):
+            cache.put_file("tts", key, src, ".mp3")
+            os.utime(cache._path("tts", key, ".mp3"), (index, index))
+        cache.put_file("tts", "newest", src, ".mp3")
+        dest = os.path.join(self.tmp.name, "dest.mp3")
+        self.assertFalse(cache.get_file("tts", "old", dest, ".mp3"))
+        self.assertTrue(cache.get_file("tts", "new", dest, ".mp3"))
+        self.assertTrue(cache.get_file("tts", "newest", dest, ".mp3"))
+
+    def test_walks_only_to_seed_total_and_when_over_budget(self):
+        cache = ArtifactCache(root=self.root, max_mb=4.5 / 1024)
+        src = os.path.join(self.tmp.name, "src.bin")
+        with open(src, 'wb') as f:
+            f.write(b"x" * 1024)
+        with mock.patch.object(cache, "_walk", wraps=cache._walk) as walk:
+            for key in ["a", "b", "c", "c", "d"]:
+                cache.put_file("tts", key, src, ".mp3")
+            self.assertEqual(walk.call_count, 1)
+            self.assertEqual(cache._size, 4096)
+            cache.put_file("tts", "e", src, ".mp3")
+            self.assertEqual(walk.call_count, 2)
+        self.assertEqual(cache._size, 4096)
+
+    def test_disabled_cache_never_hits(self):
+        cache = ArtifactCache(root=self.root, enabled=False)
+        cache.put_json("scores", "k", {"scores": [1.0]})
+        self.assertIsNone(cache.get_json("scores", "k"))
+
+if __name__ == "__main__":
+    unittest.main()
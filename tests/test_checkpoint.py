@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from src.checkpoint import StageManifest, read_manifest
+
+class TestStageManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = self.tmp.name
+        self.artifact = os.path.join(self.output, "scene_1_transcript.txt")
+        with open(self.artifact, 'w') as f:
+            f.write("hello")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, lang: str, resume: bool) -> StageManifest:
+        manifest = StageManifest(self.output, {"lang": lang}, resume=resume)
+        if manifest.restore("detect_scenes", "hash", 2) is None:
+            manifest.record("detect_scenes", {"result": None})
+        if manifest.restore("convert_clips_to_text", lang) is None:
+            manifest.record("convert_clips_to_text", {"result": {"scene_1": "hello"}}, [self.artifact])
+        return manifest
+
+    def test_resume_restores_completed_stages(self):
+        self._run("hi", resume=False)
+        manifest = self._run("hi", resume=True)
+        self.assertEqual(manifest.resumed, ["detect_scenes", "convert_clips_to_text"])
+        self.assertEqual(list(read_manifest(self.output)["stages"]), ["detect_scenes", "convert_clips_to_text"])
+
+    def test_parameter_change_invalidates_from_that_stage(self):
+        self._run("hi", resume=False)
+        manifest = self._run("ta", resume=True)
+        self.assertEqual(manifest.resumed, ["detect_scenes"])
+
+    def test_modified_artifact_invalidates_stage(self):
+        self._run("hi", resume=False)
+        with open(self.artifact, 'w') as f:
+            f.write("changed")
+        manifest = self._run("hi", resume=True)
+        self.assertEqual(manifest.resumed, ["detect_scenes"])
+
+    def test_stage_with_missing_artifact_is_not_recorded(self):
+        manifest = StageManifest(self.output, {})
+        manifest.restore("merge_all_clips")
+        self.assertFalse(manifest.record("merge_all_clips", {}, [os.path.join(self.output, "missing.mp4")]))
+        self.assertIsNone(read_manifest(self.output))
+
+if __name__ == "__main__":
+    unittest.main()
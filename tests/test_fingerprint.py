@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+from src.fingerprint import FrameSampler, scene_fingerprints, distance, encode_fingerprints, decode_fingerprints
+
+def shot(seed: int, noise: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    frame = np.kron(rng.integers(0, 256, (8, 8)), np.ones((45, 80))).astype(np.int16)
+    if noise:
+        frame += np.random.default_rng(seed + 100).integers(-noise, noise + 1, frame.shape, dtype=np.int16)
+    return np.repeat(np.clip(frame, 0, 255).astype(np.uint8)[:, :, None], 3, axis=2)
+
+class TestFingerprints(unittest.TestCase):
+    def test_sampler_step_and_window(self):
+        sampler = FrameSampler(fps=25.0, interval=1.0)
+        for frame_num in range(0, 100, 2):
+            sampler.add(frame_num, shot(1))
+        self.assertEqual(sampler.frames, [0, 26, 52, 78])
+        frames, thumbnails = sampler.samples(26, 78)
+        self.assertEqual(frames.tolist(), [26, 52])
+        self.assertEqual(thumbnails.shape, (2, 8, 8))
+
+    def test_repeated_shot_is_close_and_new_shot_is_far(self):
+        sampler = FrameSampler(fps=1.0, interval=1.0)
+        for frame_num, frame in enumerate([shot(1), shot(1), shot(2), shot(2), shot(1, noise=20), shot(1, noise=20)]):
+            sampler.add(frame_num, frame)
+        first, second, repeat, empty = scene_fingerprints(*sampler.samples(), [(0, 2), (2, 4), (4, 6), (6, 8)])
+        self.assertLessEqual(distance(first, repeat), 0.1)
+        self.assertGreater(distance(first, second), 0.25)
+        self.assertIsNone(empty)
+        decoded = decode_fingerprints(encode_fingerprints([first, empty]))
+        self.assertTrue(np.array_equal(decoded[0], first))
+        self.assertIsNone(decoded[1])
+
+    def test_flat_scenes_have_no_fingerprint(self):
+        sampler = FrameSampler(fps=1.0, interval=1.0)
+        # Dark red and navy as BGR, then a faint gradient: all flat enough to hash to the same bits.
+        frames = [np.full((360, 640, 3), (0, 0, 139), np.uint8), np.full((360, 640, 3), (128, 0, 0), np.uint8)]
+        frames.append(np.tile(np.linspace(100, 105, 640, dtype=np.uint8)[None, :, None], (360, 1, 3)))
+        for frame_num, frame in enumerate(frames):
+            sampler.add(frame_num, frame)
+        self.assertEqual(scene_fingerprints(*sampler.samples(), [(0, 1), (1, 2), (2, 3)]), [None, None, None])
+
+if __name__ == "__main__":
+    unittest.main()
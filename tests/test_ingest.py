@@ -0,0 +1,114 @@
+import os
+import asyncio
+import tempfile
+import unittest
+import importlib.util
+from unittest import mock
+from src.store import JobStore
+from src.utils import file_sha256
+
+DEPENDENCIES = ("fastapi", "multipart")
+MISSING = [name for name in DEPENDENCIES if importlib.util.find_spec(name) is None]
+BOUNDARY = "----pipeline-test-boundary"
+
+def multipart_body(parts: list) -> bytes:
+    """Encode (name, filename, content) parts as a multipart/form-data body."""
+    body = b""
+    for name, filename, content in parts:
+        disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+        body += f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n".encode()
+        if filename:
+            body += b"Content-Type: video/mp4\r\n"
+        body += b"\r\n" + content + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+class FakeRequest:
+    """The parts of a Starlette request ingest_upload reads; ``disconnect_after`` chunks, the client goes away."""
+
+    def __init__(self, body: bytes, chunk_size: int = 65536, disconnect_after: int = None):
+        self.headers = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+        self.chunks = [body[k:k + chunk_size] for k in range(0, len(body), chunk_size)]
+        self.disconnect_after = disconnect_after
+
+    async def stream(self):
+        from starlette.requests import ClientDisconnect
+        for index, chunk in enumerate(self.chunks):
+            if index == self.disconnect_after:
+                raise ClientDisconnect()
+            yield chunk
+
+@unittest.skipIf(MISSING, f"{', '.join(MISSING)} not installed")
+class TestIngestUpload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dest = os.path.join(self.tmp.name, "video.mp4")
+        self.content = bytes(range(256)) * 400
+
+    def ingest(self, request: FakeRequest, max_bytes: int = 1024 * 1024) -> dict:
+        from src.ingest import ingest_upload
+        return asyncio.run(ingest_upload(request, self.dest, max_bytes))
+
+    def test_hash_matches_written_file(self):
+        body = multipart_body([("lang", None, b"hi,mr"), ("file", "clip.mp4", self.content)])
+        upload = self.ingest(FakeRequest(body))
+        self.assertEqual((upload["filename"], upload["size"]), ("clip.mp4", len(self.content)))
+        self.assertEqual(upload["sha256"], file_sha256(self.dest))
+        with open(self.dest, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_chunks_splitting_part_headers(self):
+        body = multipart_body([("file", "clip.mp4", self.content[:3000])])
+        for chunk_size in (1, 7, 64):
+            with self.subTest(chunk_size=chunk_size):
+                upload = self.ingest(FakeRequest(body, chunk_size=chunk_size))
+                self.assertEqual(upload["filename"], "clip.mp4")
+                self.assertEqual(upload["sha256"], file_sha256(self.dest))
+                self.assertEqual(os.path.getsize(self.dest), 3000)
+
+    def test_oversized_upload_is_refused_and_removed(self):
+        from src.ingest import UploadTooLarge
+        with self.assertRaises(UploadTooLarge):
+            self.ingest(FakeRequest(multipart_body([("file", "clip.mp4", self.content)])), max_bytes=1000)
+        self.assertFalse(os.path.exists(self.dest))
+
+    def test_missing_file_part(self):
+        from src.ingest import UploadMissing
+        with self.assertRaises(UploadMissing):
+            self.ingest(FakeRequest(multipart_body([("video", "clip.mp4", self.content)])))
+        self.assertFalse(os.path.exists(self.dest))
+
+    def test_client_disconnect_aborts_and_removes_partial_file(self):
+        from src.ingest import UploadAborted
+        body = multipart_body([("file", "clip.mp4", self.content)])
+        with self.assertRaises(UploadAborted):
+            self.ingest(FakeRequest(body, chunk_size=4096, disconnect_after=3))
+        self.assertFalse(os.path.exists(self.dest))
+
+@unittest.skipIf(MISSING, f"{', '.join(MISSING)} not installed")
+class TestSummarizeUpload(unittest.TestCase):
+    def setUp(self):
+        from fastapi.testclient import TestClient
+        from src import api
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = JobStore(os.path.join(self.tmp.name, "jobs.db"))
+        for patcher in (mock.patch.object(api, "job_store", self.store), mock.patch.object(api.Config, "MAX_UPLOAD_MB", 0.001)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(api.app)
+
+    def test_oversized_body_is_413_and_job_rejected(self):
+        response = self.client.post("/summarize/", files={"file": ("clip.mp4", b"\0" * 4096, "video/mp4")})
+        self.assertEqual(response.status_code, 413)
+        job = self.store.list_jobs()[0]
+        self.assertEqual(job["status"], "rejected")
+        self.assertFalse(os.path.exists(os.path.join("input", f"video_{job['video_id']}.mp4")))
+
+    def test_missing_file_part_is_400(self):
+        response = self.client.post("/summarize/", files={"video": ("clip.mp4", b"\0" * 16, "video/mp4")})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.store.list_jobs()[0]["status"], "rejected")
+
+if __name__ == "__main__":
+    unittest.main()
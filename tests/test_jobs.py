@@ -0,0 +1,113 @@
+import os
+import time
+import tempfile
+import unittest
+import importlib.util
+from unittest import mock
+from src.store import JobStore
+from src.jobs import JobQueue, run_job
+
+def fake_job(video_id, input_path, output_folder, params):
+    """Pool job that succeeds, or kills its worker process when asked to, like an OOM kill."""
+    if params.get("crash"):
+        os._exit(1)
+    return {"output_path": os.path.join(output_folder, "out.mp4"), "spans": [], "queue_wait": None}
+
+class StubProcessor:
+    """Stands in for ImportantVideo: reports one stage and writes the final file."""
+    created = []
+
+    def __init__(self, video_path, **kwargs):
+        self.kwargs = kwargs
+        self.analytics = {"scheduler": {}}
+        self.spans = mock.Mock(spans=[])
+        StubProcessor.created.append(self)
+
+    def process(self, output_folder, downscale_factor, progress=None, resume=False):
+        progress("detect_scenes", 5)
+        os.makedirs(output_folder, exist_ok=True)
+        path = os.path.join(output_folder, "final_merged_video.mp4")
+        with open(path, 'wb') as f:
+            f.write(b"\0")
+        return path
+
+class StoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmp.name, "jobs.db"))
+        patcher = mock.patch("src.jobs.job_store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+class TestRunJob(StoreTestCase):
+    def test_runs_processor_and_marks_completed(self):
+        video_id = self.store.create_job("queued")
+        output_folder = os.path.join(self.tmp.name, "out")
+        params = {"lang": "hi,mr", "num_scenes": 3, "tts_speed": 1.0, "downscale": 2, "renderer": "filtergraph", "queued_at": 0.0}
+        with mock.patch("src.important_video.ImportantVideo", StubProcessor):
+            result = run_job(video_id, "input.mp4", output_folder, params)
+        processor = StubProcessor.created[-1]
+        self.assertEqual((processor.kwargs["lang"], processor.kwargs["renderer"], processor.kwargs["job_id"]), ("hi,mr", "filtergraph", video_id))
+        self.assertGreater(processor.analytics["scheduler"]["job_queue_wait"], 0)
+        job = self.store.get_job(video_id)
+        self.assertEqual((job["status"], job["percent"], job["output_path"]), ("completed", 100, result["output_path"]))
+
+class TestJobQueue(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.queue = JobQueue(max_workers=1, job=fake_job, preload=[])
+        self.addCleanup(self.queue.shutdown, wait=True)
+
+    def wait_for_status(self, video_id: str, status: str) -> dict:
+        # The done-callback that records the outcome may run just after result() returns.
+        deadline = time.time() + 10
+        while self.store.get_job(video_id)["status"] != status and time.time() < deadline:
+            time.sleep(0.02)
+        return self.store.get_job(video_id)
+
+    def test_completed_job_leaves_queue(self):
+        video_id = self.store.create_job("uploading")
+        future = self.queue.submit(video_id, "input.mp4", self.tmp.name, {})
+        self.assertEqual(future.result(timeout=60)["output_path"], os.path.join(self.tmp.name, "out.mp4"))
+        self.assertFalse(self.queue.active(video_id))
+        self.assertEqual(self.store.get_job(video_id)["status"], "queued")
+
+    def test_dead_worker_fails_job_and_pool_is_replaced(self):
+        crashed = self.store.create_job("uploading")
+        future = self.queue.submit(crashed, "input.mp4", self.tmp.name, {"crash": True})
+        with self.assertRaises(Exception):
+            future.result(timeout=60)
+        job = self.wait_for_status(crashed, "failed")
+        self.assertEqual(job["status"], "failed")
+        self.assertIn("died", job["error"])
+
+        video_id = self.store.create_job("uploading")
+        self.assertIsNotNone(self.queue.submit(video_id, "input.mp4", self.tmp.name, {}).result(timeout=60))
+
+@unittest.skipIf(importlib.util.find_spec("fastapi") is None, "fastapi is not installed")
+class TestJobStatusEndpoint(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        from fastapi.testclient import TestClient
+        from src import api
+        patcher = mock.patch.object(api, "job_store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(api.app)
+
+    def test_status_etag_and_errors(self):
+        video_id = self.store.create_job("running", params={"streaming": True})
+        response = self.client.get(f"/jobs/{video_id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "running")
+        self.assertTrue(response.json()["playlist_url"].startswith(f"/output/{video_id}/"))
+        etag = response.headers["etag"]
+        self.assertEqual(self.client.get(f"/jobs/{video_id}", headers={"If-None-Match": etag}).status_code, 304)
+        self.store.update_job(video_id, percent=50)
+        self.assertEqual(self.client.get(f"/jobs/{video_id}", headers={"If-None-Match": etag}).status_code, 200)
+        self.assertEqual(self.client.get("/jobs/999").status_code, 404)
+        self.assertEqual(self.client.get("/jobs/abc").status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
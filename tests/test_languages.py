@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.cache import ArtifactCache
+from src.config import Config
+from src.important_video import ImportantVideo
+from src.scheduler import ffmpeg_scheduler
+
+def fake_ffmpeg(calls: list):
+    """Record each command and create its output file, like a successful ffmpeg run."""
+    def run(cmd, error_message, spans=None, input=None):
+        calls.append(cmd)
+        with open(cmd[-1], 'wb') as f:
+            f.write(b"\0")
+        return b""
+    return run
+
+class TestLanguages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "input.mp4")
+        with open(self.video, 'wb') as f:
+            f.write(b"\0")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def processor(self, **kwargs) -> ImportantVideo:
+        kwargs.setdefault("translation_backend", "offline")
+        kwargs.setdefault("tts_backend", "offline")
+        return ImportantVideo(self.video, cache=ArtifactCache(root=os.path.join(self.tmp.name, "cache"), enabled=False), **kwargs)
+
+    def touch(self, *parts) -> str:
+        path = os.path.join(self.tmp.name, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b"\0")
+        return path
+
+    def test_lang_parsing(self):
+        processor = self.processor(lang=" hi, mr,hi,,ta ")
+        self.assertEqual(processor.langs, ["hi", "mr", "ta"])
+        self.assertEqual(processor.lang, "hi")
+        self.assertEqual(list(processor.translators), ["hi", "mr", "ta"])
+        self.assertIs(processor.translator, processor.translators["hi"])
+        self.assertEqual(self.processor(lang=["en", "ur"]).langs, ["en", "ur"])
+
+    def test_lang_validation(self):
+        with self.assertRaises(ValueError):
+            self.processor(lang=" , ")
+        with self.assertRaises(ValueError):
+            self.processor(lang="hi,mr", language_output="subtitles")
+        with self.assertRaises(ValueError):
+            self.processor(lang="hi,mr", final_mp4=False, streaming=True, renderer="clips")
+        self.assertEqual(self.processor(lang="hi", final_mp4=False, streaming=True, renderer="clips").langs, ["hi"])
+
+    def test_language_track_filtergraph(self):
+        processor = self.processor(lang="hi,mr")
+        narration = {"scene_1": self.touch("audio", "scene_1_mr.mp3"), "scene_2": os.path.join(self.tmp.name, "missing.mp3")}
+        calls = []
+        with mock.patch("src.important_video.run_ffmpeg", side_effect=fake_ffmpeg(calls)), \
+                mock.patch("src.important_video.probe_duration", return_value=6.0):
+            stats = processor._language_track("mr", narration, [(1, 4.0), (2, 3.0), (3, 5.0)], os.path.join(self.tmp.name, "mr.m4a"))
+        self.assertEqual((stats["tempo_adjusted"], stats["missing_narration"]), (1, 2))
+        cmd = calls[0]
+        self.assertEqual(cmd[cmd.index("-i") + 1], narration["scene_1"])
+        self.assertEqual(cmd.count("-i"), 1)
+        threads = str(ffmpeg_scheduler.threads)
+        self.assertEqual(cmd[cmd.index("-i") - 2:cmd.index("-i")], ["-threads", threads])
+        self.assertEqual(cmd[-3:-1], ["-threads", threads])
+        filters = cmd[cmd.index("-filter_complex") + 1].split(";")
+        # 6s of narration over a 4s clip is sped up by at most LANGUAGE_MAX_TEMPO, then cut.
+        self.assertTrue(filters[0].startswith(f"[0:a:0]atempo={Config.LANGUAGE_MAX_TEMPO:.3f},apad,atrim=duration=4.0,"))
+        self.assertTrue(filters[1].startswith("anullsrc=channel_layout=stereo:sample_rate=44100,apad,atrim=duration=3.0,"))
+        self.assertIn("atrim=duration=5.0", filters[2])
+        self.assertEqual(filters[3], "[a0][a1][a2]concat=n=3:v=0:a=1[outa]")
+        self.assertEqual(cmd[-1], stats["file"])
+
+    def mux(self, language_output: str) -> tuple:
+        processor = self.processor(lang="hi,mr,ta", language_output=language_output)
+        output_folder = os.path.join(self.tmp.name, "out")
+        final_output = self.touch("out", Config.FINAL_OUTPUT)
+        clips = [self.touch("out", "clips", f"clip_{i}.mp4") for i in (1, 2)]
+        processor.analytics["video_clips"] = [{"file": clip, "scene_number": i} for i, clip in enumerate(clips, 1)]
+        audio_paths = {
+            lang: {f"scene_{i}": self.touch("out", "audio", f"scene_{i}_{lang}.mp3") for i in (1, 2)}
+            for lang in processor.langs
+        }
+        work_dir = os.path.join(self.tmp.name, "scratch")
+        os.makedirs(work_dir)
+        calls = []
+        with mock.patch("src.important_video.run_ffmpeg", side_effect=fake_ffmpeg(calls)), \
+                mock.patch("src.important_video.probe_duration", return_value=2.0):
+            written = processor.mux_languages(audio_paths, output_folder, clips, work_dir)
+        tracks = {os.path.join(work_dir, f"summary_{lang}.m4a") for lang in ("mr", "ta")}
+        self.assertEqual({cmd[-1] for cmd in calls[:2]}, tracks)
+        return processor, final_output, written, calls[2:], tracks
+
+    def test_mux_tracks_into_final_video(self):
+        processor, final_output, written, calls, tracks = self.mux("tracks")
+        self.assertEqual(written, [final_output])
+        self.assertEqual(len(calls), 1)
+        cmd = calls[0]
+        self.assertEqual(cmd[cmd.index("-i") + 1], final_output)
+        self.assertEqual({cmd[k + 1] for k, arg in enumerate(cmd) if arg == "-i"} - {final_output}, tracks)
+        maps = [cmd[k + 1] for k, arg in enumerate(cmd) if arg == "-map"]
+        self.assertEqual(maps, ["0:v:0", "0:a:0", "1:a:0", "2:a:0"])
+        self.assertEqual(cmd[cmd.index("-c") + 1], "copy")
+        for k, code in enumerate(["hin", "mar", "tam"]):
+            self.assertEqual(cmd[cmd.index(f"-metadata:s:a:{k}") + 1], f"language={code}")
+        self.assertEqual(cmd[cmd.index("-disposition:a:0") + 1], "default")
+        self.assertEqual(cmd[cmd.index("-disposition:a:2") + 1], "0")
+        self.assertTrue(cmd[-1].endswith(".muxing.mp4"))
+        self.assertFalse(os.path.exists(cmd[-1]))
+        self.assertTrue(os.path.exists(final_output))
+        self.assertEqual(processor.analytics["final_output"]["audio_tracks"], ["hi", "mr", "ta"])
+        self.assertNotIn("file", processor.analytics["languages"]["mr"])
+
+    def test_mux_one_file_per_language(self):
+        processor, final_output, written, calls, _ = self.mux("files")
+        name, ext = os.path.splitext(final_output)
+        self.assertEqual(written, [f"{name}_mr{ext}", f"{name}_ta{ext}"])
+        for cmd, lang, code in zip(calls, ("mr", "ta"), ("mar", "tam")):
+            self.assertEqual([cmd[k + 1] for k, arg in enumerate(cmd) if arg == "-map"], ["0:v:0", "1:a:0"])
+            self.assertEqual(cmd[cmd.index("-metadata:s:a:0") + 1], f"language={code}")
+            self.assertEqual(processor.analytics["languages"][lang]["output"], cmd[-1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,16 @@
+import unittest
+import importlib.util
+from benchmarks.bench_startup import ENTRY_POINTS, measure_import
+
+class TestLazyImports(unittest.TestCase):
+    def test_entry_points_do_not_load_stage_dependencies(self):
+        for module in ENTRY_POINTS:
+            with self.subTest(module=module):
+                if module == "src.api" and importlib.util.find_spec("fastapi") is None:
+                    self.skipTest("fastapi is not installed")
+                result = measure_import(module, repeat=1)
+                self.assertEqual(result["leaked"], {})
+                self.assertIsNone(result["error"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from src.metrics import MetricsRegistry, SpanRecorder
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_spans_render_as_cumulative_prometheus_histogram(self):
+        recorder = SpanRecorder()
+        recorder.stage = "merge_all_clips"
+        recorder.add("ffmpeg", 0.0, 0.2, cpu_time=0.15, max_rss_mb=40.0)
+        recorder.add("ffmpeg", 0.0, 3.0, cpu_time=2.5, max_rss_mb=90.0)
+        registry = MetricsRegistry()
+        registry.observe_spans(recorder.spans)
+        text = registry.render()
+        self.assertIn('# TYPE pipeline_span_seconds histogram', text)
+        self.assertIn('pipeline_span_seconds_bucket{name="ffmpeg",stage="merge_all_clips",le="0.25"} 1', text)
+        self.assertIn('pipeline_span_seconds_bucket{name="ffmpeg",stage="merge_all_clips",le="5.0"} 2', text)
+        self.assertIn('pipeline_span_seconds_count{name="ffmpeg",stage="merge_all_clips"} 2', text)
+        self.assertIn('pipeline_span_cpu_seconds_total{name="ffmpeg",stage="merge_all_clips"} 2.65', text)
+        self.assertIn('pipeline_subprocess_max_rss_mb_bucket{name="ffmpeg",stage="merge_all_clips",le="64"} 1', text)
+
+    def test_span_context_records_duration_and_stage(self):
+        recorder = SpanRecorder()
+        recorder.stage = "convert_clips_to_text"
+        with recorder.span("translate", texts=3):
+            pass
+        span = recorder.spans[0]
+        self.assertEqual(span["name"], "translate")
+        self.assertEqual(span["stage"], "convert_clips_to_text")
+        self.assertEqual(span["texts"], 3)
+        self.assertGreaterEqual(span["duration"], 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import time
+import unittest
+from src.models import WhisperRegistry
+
+class TestWhisperRegistry(unittest.TestCase):
+    def test_idle_model_evicted_after_release_without_another_borrow(self):
+        registry = WhisperRegistry(idle_ttl=0.1)
+        registry.register("stub", object)
+        with registry.borrow("stub") as (model, lock):
+            time.sleep(0.15)
+            self.assertIs(registry._models["stub"]["model"], model)
+        self.assertIn("stub", registry._models)
+        deadline = time.time() + 5
+        while "stub" in registry._models and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertNotIn("stub", registry._models)
+
+    def test_entry_counts_its_user_before_eviction_can_see_it(self):
+        registry = WhisperRegistry(idle_ttl=0.0)
+        registry.register("stub", object)
+        entry = registry._load("stub")
+        self.assertEqual(registry.evict_idle(), [])
+        with registry.borrow("stub") as (model, lock):
+            self.assertIs(model, entry["model"])
+            self.assertIs(lock, entry["lock"])
+            self.assertEqual(entry["users"], 2)
+        self.assertEqual(registry.evict_idle(), [])
+        entry["users"] -= 1
+        self.assertEqual(registry.evict_idle(), ["stub"])
+
+    def test_pinned_model_is_kept(self):
+        registry = WhisperRegistry(idle_ttl=0.0)
+        registry.register("stub", object)
+        registry.preload(["stub"])
+        self.assertEqual(registry._models["stub"]["users"], 0)
+        with registry.borrow("stub"):
+            pass
+        self.assertEqual(registry.evict_idle(), [])
+        self.assertEqual(registry._timers, {})
+
+if __name__ == "__main__":
+    unittest.main()
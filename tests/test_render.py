@@ -0,0 +1,188 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.cache import ArtifactCache
+from src.config import Config
+from src.important_video import ImportantVideo
+from src.scheduler import ffmpeg_scheduler
+
+class Timecode:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def get_seconds(self) -> float:
+        return self.seconds
+
+def fake_ffmpeg(calls: list):
+    """Record each command and create every .mp4 it writes, like a successful ffmpeg run."""
+    def run(cmd, error_message, spans=None, input=None):
+        calls.append((cmd, input))
+        for k, arg in enumerate(cmd):
+            if arg.endswith(".mp4") and cmd[k - 1] != "-i":
+                with open(arg, 'wb') as f:
+                    f.write(b"\0")
+        return b""
+    return run
+
+def inputs(cmd: list) -> list:
+    return [cmd[k + 1] for k, arg in enumerate(cmd) if arg == "-i"]
+
+class RenderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.video = self.touch("input.mp4")
+        self.output_folder = os.path.join(self.tmp.name, "out")
+        os.makedirs(self.output_folder)
+        self.threads = str(ffmpeg_scheduler.threads)
+
+    def touch(self, *parts) -> str:
+        path = os.path.join(self.tmp.name, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b"\0")
+        return path
+
+    def processor(self, **kwargs) -> ImportantVideo:
+        processor = ImportantVideo(
+            self.video, cache=ArtifactCache(root=os.path.join(self.tmp.name, "cache"), enabled=False),
+            translation_backend="offline", tts_backend="offline", **kwargs
+        )
+        # Scenes in score order, not file order.
+        processor.summary_clips = [(Timecode(10.0), Timecode(14.0)), (Timecode(2.0), Timecode(5.0)), (Timecode(20.0), Timecode(22.0))]
+        return processor
+
+    def run_ffmpeg(self, method, *args) -> list:
+        calls = []
+        with mock.patch("src.important_video.run_ffmpeg", side_effect=fake_ffmpeg(calls)), \
+                mock.patch("src.important_video.probe_duration", return_value=3.0):
+            method(*args)
+        return calls
+
+class TestRenderFiltergraph(RenderTestCase):
+    def render(self, write_clips: bool) -> tuple:
+        processor = self.processor(write_clips=write_clips)
+        # Scene 1 has no narration; scenes 2 and 3 are narrated.
+        audio_paths = {f"scene_{i}": self.touch("audio", f"scene_{i}.mp3") for i in (2, 3)}
+        calls = self.run_ffmpeg(processor.render_filtergraph, audio_paths, self.output_folder)
+        self.assertEqual(len(calls), 1)
+        cmd = calls[0][0]
+        return processor, cmd, cmd[cmd.index("-filter_complex") + 1].split(";"), audio_paths
+
+    def test_inputs_and_concat(self):
+        processor, cmd, filters, audio_paths = self.render(write_clips=False)
+        self.assertEqual(inputs(cmd), [self.video] * 3 + [audio_paths["scene_2"], audio_paths["scene_3"]])
+        # Each scene is seeked on its own input, cut to the shorter of scene and narration.
+        first = cmd.index("-i")
+        self.assertEqual(cmd[first - 6:first], ["-threads", self.threads, "-ss", "9.5", "-t", "5.0"])
+        second = cmd.index("-i", first + 1)
+        self.assertEqual(cmd[second - 4:second], ["-ss", "1.5", "-t", "3.0"])
+        for k, arg in enumerate(cmd):
+            if arg == "-i":
+                self.assertIn("-threads", cmd[k - 6:k])
+        self.assertEqual(cmd[cmd.index("-filter_complex_threads") + 1], self.threads)
+
+        self.assertEqual(filters[0], "[0:v:0]setpts=PTS-STARTPTS[v1]")
+        self.assertTrue(filters[1].startswith("anullsrc=channel_layout=stereo:sample_rate=44100,atrim=duration=5.0,"))
+        self.assertTrue(filters[1].endswith("[a1]"))
+        # Narration inputs follow the scene inputs, numbered from len(scenes).
+        self.assertEqual(filters[2], "[1:v:0]setpts=PTS-STARTPTS[v2]")
+        self.assertTrue(filters[3].startswith("[3:a:0]atrim=duration=3.0,"))
+        self.assertTrue(filters[5].startswith("[4:a:0]atrim=duration=3.0,"))
+        self.assertEqual(filters[-1], "[v1][a1][v2][a2][v3][a3]concat=n=3:v=1:a=1[outv][outa]")
+
+        final_output = os.path.join(self.output_folder, Config.FINAL_OUTPUT)
+        self.assertEqual(cmd[cmd.index("-map"):cmd.index("-map") + 4], ["-map", "[outv]", "-map", "[outa]"])
+        self.assertEqual(cmd[-1], final_output)
+        self.assertEqual(cmd.count("-map"), 2)
+        self.assertEqual(processor.analytics["final_output"]["file"], final_output)
+        self.assertEqual(processor.analytics["video_clips"], [])
+
+    def test_write_clips_splits_each_scene(self):
+        processor, cmd, filters, _ = self.render(write_clips=True)
+        for i in (1, 2, 3):
+            self.assertIn(f"[v{i}]split[vc{i}][vo{i}]", filters)
+            self.assertIn(f"[a{i}]asplit[ac{i}][ao{i}]", filters)
+        self.assertEqual(filters[-1], "[vc1][ac1][vc2][ac2][vc3][ac3]concat=n=3:v=1:a=1[outv][outa]")
+
+        clip_dir = os.path.join(self.output_folder, Config.OUTPUT_VIDEO_CLIPS)
+        clips = [os.path.join(clip_dir, f"input-scene-{i}.mp4") for i in (1, 2, 3)]
+        maps = [cmd[k + 1] for k, arg in enumerate(cmd) if arg == "-map"]
+        self.assertEqual(maps, ["[outv]", "[outa]", "[vo1]", "[ao1]", "[vo2]", "[ao2]", "[vo3]", "[ao3]"])
+        # Each clip is its own output: its maps, then the same encode args as the final video.
+        encodes = [cmd[cmd.index(f"[ao{i}]") + 1:cmd.index(clip)] for i, clip in enumerate(clips, 1)]
+        self.assertEqual(encodes[0], encodes[2])
+        self.assertEqual(encodes[0][-2:], ["-threads", self.threads])
+        self.assertEqual(cmd[-1], clips[-1])
+        self.assertEqual([clip["file"] for clip in processor.analytics["video_clips"]], clips)
+        self.assertEqual([clip["scene_number"] for clip in processor.analytics["video_clips"]], [1, 2, 3])
+
+class TestMergeClip(RenderTestCase):
+    def merge(self, audio_path: str = None, side_effect=None) -> tuple:
+        processor = self.processor()
+        video_dir = os.path.join(self.output_folder, Config.OUTPUT_VIDEO_CLIPS)
+        os.makedirs(video_dir)
+        calls = []
+        with mock.patch("src.important_video.run_ffmpeg", side_effect=side_effect or fake_ffmpeg(calls)):
+            clip = processor._merge_clip(2, processor.summary_clips[1], audio_path, video_dir, "input")
+        return processor, clip, [cmd for cmd, _ in calls]
+
+    def test_clip_with_narration(self):
+        audio_path = self.touch("audio", "scene_2.mp3")
+        processor, clip, calls = self.merge(audio_path)
+        self.assertEqual(len(calls), 1)
+        cmd = calls[0]
+        self.assertEqual(inputs(cmd), [self.video, audio_path])
+        first, second = [k for k, arg in enumerate(cmd) if arg == "-i"]
+        self.assertEqual(cmd[first - 6:first], ["-threads", self.threads, "-ss", "1.5", "-t", "4.0"])
+        self.assertEqual(cmd[second - 2:second], ["-threads", self.threads])
+        self.assertEqual([cmd[k + 1] for k, arg in enumerate(cmd) if arg == "-map"], ["0:v:0", "1:a:0"])
+        self.assertEqual(cmd[-2:], ["-shortest", clip])
+        self.assertEqual(clip, os.path.join(self.output_folder, Config.OUTPUT_VIDEO_CLIPS, "input-scene-2.mp4"))
+        self.assertEqual(processor.analytics["video_clips"][0]["scene_number"], 2)
+
+    def test_clip_without_narration_gets_silence(self):
+        _, clip, calls = self.merge(os.path.join(self.tmp.name, "missing.mp3"))
+        cmd = calls[0]
+        second = [k for k, arg in enumerate(cmd) if arg == "-i"][1]
+        # The lavfi source has nothing to decode, so it gets no -threads of its own.
+        self.assertEqual(cmd[second - 4:second + 2], ["-f", "lavfi", "-t", "4.0", "-i", "anullsrc=channel_layout=stereo:sample_rate=44100"])
+        self.assertEqual(cmd.count("-threads"), 2)
+        self.assertTrue(os.path.exists(clip))
+
+    def test_failed_render_removes_partial_clip(self):
+        def fail(cmd, error_message, spans=None, input=None):
+            with open(cmd[-1], 'wb') as f:
+                f.write(b"\0")
+            raise RuntimeError(error_message)
+        processor, clip, _ = self.merge(side_effect=fail)
+        self.assertIsNone(clip)
+        self.assertEqual(os.listdir(os.path.join(self.output_folder, Config.OUTPUT_VIDEO_CLIPS)), [])
+        self.assertIn("Error merging clip 2", processor.analytics["logs"][-1])
+
+class TestMergeAllClips(RenderTestCase):
+    def test_concat_list_goes_to_stdin(self):
+        processor = self.processor()
+        clips = [self.touch("clips", "scene-1.mp4"), self.touch("clips", "it's scene-2.mp4")]
+        calls = self.run_ffmpeg(processor.merge_all_clips, clips, self.output_folder)
+        self.assertEqual(len(calls), 1)
+        cmd, stdin = calls[0]
+        self.assertEqual(inputs(cmd), ["pipe:0"])
+        self.assertEqual(cmd[cmd.index("-f") + 1], "concat")
+        self.assertEqual(cmd[cmd.index("-safe") + 1], "0")
+        self.assertEqual(cmd[cmd.index("-protocol_whitelist") + 1], "file,pipe")
+        self.assertEqual(cmd[cmd.index("-c") + 1], "copy")
+        self.assertEqual(cmd[-1], os.path.join(self.output_folder, Config.FINAL_OUTPUT))
+        self.assertEqual(stdin.decode("utf-8"), (
+            f"file '{clips[0]}'\n"
+            f"file '{os.path.join(self.tmp.name, 'clips', 'it')}'\\''s scene-2.mp4'\n"
+        ))
+        self.assertEqual(processor.analytics["final_output"]["file"], cmd[-1])
+
+    def test_no_clips_is_an_error(self):
+        with self.assertRaises(ValueError):
+            self.processor().merge_all_clips([], self.output_folder)
+
+if __name__ == "__main__":
+    unittest.main()
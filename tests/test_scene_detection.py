@@ -0,0 +1,88 @@
+import unittest
+import concurrent.futures
+from unittest import mock
+import numpy as np
+from src.config import Config
+from src import scene_detection
+from src.scene_detection import plan_segments, detect_scene_list
+
+FPS = 10.0
+TOTAL_FRAMES = 4000
+CUTS = [500, 1200, 2050, 3100]
+
+def fake_detect_segment(video_path, start, end, threshold, downscale=None, frame_skip=0):
+    """What detect_segment reports for a video with cuts at ``CUTS``: only the cuts inside its span."""
+    start_frame = int(start * FPS)
+    end_frame = int(end * FPS) if end is not None else TOTAL_FRAMES
+    sample_frames = np.arange(start_frame, end_frame, 10)
+    thumbnails = np.stack([
+        np.full((8, 8), 40 * np.searchsorted(CUTS, frame, side="right"), dtype=np.uint8) for frame in sample_frames
+    ])
+    thumbnails[:, :4] = 0
+    return {
+        "fps": FPS,
+        "cuts": [cut for cut in CUTS if start_frame <= cut < end_frame],
+        "sample_frames": sample_frames,
+        "thumbnails": thumbnails,
+        "video_end": end_frame
+    }
+
+class InlineExecutor:
+    """Runs submissions in-process so the patched detect_segment is used for every segment."""
+    def __init__(self, max_workers=None, mp_context=None):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = concurrent.futures.Future()
+        future.set_result(fn(*args))
+        return future
+
+class TestPlanSegments(unittest.TestCase):
+    def test_boundaries_snap_to_next_keyframe(self):
+        keyframes = [float(k) for k in range(0, 400, 7)]
+        self.assertEqual(plan_segments(400.0, keyframes, 3), [(0.0, 140.0), (140.0, 273.0), (273.0, None)])
+
+    def test_single_worker_is_whole_file(self):
+        self.assertEqual(plan_segments(400.0, [0.0, 100.0], 1), [(0.0, None)])
+
+    def test_sparse_keyframes_give_fewer_segments(self):
+        # One keyframe serves both targets; none after the last target, so no empty tail segment.
+        self.assertEqual(plan_segments(400.0, [0.0, 150.0], 4), [(0.0, 150.0), (150.0, None)])
+        self.assertEqual(plan_segments(400.0, [0.0, 10.0], 4), [(0.0, None)])
+
+class TestDetectSceneList(unittest.TestCase):
+    def detect(self, workers: int) -> tuple:
+        probe = {"duration": TOTAL_FRAMES / FPS, "keyframes": [float(k) for k in range(0, 400, 2)]}
+        with mock.patch.object(Config, "SCENE_DETECT_WORKERS", workers), \
+                mock.patch.object(scene_detection, "detect_segment", side_effect=fake_detect_segment) as detect, \
+                mock.patch.object(scene_detection, "scene_timecodes", lambda frames, fps: list(frames)), \
+                mock.patch("concurrent.futures.ProcessPoolExecutor", InlineExecutor):
+            scenes, fingerprints, stats = detect_scene_list("video.mp4", probe, Config.SCENE_THRESHOLD)
+        return scenes, fingerprints, stats, detect.call_count
+
+    def test_sharded_cuts_match_sequential_pass(self):
+        sequential = self.detect(workers=1)
+        sharded = self.detect(workers=3)
+        self.assertEqual((sequential[2]["segments"], sequential[3]), (1, 1))
+        self.assertEqual((sharded[2]["segments"], sharded[3]), (3, 3))
+        expected = list(zip([0] + CUTS, CUTS + [TOTAL_FRAMES]))
+        self.assertEqual(sequential[0], expected)
+        self.assertEqual(sharded[0], expected)
+        self.assertEqual(sharded[2]["fingerprint_samples"], TOTAL_FRAMES // 10)
+        for one, other in zip(sequential[1], sharded[1]):
+            np.testing.assert_array_equal(one, other)
+
+    def test_no_cuts_means_no_scenes(self):
+        with mock.patch(f"{__name__}.CUTS", []):
+            scenes, fingerprints, stats, _ = self.detect(workers=3)
+        self.assertEqual((scenes, fingerprints), ([], []))
+        self.assertEqual(stats["segments"], 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import time
+import threading
+import unittest
+from src.config import Config
+from src.metrics import SpanRecorder
+from src.scheduler import FfmpegScheduler, encode_args, decode_args
+
+class TestEncodeArgs(unittest.TestCase):
+    def test_profile_and_threads(self):
+        args = encode_args("fast", threads=3)
+        self.assertEqual(args[:len(Config.CLIP_ENCODE_ARGS)], Config.CLIP_ENCODE_ARGS)
+        self.assertEqual(args[args.index("-preset") + 1], Config.ENCODE_PROFILES["fast"]["preset"])
+        self.assertEqual(args[-2:], ["-threads", "3"])
+        self.assertNotIn("-threads", encode_args("quality"))
+        with self.assertRaises(ValueError):
+            encode_args("lossless")
+
+    def test_decode_args(self):
+        self.assertEqual(decode_args(2), ["-threads", "2"])
+        self.assertEqual(decode_args(None), [])
+
+class TestFfmpegScheduler(unittest.TestCase):
+    def test_budget_split_into_slots(self):
+        scheduler = FfmpegScheduler(cpu_budget=8, threads=3)
+        self.assertEqual((scheduler.threads, scheduler.max_concurrent), (3, 2))
+        self.assertEqual(FfmpegScheduler(cpu_budget=1, threads=4).threads, 1)
+
+    def test_excess_encodes_queue(self):
+        scheduler = FfmpegScheduler(cpu_budget=2, threads=2)
+        spans = SpanRecorder()
+        with scheduler.slot(spans) as threads:
+            self.assertEqual(threads, 2)
+            waiter = threading.Thread(target=lambda: scheduler.slot(spans).__enter__())
+            waiter.start()
+            time.sleep(0.2)
+            self.assertTrue(waiter.is_alive())
+        waiter.join(timeout=5)
+        waits = [span["duration"] for span in spans.spans if span["name"] == "ffmpeg_queue"]
+        self.assertEqual(len(waits), 2)
+        self.assertGreaterEqual(max(waits), 0.15)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import json
+import tempfile
+import unittest
+from src.store import JobStore, analytics_sections
+
+class TestJobStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmp.name, "jobs.db"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_ids_are_unique_and_continue_legacy_counter(self):
+        legacy = os.path.join(self.tmp.name, "video_ids.json")
+        with open(legacy, 'w') as f:
+            json.dump({"last_id": 6}, f)
+        store = JobStore(os.path.join(self.tmp.name, "seeded.db"), legacy_ids_file=legacy)
+        self.assertEqual([store.create_job() for _ in range(3)], ["7", "8", "9"])
+        self.assertEqual(JobStore(store.path, legacy_ids_file=legacy).create_job(), "10")
+
+    def test_moves_legacy_database_out_of_output(self):
+        legacy = os.path.join(self.tmp.name, "output", "jobs.db")
+        os.makedirs(os.path.dirname(legacy))
+        video_id = JobStore(legacy).create_job("queued")
+        store = JobStore(os.path.join(self.tmp.name, "data", "jobs.db"), legacy_path=legacy)
+        self.assertEqual(store.get_job(video_id)["status"], "queued")
+        self.assertFalse(os.path.exists(legacy))
+
+    def test_list_filters_by_status_and_duration(self):
+        short = self.store.create_job("queued", duration=30.0)
+        long = self.store.create_job("queued", duration=600.0)
+        self.store.update_job(short, status="completed", percent=100)
+        self.assertEqual([job["video_id"] for job in self.store.list_jobs(status="completed")], [short])
+        self.assertEqual([job["video_id"] for job in self.store.list_jobs(min_duration=60)], [long])
+        self.assertEqual(len(self.store.list_jobs(since=0, limit=1)), 1)
+
+    def test_analytics_sections_round_trip_and_bump_version(self):
+        job_id = self.store.create_job("running")
+        analytics = {"processing_steps": {"top_scenes": {"time_taken": 1.0}}, "scenes": [{"start": 0, "end": 5}]}
+        version = self.store.version(job_id)
+        self.store.put_analytics(job_id, analytics_sections(analytics))
+        self.assertEqual(self.store.get_analytics(job_id), analytics)
+        self.assertGreater(self.store.version(job_id), version)
+
+    def test_clear_analytics_drops_stale_sections(self):
+        job_id = self.store.create_job("running")
+        self.store.put_analytics(job_id, analytics_sections({"processing_steps": {"mux_languages": {}}, "languages": {"mr": {}}}))
+        version = self.store.version(job_id)
+        self.store.clear_analytics(job_id)
+        self.assertIsNone(self.store.get_analytics(job_id))
+        self.assertGreater(self.store.version(job_id), version)
+        self.store.put_analytics(job_id, analytics_sections({"processing_steps": {"render_filtergraph": {}}}))
+        self.assertEqual(self.store.get_analytics(job_id), {"processing_steps": {"render_filtergraph": {}}})
+
+    def test_update_rejects_unknown_fields(self):
+        job_id = self.store.create_job()
+        with self.assertRaises(ValueError):
+            self.store.update_job(job_id, colour="red")
+
+if __name__ == "__main__":
+    unittest.main()
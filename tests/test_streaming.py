@@ -0,0 +1,60 @@
+import os
+import argparse
+import tempfile
+import unittest
+from src.streaming import HLSPlaylist, parse_range, iter_file
+from src.important_video import add_pipeline_arguments, processor_options
+
+class TestHLSPlaylist(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read(self, playlist: HLSPlaylist) -> str:
+        with open(playlist.path, 'r') as f:
+            return f.read()
+
+    def test_playlist_grows_and_ends(self):
+        playlist = HLSPlaylist(os.path.join(self.tmp.name, "hls"), 12.2)
+        self.assertIn("#EXT-X-TARGETDURATION:13", self._read(playlist))
+        self.assertNotIn("#EXTINF", self._read(playlist))
+        playlist.add(playlist.segment_path(0), 10.0)
+        playlist.add(playlist.segment_path(1), 12.0)
+        text = self._read(playlist)
+        self.assertEqual(text.count("#EXTINF"), 2)
+        self.assertEqual(text.count("#EXT-X-DISCONTINUITY"), 1)
+        self.assertNotIn("#EXT-X-ENDLIST", text)
+        playlist.end()
+        self.assertTrue(self._read(playlist).endswith("#EXT-X-ENDLIST\n"))
+
+class TestByteRanges(unittest.TestCase):
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range("bytes=500-", 1000), (500, 999))
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=900-5000", 1000), (900, 999))
+        self.assertIsNone(parse_range(None, 1000))
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 1000))
+        with self.assertRaises(ValueError):
+            parse_range("bytes=1000-", 1000)
+
+    def test_iter_file_yields_inclusive_range(self):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(bytes(range(256)))
+        try:
+            self.assertEqual(b"".join(iter_file(f.name, 10, 19, chunk_size=4)), bytes(range(10, 20)))
+        finally:
+            os.remove(f.name)
+
+class TestStreamingOptIn(unittest.TestCase):
+    def parse(self, *argv) -> dict:
+        return processor_options(add_pipeline_arguments(argparse.ArgumentParser()).parse_args(list(argv)))
+
+    def test_cli_streams_only_with_hls_flag(self):
+        self.assertFalse(self.parse()["streaming"])
+        self.assertTrue(self.parse("--hls")["streaming"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import time
+import threading
+import unittest
+import numpy as np
+from src.transcription import TranscriptionEngine
+
+class EchoModel:
+    """Returns the audio length as text."""
+
+    def transcribe(self, audio, **kwargs) -> dict:
+        return {"text": str(len(audio))}
+
+class ExclusiveModel(EchoModel):
+    """Fails if two inferences overlap, like Whisper's shared key/value cache hooks would."""
+
+    def __init__(self):
+        self.active = 0
+        self.calls = 0
+        self.guard = threading.Lock()
+
+    def transcribe(self, audio, **kwargs) -> dict:
+        with self.guard:
+            self.active += 1
+            self.calls += 1
+            overlapping = self.active > 1
+        try:
+            if overlapping:
+                raise AssertionError("concurrent inference on one model")
+            time.sleep(0.02)
+            return super().transcribe(audio)
+        finally:
+            with self.guard:
+                self.active -= 1
+
+class TestTranscriptionEngine(unittest.TestCase):
+    def test_one_inference_at_a_time_on_shared_model(self):
+        model = ExclusiveModel()
+        lock = threading.Lock()
+        engines = [TranscriptionEngine(model, max_workers=4, lock=lock) for _ in range(2)]
+        items = {i: np.zeros(100 + i, dtype=np.float32) for i in range(1, 9)}
+        outputs = [None, None]
+
+        def run(k):
+            outputs[k] = engines[k].transcribe(items)
+
+        threads = [threading.Thread(target=run, args=(k,)) for k in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(model.calls, 16)
+        for results in outputs:
+            self.assertEqual({i: r["error"] for i, r in results.items()}, {i: None for i in items})
+            self.assertEqual(results[3]["text"], "103")
+
+    def test_stub_model_runs_without_torch(self):
+        torch_loaded = "torch" in sys.modules
+        engine = TranscriptionEngine(EchoModel(), max_workers=2)
+        results = engine.transcribe({1: np.zeros(160, dtype=np.float32), 2: np.zeros(0, dtype=np.float32)})
+        self.assertEqual(results[1]["text"], "160")
+        self.assertIsNone(results[2]["text"])
+        self.assertEqual("torch" in sys.modules, torch_loaded)
+
+if __name__ == "__main__":
+    unittest.main()
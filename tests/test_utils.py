@@ -0,0 +1,29 @@
+import os
+import sys
+import subprocess
+import unittest
+from src.metrics import SpanRecorder
+from src.utils import run_ffmpeg, scratch_dir
+
+class TestRunFfmpeg(unittest.TestCase):
+    def test_feeds_stdin_and_records_span(self):
+        spans = SpanRecorder()
+        cmd = [sys.executable, "-c", "import sys; sys.stdout.write(sys.stdin.read().upper())"]
+        self.assertEqual(run_ffmpeg(cmd, "upper failed", spans=spans, input=b"file 'a.mp4'\n"), b"FILE 'A.MP4'\n")
+        self.assertEqual(spans.spans[0]["exit_code"], 0)
+
+    def test_raises_on_failure(self):
+        with self.assertRaises(subprocess.CalledProcessError):
+            run_ffmpeg([sys.executable, "-c", "import sys; sys.exit(3)"], "exit failed", input=b"ignored")
+
+class TestScratchDir(unittest.TestCase):
+    def test_removed_even_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with scratch_dir("test_") as path:
+                with open(os.path.join(path, "partial.wav"), 'wb') as f:
+                    f.write(b"\0" * 16)
+                raise RuntimeError("stage failed")
+        self.assertFalse(os.path.exists(path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+from src.vad import find_speech, frame_levels, scene_energies
+
+SR = 16000
+
+def _tone(seconds: float, amplitude: float, hz: float = 220.0) -> np.ndarray:
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * hz * t)).astype(np.float32)
+
+def _music_bed(seconds: float, rms: float) -> np.ndarray:
+    # A held chord with harmonics: steady, like background music under a talk show.
+    t = np.arange(int(seconds * SR)) / SR
+    bed = sum(np.sin(2 * np.pi * f * h * t) / h for f in (220.0, 261.6, 329.6) for h in (1, 2, 3))
+    return (bed * rms / np.sqrt(np.mean(bed ** 2))).astype(np.float32)
+
+def _voice(seconds: float, rms: float) -> np.ndarray:
+    # A gliding 140 Hz voice with a formant near 700 Hz, 4 Hz syllables and 1.4s phrases.
+    t = np.arange(int(seconds * SR)) / SR
+    phase = 2 * np.pi * np.cumsum(140 + 10 * np.sin(np.pi * t)) / SR
+    voice = sum(np.sin(h * phase) * np.exp(-((h * 140 - 700) / 600) ** 2) for h in range(1, 25))
+    voice *= (0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)) ** 2 * (np.mod(t, 2.0) < 1.4)
+    return (voice * rms / np.sqrt(np.mean(voice ** 2))).astype(np.float32)
+
+class TestVAD(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def _noise(self, seconds: float, amplitude: float = 1e-3) -> np.ndarray:
+        return (amplitude * self.rng.standard_normal(int(seconds * SR))).astype(np.float32)
+
+    def test_frame_levels_in_dbfs(self):
+        levels = frame_levels(np.full(SR, 0.5, dtype=np.float32), SR)
+        self.assertEqual(len(levels), 33)
+        self.assertAlmostEqual(levels[0], 20 * np.log10(0.5), places=3)
+
+    def test_silence_and_flat_bed_are_gated(self):
+        self.assertIsNone(find_speech(np.zeros(5 * SR, dtype=np.float32), SR))
+        self.assertIsNone(find_speech(self._noise(5.0), SR))
+        self.assertIsNone(find_speech(_tone(5.0, 0.3) + self._noise(5.0), SR))
+
+    def test_bursts_are_kept_and_silence_trimmed(self):
+        bursts = np.concatenate([np.concatenate([_tone(0.4, 0.3), np.zeros(int(0.2 * SR), dtype=np.float32)]) for _ in range(5)])
+        audio = np.concatenate([np.zeros(3 * SR, dtype=np.float32), bursts, np.zeros(2 * SR, dtype=np.float32)])
+        audio += self._noise(len(audio) / SR)
+        start, end, voiced = find_speech(audio, SR)
+        self.assertAlmostEqual(start / SR, 3.0 - 0.3, delta=0.05)
+        self.assertAlmostEqual(end / SR, 3.0 + 2.8 + 0.3, delta=0.25)
+        self.assertAlmostEqual(voiced, 2.0, delta=0.2)
+
+    def test_speech_over_bed_is_kept(self):
+        bed = _music_bed(10.0, 0.2) + self._noise(10.0)
+        self.assertIsNone(find_speech(bed, SR))
+        self.assertIsNone(find_speech(0.3 * self.rng.standard_normal(10 * SR).astype(np.float32), SR))
+        for relative_db in (-2.0, 4.0):
+            with self.subTest(relative_db=relative_db):
+                region = find_speech(bed + _voice(10.0, 0.2 * 10 ** (relative_db / 20)), SR)
+                self.assertIsNotNone(region)
+                # Five phrases of 1.4s, each voiced for roughly its syllable peaks.
+                self.assertGreater(region[2], 2.0)
+                self.assertLess(region[0] / SR, 0.5)
+                self.assertGreater(region[1] / SR, 9.0)
+
+    def test_scene_energies_match_librosa_framing(self):
+        audio = self._noise(12.0, amplitude=0.1) * np.linspace(0.0, 2.0, 12 * SR, dtype=np.float32)
+        bounds = np.array([[0.0, 2.5], [2.5, 7.3], [7.3, 12.0], [11.99, 12.5], [4.0, 4.0]])
+
+        def librosa_rms(scene: np.ndarray) -> float:
+            # librosa.feature.rms(y=scene, center=True, pad_mode="constant").mean()
+            padded = np.pad(scene.astype(np.float64), 1024)
+            frames = np.lib.stride_tricks.sliding_window_view(padded, 2048)[::512]
+            return float(np.sqrt(np.mean(frames ** 2, axis=1)).mean())
+
+        expected = [librosa_rms(audio[int(round(s * SR)):int(round(e * SR))]) for s, e in bounds]
+        np.testing.assert_allclose(scene_energies(audio, SR, bounds), expected, rtol=1e-6)
+        self.assertEqual(scene_energies(audio, SR, np.zeros((0, 2))).shape, (0,))
+
+if __name__ == "__main__":
+    unittest.main()